@@ -1,3 +1,4 @@
+# pylint: disable=too-many-lines
 """Text Animator Studio using the turtle module.
 
 This module provides an interactive text animation application built with
@@ -9,10 +10,25 @@ and is exercised by the project's tests.
 # turtle attributes are detected dynamically by the runtime; disable those
 # pylint checks here. Also relax complexity and whitespace checks for this
 # single-file demo application.
-# pylint: disable=invalid-name,no-member,c0303,r0915,r0914,w0613,w0603
-import turtle as myName
+# pylint: disable=invalid-name,no-member,c0303,r0915,r0914,w0613,w0603,r0902,r0913
+import argparse
 import math
 import colorsys
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, deque
+from xml.sax.saxutils import escape as xml_escape
+
+try:
+    import resource
+except ImportError:  # not on Windows; the watchdog then reports no RSS
+    resource = None
 
 # global constants for window dimensions
 WINDOW_WIDTH = 1200
@@ -22,8 +38,39 @@ NAME = ""  # Will be set by user input
 FONT_NAME = "Arial"
 FONT_SIZE = 64
 FONT_STYLE = "bold"
+FONT_SIZE_STEP = 2  # pulsing glyph sizes are rounded to multiples of this
 DEPTH_LAYERS = 10  # number of layers used to fake extrusion (back -> front)
 ANIMATION_DELAY_MS = 40  # delay between frames in milliseconds
+FRAME_STEP = 4  # frame counter advance per tick; animations repeat every 360
+TARGET_FPS = 1000 / ANIMATION_DELAY_MS  # frame rate aimed for by animate()
+ANIMATION_SPEED = FRAME_STEP * TARGET_FPS  # animation degrees per second
+CYCLE_CACHE_BYTES = 32 * 1024 * 1024  # memory cap for precomputed cycles
+INPUT_REPAINT_MS = 16  # typing is repainted at most once per display frame
+# Frames computed ahead by the experimental pipeline worker (0: off). The
+# Tk thread still applies every glyph and the worker competes for the GIL,
+# so it does not make frames cheaper yet.
+PIPELINE_DEPTH = 0
+SESSION_LOG_VERSION = 1  # format of session logs written by --record
+PLAYLIST_SECONDS = 60  # time a playlist entry is shown unless it says so
+WATCHDOG_INTERVAL_MS = 60_000  # period of the playlist watchdog's samples
+WATCHDOG_SAMPLES = 1440  # samples kept by the watchdog (a day at 1/min)
+WATCHDOG_RSS_GROWTH = 64 * 1024 * 1024  # RSS growth that raises an alarm
+WATCHDOG_DRIFT = 0.25  # frame-rate shortfall that raises an alarm
+# 3D rotation level of detail, best first: (fraction of DEPTH_LAYERS drawn,
+# hue steps per color cycle); 0 hue steps keeps full color precision
+QUALITY_LEVELS = ((1.0, 0), (0.6, 0), (0.4, 45), (0.2, 30), (0.1, 15))
+QUALITY_WINDOW = 12  # frames averaged before the quality level may change
+SPRITE_GLYPHS = True  # draw animated glyphs as cached images when possible
+SPRITE_CACHE_BYTES = 16 * 1024 * 1024  # memory cap for glyph sprites
+SPRITE_CACHE_LIMIT = 64 * 1024 * 1024  # cap may grow to fit one cycle
+SPRITE_COLOR_LEVELS = 6  # levels per RGB channel of sprites (216 colors)
+PROFILE_FRAMES = 1000  # frame records kept by the profiler's ring buffer
+VIEWPORT = (-300, 300)  # x range between the menu separators
+BACKGROUND_COLOR = "black"  # also fills the masks clipping the marquee
+MASK_EXTENT = 4096  # half height of those masks in world units
+INPUT_MAX_CHARS = 50  # typed text limit, except for the marquee
+MARQUEE_SPEED = 120  # marquee scroll speed in world units per second
+PALETTE_HUES = 360  # hue steps of the precomputed color table
 
 # Animation type selection
 ANIMATION_TYPE = "3d_rotation"
@@ -31,20 +78,79 @@ ANIMATION_TYPE = "3d_rotation"
 # Menu state
 SHOW_MENU = True
 IS_ANIMATING = False
-MENU_TURTLE = None  # Separate turtle for persistent menu
+myName = None  # the turtle module, imported only when a window is needed
+MENU_LAYER = None  # Retained-mode layer holding the persistent menu
+MARQUEE = None  # MarqueeView while the text scrolls instead of wrapping
+INPUT_TURTLE = None  # Turtle used to draw the text input screen
+PLAYLIST = None  # Playlist cycling the text in kiosk mode
+Image = ImageDraw = ImageFont = None  # Pillow modules, see load_pillow()
+np = None  # NumPy, see load_numpy()
+
+
+def load_turtle():
+    """Import turtle (and with it Tk) on first use and return the module.
+
+    Headless rendering never calls this, so it works without a display.
+    """
+    global myName
+    if myName is None:
+        import turtle  # pylint: disable=import-outside-toplevel
+        myName = turtle
+    return myName
+
+
+def load_pillow():
+    """Import Pillow on first use; return False if it is not installed.
+
+    Pillow is optional and only needed to pre-rasterize glyph sprites.
+    """
+    global Image, ImageDraw, ImageFont
+    if Image is None:
+        try:
+            # pylint: disable-next=import-outside-toplevel
+            from PIL import Image, ImageDraw, ImageFont
+        except ImportError:
+            return False
+    return True
+
+
+def load_numpy():
+    """Import NumPy on first use; return False if it is not installed.
+
+    NumPy is optional and only needed by the vectorized cycle kernels;
+    without it cycles are recorded from the scalar Animation pass.
+    """
+    global np
+    if np is None:
+        try:
+            # pylint: disable-next=import-outside-toplevel
+            import numpy as np
+        except ImportError:
+            return False
+    return True
 
 
-def init():
+def init(fullscreen=False):
     """
     Initialize the drawing coordinate system and screen.
+
+    With `fullscreen` the window covers the whole display; world units stay
+    one pixel each and (0,0) stays at the center, so the layout is unchanged
+    and just surrounded by more background.
     """
+    load_turtle()
     screen = myName.Screen()
     screen.title("Text Animator Studio")
-    screen.setup(WINDOW_WIDTH, WINDOW_HEIGHT)
-    screen.bgcolor("black")  # Set background to black
+    if fullscreen:
+        screen.getcanvas().winfo_toplevel().attributes("-fullscreen", True)
+        screen.update()  # let the window manager apply the new size
+        width, height = screen.window_width(), screen.window_height()
+    else:
+        screen.setup(WINDOW_WIDTH, WINDOW_HEIGHT)
+        width, height = WINDOW_WIDTH, WINDOW_HEIGHT
+    screen.bgcolor(BACKGROUND_COLOR)  # Set background to black
     # choose coordinates so (0,0) is near the center
-    myName.setworldcoordinates(-WINDOW_WIDTH/2, -WINDOW_HEIGHT/2,
-                              WINDOW_WIDTH/2, WINDOW_HEIGHT/2)
+    myName.setworldcoordinates(-width/2, -height/2, width/2, height/2)
     # Use 255-based RGB tuples
     screen.colormode(255)
     # Turn off automatic animation updates for speed
@@ -58,8 +164,12 @@ def hsv_to_rgb255(h, s, v):
     return int(r * 255), int(g * 255), int(b * 255)
 
 
-def show_text_input_screen(t, screen, current_text="", show_cursor=True):
-    """Show a text input prompt on the turtle screen."""
+def show_text_input_screen(t, screen):
+    """Show the static parts of the text input prompt on the turtle screen.
+
+    This is drawn once per prompt; the typed text and the cursor are kept
+    in a TextInputLayer and updated in place.
+    """
     t.clear()
     t.color(0, 255, 255)  # Cyan
     t.penup()
@@ -67,175 +177,665 @@ def show_text_input_screen(t, screen, current_text="", show_cursor=True):
     # Title
     t.goto(0, 150)
     t.write("TEXT ANIMATOR STUDIO", align="center",
-            font=("Arial", 36, "bold"))
+            font=font_option(ui_font(36, "bold")))
     
     # Prompt
     t.color(255, 255, 255)  # White
     t.goto(0, 80)
     t.write("Enter your text to animate:", align="center",
-            font=("Arial", 20, "normal"))
-    
-    # Show current input
-    t.goto(0, 20)
-    t.color(0, 255, 0)  # Green
-    if current_text:
-        t.write(current_text, align="center",
-                font=("Arial", 24, "bold"))
-    
-    # Show blinking cursor after text
-    if show_cursor:
-        if current_text:
-            # Position cursor after the last character
-            # Approximate character width for Arial 24pt bold
-            char_width = 15
-            text_width = len(current_text) * char_width
-            cursor_x = (text_width / 2) + 5
-        else:
-            cursor_x = 0
-        t.goto(cursor_x, 18)  # Slightly lower for proper alignment
-        t.write("_", align="left", font=("Arial", 24, "bold"))
+            font=font_option(ui_font(20)))
     
     # Instructions
     t.goto(0, -40)
     t.color(255, 200, 0)  # Yellow
     t.write("Press ENTER when done", align="center",
-            font=("Arial", 16, "italic"))
+            font=font_option(ui_font(16, "italic")))
     
     t.goto(0, -80)
     t.color(150, 150, 150)  # Gray
     t.write("Backspace to delete | ESC for default",
-            align="center", font=("Arial", 12, "normal"))
-    
-    screen.update()
+            align="center", font=font_option(ui_font(12)))
+
+
+# Keys typed on the input screen: Tk keysym -> character
+INPUT_KEYSYMS = {c: c for c in "abcdefghijklmnopqrstuvwxyz"
+                 "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"}
+INPUT_KEYSYMS.update(space=" ", exclam="!", period=".", comma=",",
+                     question="?", minus="-", apostrophe="'")
+
+
+class KeyRouter:
+    """Single entry point for the window's key events.
+
+    One <KeyPress> binding on the canvas is made when the router is first
+    attached; each mode ("input" while text is typed, "menu" in the studio)
+    has a dispatch table of keysym -> handler(keysym), and switching modes
+    only selects another table, so no Tk bindings change after start-up.
+
+    Menu keys that change state only request a relayout and/or a menu
+    refresh. Requests are applied together once per frame: by the next
+    animation tick, or while paused by a single timer, so held keys
+    auto-repeating faster than the frame rate cost one update per frame.
+    """
+
+    def __init__(self):
+        self.tables = {}
+        self.mode = None
+        self.canvas = None      # canvas the <KeyPress> handler is bound to
+        self.studio = None      # (screen, menu_t, anim_t, positions)
+        self.needs_relayout = False
+        self.needs_menu = False
+        self.flush_pending = False
+        self.recorder = None    # SessionRecorder logging the key events
+        self.events = 0
+        self.relayouts = 0
+        self.refreshes = 0
+
+    def set_mode(self, screen, mode, table=None):
+        """Route keys to `mode`'s table (replaced by `table` if given)."""
+        canvas = screen.getcanvas()
+        if canvas is not self.canvas:
+            canvas.bind("<KeyPress>", self.dispatch)
+            self.canvas = canvas
+        screen.listen()
+        if table is not None:
+            self.tables[mode] = table
+        self.mode = mode
+
+    def dispatch(self, event):
+        """Tk event handler: run the current mode's handler for the key."""
+        self.events += 1
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.key(event.keysym)
+        handler = self.tables.get(self.mode, {}).get(event.keysym)
+        if handler is not None:
+            handler(event.keysym)
+        if recorder is not None:
+            recorder.transitions()
+
+    def request(self, reflow=False):
+        """Ask for a menu refresh (and a relayout if `reflow`) next frame."""
+        self.needs_relayout |= reflow
+        self.needs_menu = True
+        if not IS_ANIMATING and not self.flush_pending:
+            self.flush_pending = True
+            self.studio[0].ontimer(self.flush, INPUT_REPAINT_MS)
+
+    def apply(self):
+        """Run a requested relayout; return whether the menu is stale.
 
+        Called by animate() before each frame, which draws the menu anyway.
+        """
+        stale = self.needs_menu
+        if self.needs_relayout:
+            _, _, anim_t, positions = self.studio
+            relayout(anim_t, positions)
+            self.relayouts += 1
+        self.needs_relayout = self.needs_menu = False
+        return stale
 
-def get_text_input(screen, t):
-    """Get text input from user using keyboard on the turtle screen."""
+    def flush(self):
+        """Timer callback while paused: apply requests, refresh the menu."""
+        self.flush_pending = False
+        relayouts = self.relayouts
+        if self.apply():
+            screen, menu_t, anim_t, positions = self.studio
+            if self.relayouts != relayouts:
+                # The new layout's items are hidden: show the paused frame
+                draw_current_frame(anim_t, positions)
+            draw_menu(menu_t, screen)
+            self.refreshes += 1
+
+    def stats(self):
+        """Return the key event, relayout and paused menu refresh counts."""
+        return {"events": self.events, "relayouts": self.relayouts,
+                "refreshes": self.refreshes}
+
+
+KEYS = KeyRouter()
+
+# Globals whose changes a SessionRecorder logs as state transitions
+SESSION_FIELDS = ("NAME", "FONT_SIZE", "ANIMATION_TYPE", "IS_ANIMATING")
+
+
+def session_state():
+    """Return the current values of the SESSION_FIELDS globals."""
+    return {field: globals()[field] for field in SESSION_FIELDS}
+
+
+class SessionRecorder:
+    """Timestamped log of the key events and state changes of a session.
+
+    Attached as KEYS.recorder, it logs every key event and, after its
+    handler ran, each SESSION_FIELDS global that changed. write() stores a
+    header line with the start-up settings followed by one short JSON array
+    per event, milliseconds since start() first:
+
+        [812.4,"k","5"]                    key event (Tk keysym)
+        [812.4,"s","FONT_SIZE",96]         state transition
+        [5310.0,"end"]                     end of the session
+
+    replay.py feeds the keys to the same handlers on a virtual clock.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.started = 0.0
+        self.header = None
+        self.state = {}
+        self.events = []
+
+    def start(self, text=None):
+        """Start the clock; `text` is the --text the studio starts with."""
+        self.started = self.clock()
+        self.state = session_state()
+        self.header = {"version": SESSION_LOG_VERSION, "text": text,
+                       "fps": SCHEDULER.fps, "depth_layers": DEPTH_LAYERS,
+                       "state": dict(self.state)}
+        self.events = []
+
+    def elapsed_ms(self):
+        """Milliseconds since start(), rounded to the logged precision."""
+        return round((self.clock() - self.started) * 1000, 1)
+
+    def key(self, keysym):
+        """Log a key event."""
+        self.events.append([self.elapsed_ms(), "k", keysym])
+
+    def transitions(self):
+        """Log the SESSION_FIELDS that changed since the last call."""
+        for field, value in session_state().items():
+            if self.state[field] != value:
+                self.state[field] = value
+                self.events.append([self.elapsed_ms(), "s", field, value])
+
+    def write(self, out):
+        """Write the header and the events, ending the session now."""
+        compact = {"separators": (",", ":")}
+        out.write(json.dumps(self.header, **compact) + "\n")
+        for event in self.events + [[self.elapsed_ms(), "end"]]:
+            out.write(json.dumps(event, **compact) + "\n")
+
+
+def read_session(lines):
+    """Parse a session log; return (header, events).
+
+    Raises ValueError for logs of another SESSION_LOG_VERSION.
+    """
+    lines = iter(lines)
+    header = json.loads(next(lines))
+    if header.get("version") != SESSION_LOG_VERSION:
+        raise ValueError(f"unsupported session log version: "
+                         f"{header.get('version')!r}")
+    return header, [json.loads(line) for line in lines if line.strip()]
+
+
+def get_text_input(screen, t, on_done):
+    """Get text input from user using keyboard on the turtle screen.
+
+    Input is event driven: this sets up the prompt, switches KEYS to the
+    "input" dispatch table and returns immediately, and Tk's event loop
+    runs the key handlers, so no CPU is used while waiting. When ENTER or
+    ESC completes the input, keys are ignored until the caller selects a
+    mode again and `on_done(text)` is called with the result.
+    """
     input_text = ""
     input_complete = [False]
     cursor_visible = [True]
+    repaint_pending = [False]
+    layer = TextInputLayer(screen)
+    
+    def repaint():
+        repaint_pending[0] = False
+        if not input_complete[0]:
+            layer.render(input_text, cursor_visible[0])
     
-    def add_char(char):
+    def request_repaint():
+        """Coalesce key bursts and blinks into one repaint per frame."""
+        if not repaint_pending[0]:
+            repaint_pending[0] = True
+            screen.ontimer(repaint, INPUT_REPAINT_MS)
+    
+    def add_char(key):
         nonlocal input_text
-        if len(input_text) < 50:  # Limit length
-            input_text += char
-            show_text_input_screen(t, screen, input_text, cursor_visible[0])
+        # A marquee scrolls text of any length through the viewport
+        if MARQUEE is not None or len(input_text) < INPUT_MAX_CHARS:
+            input_text += INPUT_KEYSYMS[key]
+            request_repaint()
     
-    def backspace():
+    def backspace(_key=None):
         nonlocal input_text
         if input_text:
             input_text = input_text[:-1]
-            show_text_input_screen(t, screen, input_text, cursor_visible[0])
+            request_repaint()
     
-    def finish():
+    def finish(_key=None):
+        if input_complete[0]:
+            return
         input_complete[0] = True
+        
+        # Ignore keys until the caller selects a mode
+        KEYS.set_mode(screen, None)
+        
+        # Clear the input screen
+        t.clear()
+        layer.delete_all()
+        screen.update()
+        
+        # Resume the caller with the entered text
+        on_done(input_text if input_text else "Your Name Here")
     
-    def use_default():
+    def use_default(_key=None):
         nonlocal input_text
         input_text = "Your Name Here"
-        input_complete[0] = True
+        finish()
     
     def blink_cursor():
         """Toggle cursor visibility for blinking effect."""
         if not input_complete[0]:
             cursor_visible[0] = not cursor_visible[0]
-            show_text_input_screen(t, screen, input_text, cursor_visible[0])
+            request_repaint()
             screen.ontimer(blink_cursor, 500)  # Blink every 500ms
     
     # Show initial screen
-    show_text_input_screen(t, screen, input_text, True)
+    show_text_input_screen(t, screen)
+    layer.render(input_text, True)
+    screen.update()
     
     # Start cursor blinking
     screen.ontimer(blink_cursor, 500)
     
-    # Setup key bindings for all printable characters
-    screen.listen()
-    
-    # Letters
-    for char in "abcdefghijklmnopqrstuvwxyz":
-        screen.onkey(lambda c=char: add_char(c), char)
-        screen.onkey(lambda c=char.upper(): add_char(c), char.upper())
-    
-    # Numbers
-    for num in "0123456789":
-        screen.onkey(lambda n=num: add_char(n), num)
-    
-    # Space and common punctuation
-    screen.onkey(lambda: add_char(" "), "space")
-    screen.onkey(lambda: add_char("!"), "exclam")
-    screen.onkey(lambda: add_char("."), "period")
-    screen.onkey(lambda: add_char(","), "comma")
-    screen.onkey(lambda: add_char("?"), "question")
-    screen.onkey(lambda: add_char("-"), "minus")
-    screen.onkey(lambda: add_char("'"), "apostrophe")
-    
-    # Control keys
-    screen.onkey(backspace, "BackSpace")
-    screen.onkey(finish, "Return")
-    screen.onkey(use_default, "Escape")
-    
-    # Wait for input to complete
-    while not input_complete[0]:
-        screen.update()
-    
-    # Clear all key bindings used for input
-    for char in "abcdefghijklmnopqrstuvwxyz":
-        screen.onkey(None, char)
-        screen.onkey(None, char.upper())
-    for num in "0123456789":
-        screen.onkey(None, num)
-    screen.onkey(None, "space")
-    screen.onkey(None, "exclam")
-    screen.onkey(None, "period")
-    screen.onkey(None, "comma")
-    screen.onkey(None, "question")
-    screen.onkey(None, "minus")
-    screen.onkey(None, "apostrophe")
-    screen.onkey(None, "BackSpace")
-    screen.onkey(None, "Return")
-    screen.onkey(None, "Escape")
-    
-    # Clear the input screen
-    t.clear()
-    screen.update()
-    
-    return input_text if input_text else "Your Name Here"
+    # Printable characters and control keys
+    table = dict.fromkeys(INPUT_KEYSYMS, add_char)
+    table.update(BackSpace=backspace, Return=finish, Escape=use_default)
+    KEYS.set_mode(screen, "input", table)
+    # Tk's event loop now drives the input until finish() runs
 
 
-def draw_menu(menu_t, screen, show_confirmation=False,
-              confirm_msg="", anim_t=None):
-    """Draw the interactive menu on screen (persistent on sides)."""
-    menu_t.clear()
-    
-    # LEFT SIDE MENU
+TEXT_ANCHORS = {"left": "sw", "center": "s", "right": "se"}
+
+
+def color_string(color):
+    """Return the Tk color string for a 0..255 RGB tuple (or pass one)."""
+    if isinstance(color, Color):
+        return color.tk
+    if isinstance(color, str):
+        return color
+    r, g, b = color
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+class Color(tuple):
+    """An (r, g, b) tuple that carries its interned Tk color string."""
+
+    def __new__(cls, rgb):
+        color = super().__new__(cls, rgb)
+        r, g, b = color
+        color.tk = sys.intern(f"#{r:02x}{g:02x}{b:02x}")
+        return color
+
+
+_COLORS = {}
+
+
+def intern_color(rgb):
+    """Return the one shared Color equal to an (r, g, b) tuple."""
+    color = _COLORS.get(rgb)
+    if color is None:
+        color = Color(rgb)
+        _COLORS[color] = color
+    return color
+
+
+class ColorPalette:
+    """Precomputed hue x shade lookup table of interned Colors.
+
+    The color wheel is quantized to `hues` steps at one saturation and
+    value, or `colors` gives a custom gradient to cycle through instead.
+    Shade rows (every hue darkened by one factor, as the 3D extrusion does)
+    are built once per factor on first use, so effects only index tables.
+    """
+
+    def __init__(self, hues=PALETTE_HUES, saturation=0.85, value=0.95,
+                 colors=None):
+        if colors is None:
+            colors = [hsv_to_rgb255(k / hues, saturation, value)
+                      for k in range(hues)]
+        self.base = [intern_color(tuple(rgb)) for rgb in colors]
+        self.hues = len(self.base)
+        self.rows = {}
+        self._table = None
+
+    def index(self, hue):
+        """Return the table index of a hue in 0..1."""
+        return round(hue * self.hues) % self.hues
+
+    def color(self, hue):
+        """Return the Color of a hue in 0..1."""
+        return self.base[round(hue * self.hues) % self.hues]
+
+    def shaded(self, shade):
+        """Return the row of every hue darkened by `shade`."""
+        row = self.rows.get(shade)
+        if row is None:
+            row = self.rows[shade] = [
+                intern_color(tuple(max(0, min(255, int(c * shade)))
+                                   for c in rgb))
+                for rgb in self.base]
+        return row
+
+    def rgb_array(self, hue):
+        """Vectorized color(): the RGB rows for an array of hues (NumPy)."""
+        if self._table is None:
+            self._table = np.array(self.base, dtype=np.float64)
+        return self._table[np.rint(hue * self.hues).astype(np.int64) %
+                           self.hues]
+
+
+PALETTE = ColorPalette()  # replace to change the colors of every effect
+
+
+class NamedFont(tuple):
+    """A (family, size, style) tuple that carries the Tk font it names.
+
+    Until a FontRegistry is bound to a Tk canvas `tk` is the tuple itself,
+    which Tk resolves on every use; afterwards it is the name of a Tk font
+    object that is created once and shared by every item using the font.
+    """
+
+    def __new__(cls, spec):
+        font = super().__new__(cls, spec)
+        font.tk = tuple(spec)
+        return font
+
+
+def font_option(font):
+    """Return the Tk font option for a font tuple (or pass one)."""
+    if isinstance(font, NamedFont):
+        return font.tk
+    return font
+
+
+class FontRegistry:
+    """Shared NamedFonts, one per (family, size, style).
+
+    Every screen asks the registry for its fonts, so each distinct font is
+    one Tk font object no matter how many items or frames use it. Sizes
+    passed to scaled() are rounded to multiples of `step`, which bounds the
+    number of fonts a size-animating effect cycles through.
+
+    Fonts first asked for by another thread (the frame pipeline) are only
+    created in Tk by the next realize() on the Tk thread; until then Tk
+    resolves their tuple.
+    """
+
+    def __init__(self, step=FONT_SIZE_STEP):
+        self.step = step
+        self.fonts = {}      # (family, size, style) -> NamedFont
+        self.tk_fonts = {}   # NamedFont -> tkinter.font.Font once bound
+        self.root = None
+        self.tk_thread = None
+        self.pending = []    # fonts waiting for realize()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, family, size, style="normal"):
+        """Return the shared font for (family, size, style)."""
+        key = (family, size, style)
+        font = self.fonts.get(key)
+        if font is not None:
+            self.hits += 1
+            return font
+        self.misses += 1
+        font = self.fonts[key] = NamedFont(key)
+        if self.root is not None:
+            if threading.get_ident() == self.tk_thread:
+                self.tk_font(font)
+            else:
+                self.pending.append(font)
+        return font
+
+    def quantize(self, size):
+        """Round a (fractional) size to the nearest multiple of the step."""
+        step = self.step
+        return max(step, step * round(size / step))
+
+    def scaled(self, family, size, style="normal"):
+        """Return the shared font for a size rounded by quantize()."""
+        return self.get(family, self.quantize(size), style)
+
+    def bind(self, canvas):
+        """Create Tk font objects on `canvas` for every font, now and later."""
+        if self.root is canvas:
+            return
+        self.root = canvas
+        self.tk_thread = threading.get_ident()
+        self.tk_fonts.clear()
+        self.pending.clear()
+        for font in list(self.fonts.values()):
+            self.tk_font(font)
+
+    def realize(self):
+        """Create the Tk fonts other threads asked for (on the Tk thread)."""
+        while self.pending:
+            self.tk_font(self.pending.pop())
+
+    def tk_font(self, font):
+        """Return the tkinter Font object of a font of a bound registry."""
+        tk_font = self.tk_fonts.get(font)
+        if tk_font is None:
+            from tkinter import font as tkfont  # pylint: disable=import-outside-toplevel
+            family, size, style = font
+            tk_font = self.tk_fonts[font] = tkfont.Font(
+                root=self.root, family=family, size=size,
+                weight="bold" if "bold" in style else "normal",
+                slant="italic" if "italic" in style else "roman")
+            font.tk = tk_font.name
+        return tk_font
+
+    def stats(self):
+        """Return the number of fonts and Tk fonts and the lookup counts."""
+        return {"fonts": len(self.fonts), "tk_fonts": len(self.tk_fonts),
+                "hits": self.hits, "misses": self.misses}
+
+
+FONTS = FontRegistry()  # fonts of the animation, menu and input screens
+
+
+def ui_font(size, style="normal"):
+    """Return the shared font of the menu and input screen text."""
+    return FONTS.get("Arial", size, style)
+
+
+def tk_round(value):
+    """Round a canvas coordinate to the pixel Tk draws a text item at."""
+    return math.floor(value + 0.5)
+
+
+def tk_round_image(value):
+    """Round a canvas coordinate to the pixel Tk draws an image item at."""
+    return int(value + (0.5 if value >= 0 else -0.5))
+
+
+class TextLayer:
+    """Persistent canvas items addressed by key (retained-mode drawing).
+
+    Items are created the first time a key is used and afterwards only
+    reconfigured when their position, text, color or font actually change,
+    so re-submitting an unchanged layer costs no Tk work at all. Coordinates
+    are world coordinates, mapped to the canvas exactly like turtle.write
+    and snapped to the whole pixel Tk would draw at anyway: moves smaller
+    than a pixel are skipped without changing the picture.
+    """
+
+    snap = staticmethod(tk_round)
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.canvas = screen.getcanvas()
+        self.items = {}     # key -> canvas item id
+        self.applied = {}   # key -> last (px, py, text, color, font) applied
+        self.hidden = set()
+        self.puts = 0       # glyphs submitted
+        self.skipped = 0    # ... of which left untouched on the canvas
+
+    def canvas_xy(self, x, y):
+        """Map world coordinates to canvas coordinates (as turtle does)."""
+        return x * self.screen.xscale - 1, -y * self.screen.yscale
+
+    def pixel_xy(self, x, y):
+        """Map world coordinates to the canvas pixel an item is drawn at."""
+        snap = self.snap
+        return (snap(x * self.screen.xscale - 1),
+                snap(-y * self.screen.yscale))
+
+    def skip_ratio(self, since=(0, 0)):
+        """Fraction of puts since the (puts, skipped) mark that were no-ops."""
+        puts = self.puts - since[0]
+        return (self.skipped - since[1]) / puts if puts else 0.0
+
+    def put(self, key, spec, align="left"):
+        """Show `spec` = (x, y, text, color, font) under `key`.
+
+        Return True if the canvas had to be touched.
+        """
+        x, y, text, color, font = spec
+        # pixel_xy() inlined: this runs for every glyph of every frame
+        screen, snap = self.screen, self.snap
+        px = snap(x * screen.xscale - 1)
+        py = snap(-y * screen.yscale)
+        state = (px, py, text, color, font)
+        self.puts += 1
+        item = self.items.get(key)
+        if item is None:
+            self.items[key] = self.canvas.create_text(
+                px, py, text=text, anchor=TEXT_ANCHORS[align],
+                fill=color_string(color), font=font_option(font))
+            self.applied[key] = state
+            return True
+        old = self.applied[key]
+        if old == state and key not in self.hidden:
+            self.skipped += 1
+            return False
+        if old[0] != px or old[1] != py:
+            self.canvas.coords(item, px, py)
+        options = {}
+        if old[2] != text:
+            options["text"] = text
+        if old[3] != color:
+            options["fill"] = color_string(color)
+        if old[4] != font:
+            options["font"] = font_option(font)
+        if key in self.hidden:
+            self.hidden.discard(key)
+            options["state"] = "normal"
+        if options:
+            self.canvas.itemconfigure(item, **options)
+        self.applied[key] = state
+        return True
+
+    def line(self, key, start, end, color, width=1):
+        """Draw a static line once; later calls with the same key are no-ops."""
+        if key in self.items:
+            self.show(key)
+            return
+        x0, y0 = start
+        x1, y1 = end
+        self.items[key] = self.canvas.create_line(
+            x0 * self.screen.xscale, -y0 * self.screen.yscale,
+            x1 * self.screen.xscale, -y1 * self.screen.yscale,
+            fill=color_string(color), width=width, capstyle="round")
+
+    def show(self, key):
+        """Make a previously hidden item visible again."""
+        if key in self.hidden:
+            self.hidden.discard(key)
+            self.canvas.itemconfigure(self.items[key], state="normal")
+
+    def hide(self, key):
+        """Hide an item without deleting it, so it can be reused cheaply."""
+        if key in self.items and key not in self.hidden:
+            self.hidden.add(key)
+            self.canvas.itemconfigure(self.items[key], state="hidden")
+
+    def hide_all(self):
+        """Hide every item of the layer."""
+        for key in self.items:
+            self.hide(key)
+
+    def delete_all(self):
+        """Delete every canvas item owned by the layer."""
+        for item in self.items.values():
+            self.canvas.delete(item)
+        self.items.clear()
+        self.applied.clear()
+        self.hidden.clear()
+
+
+class TextInputLayer(TextLayer):
+    """Typed text and blinking cursor of the text input screen.
+
+    Only these two items change while typing, so they are updated in place
+    instead of redrawing the whole prompt.
+    """
+
+    FONT = ui_font(24, "bold")
+
+    def render(self, text, show_cursor):
+        """Show `text` and place the cursor right after its measured end.
+
+        Only the last INPUT_MAX_CHARS characters of a longer (marquee) text
+        are shown, so the line stays on screen.
+        """
+        if len(text) > INPUT_MAX_CHARS:
+            text = "..." + text[-INPUT_MAX_CHARS:]
+        if text:
+            self.put("text", (0, 20, text, (0, 255, 0), self.FONT), "center")
+        else:
+            self.hide("text")
+        if show_cursor:
+            if text:
+                # Measure the rendered text instead of estimating it
+                _, _, right, _ = self.canvas.bbox(self.items["text"])
+                cursor_x = (right + 1) / self.screen.xscale + 5
+            else:
+                cursor_x = 0
+            # Slightly lower for proper alignment
+            self.put("cursor", (cursor_x, 18, "_", (0, 255, 0), self.FONT))
+        else:
+            self.hide("cursor")
+
+
+def menu_lines(show_confirmation=False, confirm_msg=""):
+    """Return the side menu as (key, x, y, text, color, font) entries.
+
+    The left panel shows the title, current text, size options and current
+    settings (or a confirmation message); the right panel shows animation
+    types, the start/pause status and key help.
+    """
     left_x = -520
-    
-    # Title - Left
-    menu_t.color(0, 255, 255)  # Cyan
-    menu_t.penup()
-    menu_t.goto(left_x, 250)
-    menu_t.write("TEXT", align="left", font=("Arial", 24, "bold"))
-    menu_t.goto(left_x, 220)
-    menu_t.write("ANIMATOR", align="left", font=("Arial", 24, "bold"))
-    
-    # Current name display
-    menu_t.color(255, 200, 100)  # Orange
-    menu_t.goto(left_x, 180)
+    right_x = 320
+    title, heading = ui_font(24, "bold"), ui_font(16, "bold")
+    body, small = ui_font(12), ui_font(11)
+
     display_name = NAME if NAME else "[No name]"
     if len(display_name) > 15:
         display_name = display_name[:15] + "..."
-    menu_t.write(f'Text: "{display_name}"', align="left",
-                 font=("Arial", 12, "italic"))
-    
-    # Font Size Options - Left
-    menu_t.color(255, 255, 255)  # White
-    menu_t.goto(left_x, 140)
-    menu_t.write("LETTER SIZE", align="left", font=("Arial", 16, "bold"))
-    menu_t.goto(left_x, 120)
-    menu_t.write("(Press 1-5)", align="left", font=("Arial", 12, "normal"))
-    
-    # Size options
-    menu_t.color(100, 200, 255)
+
+    lines = [
+        # Title - Left
+        ("title1", left_x, 250, "TEXT", (0, 255, 255), title),
+        ("title2", left_x, 220, "ANIMATOR", (0, 255, 255), title),
+        # Current name display
+        ("name", left_x, 180, f'Text: "{display_name}"', (255, 200, 100),
+         ui_font(12, "italic")),
+        # Font Size Options - Left
+        ("size_title", left_x, 140, "LETTER SIZE", (255, 255, 255),
+         heading),
+        ("size_help", left_x, 120, "(Press 1-5)", (255, 255, 255), body),
+    ]
+
     size_options = [
         "1 = Small (32px)",
         "2 = Medium (48px)",
@@ -243,37 +843,30 @@ def draw_menu(menu_t, screen, show_confirmation=False,
         "4 = X-Large (80px)",
         "5 = Huge (96px)"
     ]
-    
-    y_pos = 90
-    for option in size_options:
-        menu_t.goto(left_x, y_pos)
-        menu_t.write(option, align="left", font=("Arial", 11, "normal"))
-        y_pos -= 22
-    
+    for idx, option in enumerate(size_options):
+        lines.append((f"size{idx}", left_x, 90 - idx * 22, option,
+                      (100, 200, 255), small))
+
     # Current settings
-    menu_t.goto(left_x, -50)
-    menu_t.color(0, 255, 0)  # Bright green
     if show_confirmation and confirm_msg:
-        menu_t.write(confirm_msg, align="left", font=("Arial", 12, "bold"))
+        lines.append(("confirm", left_x, -50, confirm_msg, (0, 255, 0),
+                      ui_font(12, "bold")))
     else:
-        menu_t.write(f"Size: {FONT_SIZE}px", align="left",
-                     font=("Arial", 12, "normal"))
-        menu_t.goto(left_x, -70)
-        menu_t.write(f"Type: {ANIMATION_TYPE}", align="left",
-                     font=("Arial", 12, "normal"))
-    
-    # RIGHT SIDE MENU
-    right_x = 320
-    
+        lines.append(("size", left_x, -50, f"Size: {FONT_SIZE}px",
+                      (0, 255, 0), body))
+        lines.append(("type", left_x, -70, f"Type: {ANIMATION_TYPE}",
+                      (0, 255, 0), body))
+        lines.append(("quality", left_x, -90, GOVERNOR.label(),
+                      (0, 255, 0), body))
+        layout = "marquee" if MARQUEE is not None else "wrapped"
+        lines.append(("layout", left_x, -110, f"Layout: {layout}",
+                      (0, 255, 0), body))
+
     # Animation Type Options - Right
-    menu_t.color(255, 255, 255)  # White
-    menu_t.goto(right_x, 140)
-    menu_t.write("ANIMATION TYPE", align="left", font=("Arial", 16, "bold"))
-    menu_t.goto(right_x, 120)
-    menu_t.write("(Press A-E)", align="left", font=("Arial", 12, "normal"))
-    
-    # Animation options
-    menu_t.color(100, 255, 150)
+    lines.append(("anim_title", right_x, 140, "ANIMATION TYPE",
+                  (255, 255, 255), heading))
+    lines.append(("anim_help", right_x, 120, "(Press A-E)",
+                  (255, 255, 255), body))
     anim_options = [
         "A = 3D Rotation",
         "B = Wave",
@@ -281,417 +874,2770 @@ def draw_menu(menu_t, screen, show_confirmation=False,
         "D = Bounce",
         "E = Rainbow Pulse"
     ]
-    
-    y_pos = 90
-    for option in anim_options:
-        menu_t.goto(right_x, y_pos)
-        menu_t.write(option, align="left", font=("Arial", 11, "normal"))
-        y_pos -= 22
-    
+    for idx, option in enumerate(anim_options):
+        lines.append((f"anim{idx}", right_x, 90 - idx * 22, option,
+                      (100, 255, 150), small))
+
     # Instructions - Right
-    menu_t.goto(right_x, -50)
-    menu_t.color(255, 200, 0)  # Bright orange-yellow
     status = "ANIMATING..." if IS_ANIMATING else "Press SPACE"
-    menu_t.write(status, align="left", font=("Arial", 14, "bold"))
-    
-    menu_t.goto(right_x, -80)
-    menu_t.color(255, 100, 100)  # Light red/pink
-    menu_t.write("SPACE = Start", align="left", font=("Arial", 11, "normal"))
-    menu_t.goto(right_x, -100)
-    menu_t.write("M = Pause/Resume", align="left",
-                 font=("Arial", 11, "normal"))
-    menu_t.goto(right_x, -120)
-    menu_t.write("N = New Name", align="left", font=("Arial", 11, "normal"))
-    menu_t.goto(right_x, -140)
-    menu_t.write("Q = Quit", align="left", font=("Arial", 11, "normal"))
-    
-    # Draw separator lines
-    menu_t.color(100, 100, 100)  # Gray
-    menu_t.goto(-300, 300)
-    menu_t.setheading(270)
-    menu_t.pendown()
-    menu_t.goto(-300, -300)
-    menu_t.penup()
-    
-    menu_t.goto(300, 300)
-    menu_t.setheading(270)
-    menu_t.pendown()
-    menu_t.goto(300, -300)
-    menu_t.penup()
-    
-    screen.update()
+    lines.append(("status", right_x, -50, status, (255, 200, 0),
+                  ui_font(14, "bold")))
+    help_lines = ["SPACE = Start", "M = Pause/Resume", "N = New Name",
+                  "S = Scroll/Wrap", "P = Profile", "Q = Quit"]
+    for idx, text in enumerate(help_lines):
+        lines.append((f"help{idx}", right_x, -80 - idx * 20, text,
+                      (255, 100, 100), small))
+    return lines
 
 
-def prepare_letters(name):
-    """Return list of (char, x, y) positions centered on screen.
+class MenuLayer(TextLayer):
+    """Retained-mode side menu.
 
-    We estimate character width from FONT_SIZE. This is an approximation but
-    works well for monospaced spacing of letters drawn with turtle.write.
-    Automatically wraps text into multiple lines if too wide.
+    The menu is built once and only revisited when one of its inputs
+    (NAME, FONT_SIZE, ANIMATION_TYPE, IS_ANIMATING, the 3D quality level,
+    the marquee mode or the confirmation message) changes; even then only
+    the lines whose content differs are reconfigured on the canvas. Menu
+    lines sit at fixed positions, so a line submitted unchanged is skipped
+    before its position is snapped to pixels.
     """
-    # Center area boundaries (between the menu panels)
-    max_width = 550  # Maximum width for text (between x=-275 and x=275)
-    
-    # Calculate text width with current font size
-    char_w = FONT_SIZE * 0.6
-    line_height = FONT_SIZE * 1.2  # Spacing between lines
-    
-    # Split text into words
-    words = name.split()
-    if not words:
-        return []
-    
-    # Build lines that fit within max_width
-    lines = []
-    current_line = []
-    current_width = 0
-    
-    for word in words:
-        word_width = len(word) * char_w
-        space_width = char_w  # Width of a space
-        
-        # Check if adding this word exceeds max width
-        test_width = current_width + word_width
-        if current_line:  # Add space if not first word
-            test_width += space_width
-        
-        if test_width <= max_width or not current_line:
-            # Add word to current line
-            if current_line:
-                current_line.append(' ')
-                current_width += space_width
-            current_line.append(word)
-            current_width += word_width
-        else:
-            # Start new line
-            lines.append(''.join(current_line))
-            current_line = [word]
-            current_width = word_width
-    
-    # Add the last line
-    if current_line:
-        lines.append(''.join(current_line))
-    
-    # Calculate vertical centering
-    total_height = len(lines) * line_height
-    start_y = total_height / 2 - line_height / 2
-    
-    # Create positions for all characters
-    positions = []
-    for line_idx, line in enumerate(lines):
-        y = start_y - (line_idx * line_height)
-        line_width = len(line) * char_w
-        start_x = -line_width / 2 + char_w / 2
-        
-        for char_idx, ch in enumerate(line):
-            x = start_x + char_idx * char_w
-            positions.append((ch, x, y))
-    
-    return positions
-
-
-def draw_frame_3d_rotation(t, positions, frame):
-    """3D rotation animation (original style)."""
-    angle = math.radians(frame)
-
-    # loop letters and draw depth layers back-to-front
-    for i, (ch, base_x, base_y) in enumerate(positions):
-        hue_base = (i / max(1, len(positions))) % 1.0
-        hue_shift = (frame % 360) / 360.0
-        hue = (hue_base + hue_shift) % 1.0
-        base_rgb = hsv_to_rgb255(hue, 0.85, 0.95)
-        phase = i * 0.18
-
-        for layer in range(DEPTH_LAYERS, -1, -1):
-            depth = layer
-            depth_scale = 0.8
-            offset_x = depth * math.cos(angle + phase) * depth_scale
-            offset_y = depth * math.sin(angle + phase) * depth_scale * 0.45
-
-            shade = 1.0 - (depth / (DEPTH_LAYERS + 3)) * 0.7
-            r = max(0, min(255, int(base_rgb[0] * shade)))
-            g = max(0, min(255, int(base_rgb[1] * shade)))
-            b = max(0, min(255, int(base_rgb[2] * shade)))
-
-            t.color((r, g, b))
-            t.penup()
-            t.goto(base_x + offset_x, base_y + offset_y - FONT_SIZE * 0.35)
-            t.pendown()
-            if ch != ' ':
-                t.write(ch, align="center",
-                        font=(FONT_NAME, FONT_SIZE, FONT_STYLE))
-
-
-def draw_frame_wave(t, positions, frame):
-    """Wave animation - letters move up and down in a wave pattern."""
-    for i, (ch, base_x, base_y) in enumerate(positions):
-        if ch == ' ':
-            continue
-        
-        hue = ((frame + i * 15) % 360) / 360.0
-        rgb = hsv_to_rgb255(hue, 0.85, 0.95)
-        
-        wave_offset_y = math.sin(math.radians(frame * 3 + i * 30)) * 30
-        
-        t.color(rgb)
-        t.penup()
-        t.goto(base_x, base_y + wave_offset_y - FONT_SIZE * 0.35)
-        t.pendown()
-        t.write(ch, align="center",
-                font=(FONT_NAME, FONT_SIZE, FONT_STYLE))
-
-
-def draw_frame_spiral(t, positions, frame):
-    """Spiral animation - letters spiral around center."""
-    for i, (ch, base_x, base_y) in enumerate(positions):
-        if ch == ' ':
-            continue
-        
-        hue = ((frame + i * 20) % 360) / 360.0
-        rgb = hsv_to_rgb255(hue, 0.85, 0.95)
-        
-        angle = math.radians(frame * 2 + i * 25)
-        radius = 20 + math.sin(math.radians(frame + i * 30)) * 15
-        spiral_x = math.cos(angle) * radius
-        spiral_y = math.sin(angle) * radius
-        
-        t.color(rgb)
-        t.penup()
-        t.goto(base_x + spiral_x, base_y + spiral_y - FONT_SIZE * 0.35)
-        t.pendown()
-        t.write(ch, align="center",
-                font=(FONT_NAME, FONT_SIZE, FONT_STYLE))
-
-
-def draw_frame_bounce(t, positions, frame):
-    """Bounce animation - letters bounce up and down."""
-    for i, (ch, base_x, base_y) in enumerate(positions):
-        if ch == ' ':
-            continue
-        
-        hue = (i / max(1, len(positions))) % 1.0
-        rgb = hsv_to_rgb255(hue, 0.85, 0.95)
-        
-        bounce_phase = (frame * 4 + i * 20) % 360
-        bounce_y = abs(math.sin(math.radians(bounce_phase))) * 50
-        
-        t.color(rgb)
-        t.penup()
-        t.goto(base_x, base_y + bounce_y - FONT_SIZE * 0.35)
-        t.pendown()
-        t.write(ch, align="center",
-                font=(FONT_NAME, FONT_SIZE, FONT_STYLE))
-
-
-def draw_frame_rainbow_pulse(t, positions, frame):
-    """Rainbow pulse - letters pulse in size with rainbow colors."""
-    for i, (ch, base_x, base_y) in enumerate(positions):
-        if ch == ' ':
-            continue
-        
-        hue = ((frame * 2 + i * 15) % 360) / 360.0
-        rgb = hsv_to_rgb255(hue, 0.85, 0.95)
-        
-        pulse = 1.0 + math.sin(math.radians(frame * 3 + i * 25)) * 0.3
-        pulse_size = int(FONT_SIZE * pulse)
-        
-        t.color(rgb)
-        t.penup()
-        t.goto(base_x, base_y - pulse_size * 0.35)
-        t.pendown()
-        t.write(ch, align="center",
-                font=(FONT_NAME, pulse_size, FONT_STYLE))
 
+    def __init__(self, screen):
+        super().__init__(screen)
+        self.inputs = None
+        self.specs = {}     # key -> (x, y, text, color, font) last put
 
-def draw_frame(t, positions, frame):
-    """Draw a single animation frame. Clears previous frame before drawing."""
-    t.clear()
-    
-    # Select animation based on ANIMATION_TYPE
-    if ANIMATION_TYPE == "wave":
-        draw_frame_wave(t, positions, frame)
-    elif ANIMATION_TYPE == "spiral":
-        draw_frame_spiral(t, positions, frame)
-    elif ANIMATION_TYPE == "bounce":
-        draw_frame_bounce(t, positions, frame)
-    elif ANIMATION_TYPE == "rainbow_pulse":
-        draw_frame_rainbow_pulse(t, positions, frame)
-    else:  # default to 3d_rotation
-        draw_frame_3d_rotation(t, positions, frame)
-
-
-def animate(screen, anim_t, menu_t, positions, frame=0):
-    """Animation callback using ontimer so the window remains responsive."""
-    # Always check if we should continue
-    if not IS_ANIMATING:
-        # Keep menu visible when paused (text stays frozen)
-        draw_menu(menu_t, screen)
-        screen.update()
-        return
-    
-    draw_frame(anim_t, positions, frame)
-    # Redraw menu to keep it visible
-    draw_menu(menu_t, screen)
-    screen.update()
-    # schedule next frame only if still animating
-    if IS_ANIMATING:
-        next_frame = (frame + 4) % 360
-        screen.ontimer(lambda: animate(screen, anim_t, menu_t,
-                                        positions, next_frame),
-                       ANIMATION_DELAY_MS)
+    def invalidate(self):
+        """Force the next render() to re-check every line."""
+        self.inputs = None
 
+    def render(self, show_confirmation=False, confirm_msg=""):
+        """Bring the menu up to date; return True if anything was checked."""
+        inputs = (NAME, FONT_SIZE, ANIMATION_TYPE, IS_ANIMATING,
+                  GOVERNOR.level, MARQUEE is not None,
+                  confirm_msg if show_confirmation else "")
+        if inputs == self.inputs:
+            return False
+        self.inputs = inputs
 
-def handle_size_key(key, screen, menu_t, anim_t, positions):
-    """Handle font size selection."""
-    global FONT_SIZE
-    
-    size_map = {"1": 32, "2": 48, "3": 64, "4": 80, "5": 96}
-    if key in size_map:
-        FONT_SIZE = size_map[key]
-        # Update positions with new size (will wrap to multiple lines if needed)
-        positions.clear()
-        positions.extend(prepare_letters(NAME))
-        draw_menu(menu_t, screen)
+        wanted = set()
+        specs, hidden = self.specs, self.hidden
+        for key, *spec in menu_lines(show_confirmation, confirm_msg):
+            wanted.add(key)
+            spec = tuple(spec)
+            if specs.get(key) == spec and key not in hidden:
+                self.puts += 1
+                self.skipped += 1
+                continue
+            specs[key] = spec
+            self.put(key, spec)
+        for key in [k for k in self.applied if k not in wanted]:
+            self.hide(key)
 
+        # Separator lines are static and drawn only once
+        self.line("sep_left", (-300, 300), (-300, -300), (100, 100, 100))
+        self.line("sep_right", (300, 300), (300, -300), (100, 100, 100))
+        return True
 
-def handle_animation_key(key, screen, menu_t, anim_t):
-    """Handle animation type selection."""
-    global ANIMATION_TYPE
-    
-    anim_map = {
-        "a": "3d_rotation",
-        "b": "wave",
-        "c": "spiral",
-        "d": "bounce",
-        "e": "rainbow_pulse"
-    }
-    if key in anim_map:
-        ANIMATION_TYPE = anim_map[key]
-        draw_menu(menu_t, screen)
+    def delete_all(self):
+        """Delete every menu item; the next render() recreates them."""
+        super().delete_all()
+        self.specs.clear()
+        self.inputs = None
 
 
-def start_animation(screen, anim_t, menu_t, positions):
-    """Start the animation after menu selection."""
-    global IS_ANIMATING
-    
-    if not IS_ANIMATING:
-        IS_ANIMATING = True
-        animate(screen, anim_t, menu_t, positions, frame=0)
-    draw_menu(menu_t, screen)
+def draw_menu(menu_t, screen, show_confirmation=False,
+              confirm_msg="", anim_t=None):
+    """Draw the interactive menu on screen (persistent on sides).
 
+    `menu_t` is the MenuLayer holding the menu items; only lines whose
+    inputs changed are touched. The screen is not flushed here: callers
+    (normally the animation tick) do a single `screen.update()` per frame.
+    """
+    menu_t.render(show_confirmation, confirm_msg)
 
-def toggle_animation(screen, anim_t, menu_t, positions):
-    """Toggle animation on/off."""
-    global IS_ANIMATING
-    
-    if IS_ANIMATING:
-        # Pause the animation (keep text visible by not clearing)
-        IS_ANIMATING = False
-        draw_menu(menu_t, screen)
-        screen.update()
-    else:
-        # Resume/start the animation
-        IS_ANIMATING = True
-        animate(screen, anim_t, menu_t, positions, frame=0)
 
+def estimate_width(font, text):
+    """Monospace estimate of a text's width: 0.6 * font size per character.
 
-def setup_main_keys(screen, menu_t, anim_t, positions):
-    """Setup keyboard handlers for main menu."""
-    screen.listen()
-    
-    # Size keys
-    for key in "12345":
-        screen.onkey(lambda k=key: handle_size_key(
-            k, screen, menu_t, anim_t, positions), key)
-    
-    # Animation keys
-    for key in "abcdeABCDE":
-        screen.onkey(lambda k=key.lower(): handle_animation_key(
-            k.lower(), screen, menu_t, anim_t), key)
-    
-    # Space to start/toggle
-    screen.onkey(lambda: start_animation(
-        screen, anim_t, menu_t, positions), "space")
-    
-    # M to pause/resume
-    screen.onkey(lambda: toggle_animation(
-        screen, anim_t, menu_t, positions), "m")
-    
-    # N to change name
-    screen.onkey(lambda: change_name(
-        screen, menu_t, anim_t, positions), "n")
+    Used wherever no Tk font is available (headless rendering, tests); the
+    built-in bitmap font of the raster output has the same advance.
+    """
+    return font[1] * 0.6 * len(text)
+
+
+class GlyphMetrics:
+    """Glyph advances and pair kerning, memoized per (font, char).
+
+    `measure(font, text)` returns the width of a string for a Tk font
+    tuple (family, size, style). Kerning of a pair is whatever its
+    measured width differs from the sum of the two advances.
+    """
+
+    def __init__(self, measure=estimate_width):
+        self.measure = measure
+        self.advances = {}
+        self.pairs = {}
+
+    def advance(self, font, ch):
+        """Return the advance width of one character."""
+        key = (font, ch)
+        width = self.advances.get(key)
+        if width is None:
+            width = self.advances[key] = self.measure(font, ch)
+        return width
+
+    def kerning(self, font, left, right):
+        """Return the adjustment between two adjacent characters."""
+        key = (font, left, right)
+        kern = self.pairs.get(key)
+        if kern is None:
+            kern = self.pairs[key] = (self.measure(font, left + right) -
+                                      self.advance(font, left) -
+                                      self.advance(font, right))
+        return kern
+
+
+class TextLayout:
+    """Incremental word-wrapping layout of the animated text.
+
+    Words are measured once per font from GlyphMetrics. Each font keeps its
+    last wrapped lines, so a relayout re-wraps only from the line holding
+    the first changed word, and switching back to a previous font size
+    reuses its lines as they are. Lines are wrapped greedily to fit
+    `max_width` (the space between the menu panels) and centered.
+    """
+
+    WORD_CACHE_SIZE = 4096  # measured words kept before the cache resets
+
+    def __init__(self, metrics=None, max_width=550):
+        self.metrics = metrics or GlyphMetrics()
+        self.max_width = max_width
+        self.words = {}     # (font, word) -> (width, glyph center offsets)
+        self.lines = {}     # (font, width) -> (words, [(first, end, width)])
+        self.placed = {}    # (font, width) -> (text, positions) last laid out
+        self.rewrapped = 0  # lines wrapped by the last relayout
+
+    def set_metrics(self, metrics):
+        """Measure with `metrics` from now on, dropping cached layouts."""
+        self.metrics = metrics
+        self.words.clear()
+        self.lines.clear()
+        self.placed.clear()
+
+    def word(self, font, word):
+        """Return (width, glyph center offsets) of a word."""
+        entry = self.words.get((font, word))
+        if entry is None:
+            advance, kerning = self.metrics.advance, self.metrics.kerning
+            x = 0.0
+            offsets = []
+            for k, ch in enumerate(word):
+                if k:
+                    x += kerning(font, word[k - 1], ch)
+                width = advance(font, ch)
+                offsets.append(x + width / 2)
+                x += width
+            if len(self.words) >= self.WORD_CACHE_SIZE:
+                self.words.clear()
+            entry = self.words[(font, word)] = (x, offsets)
+        return entry
+
+    def wrap(self, words, font, max_width=None):
+        """Return the lines of `words` as (first, end, width) word ranges."""
+        if max_width is None:
+            max_width = self.max_width
+        previous = self.lines.get((font, max_width))
+        lines = []
+        if previous is not None:
+            old_words, old_lines = previous
+            if old_words == words:
+                self.rewrapped = 0
+                return old_lines
+            same = 0
+            for old, new in zip(old_words, words):
+                if old != new:
+                    break
+                same += 1
+            # A line break only depends on the words up to the one after it
+            for line in old_lines:
+                if line[1] >= same:
+                    break
+                lines.append(line)
+
+        space = self.metrics.advance(font, " ")
+        first = lines[-1][1] if lines else 0
+        kept = len(lines)
+        while first < len(words):
+            width = self.word(font, words[first])[0]
+            end = first + 1
+            while end < len(words):
+                word_width = self.word(font, words[end])[0]
+                if width + word_width + space > max_width:
+                    break
+                width += space + word_width
+                end += 1
+            lines.append((first, end, width))
+            first = end
+        self.rewrapped = len(lines) - kept
+        self.lines[(font, max_width)] = (words, lines)
+        return lines
+
+    def positions(self, text, font, max_width=None):
+        """Return (char, x, y) glyph positions of `text` centered on 0, 0.
+
+        Lines wrap at `max_width` (default: the layout's own max_width).
+        """
+        if max_width is None:
+            max_width = self.max_width
+        placed = self.placed.get((font, max_width))
+        if placed is not None and placed[0] == text:
+            self.rewrapped = 0
+            return list(placed[1])
+        words = text.split()
+        lines = self.wrap(words, font, max_width)
+        line_height = font[1] * 1.2  # Spacing between lines
+        start_y = len(lines) * line_height / 2 - line_height / 2
+        space = self.metrics.advance(font, " ")
+        positions = []
+        for line_idx, (first, end, width) in enumerate(lines):
+            y = start_y - line_idx * line_height
+            x = -width / 2
+            for k, word in enumerate(words[first:end]):
+                if k:
+                    positions.append((" ", x + space / 2, y))
+                    x += space
+                word_width, offsets = self.word(font, word)
+                positions.extend((ch, x + offset, y)
+                                 for ch, offset in zip(word, offsets))
+                x += word_width
+        self.placed[(font, max_width)] = (text, tuple(positions))
+        return positions
+
+
+LAYOUT = TextLayout()
+
+
+def use_tk_metrics(screen):
+    """Use the Tk fonts and font metrics of `screen` from now on.
+
+    FONTS creates its named fonts on the canvas, and text is laid out by
+    measuring with those same font objects.
+    """
+    FONTS.bind(screen.getcanvas())
+
+    def measure(font, text):
+        return FONTS.tk_font(FONTS.get(*font)).measure(text) / screen.xscale
+
+    LAYOUT.set_metrics(GlyphMetrics(measure))
+
+
+def prepare_letters(name, font_size=None):
+    """Return list of (char, x, y) positions centered on screen.
+
+    Characters are placed by their measured advances and kerning (see
+    TextLayout) and the text automatically wraps into multiple lines if
+    too wide.
+    """
+    if font_size is None:
+        font_size = FONT_SIZE
+    return LAYOUT.positions(name, (FONT_NAME, font_size, FONT_STYLE))
+
+
+class MarqueeView:
+    """Single-line window onto a long text scrolling through the viewport.
+
+    The text is laid out on one line and scrolls right to left through the
+    VIEWPORT between the menu separators. Glyph x positions are sorted, so
+    the glyphs that can intersect the viewport are found by bisection and
+    a frame costs O(log n + visible) whatever the text length. Iterating
+    with indexed() yields only those glyphs with their index in the whole
+    text, and len() is the full glyph count, so the effects phase and
+    color glyphs exactly as in the wrapped layout.
+    """
+
+    def __init__(self, text, font_size=None, viewport=VIEWPORT):
+        if font_size is None:
+            font_size = FONT_SIZE
+        self.positions = LAYOUT.positions(
+            text, (FONT_NAME, font_size, FONT_STYLE), max_width=math.inf)
+        self.xs = array("d", (x for _, x, _ in self.positions))
+        self.left, self.right = viewport
+        # Culling only (clip() masks the glyphs): glyph half-width plus the
+        # furthest an effect moves a glyph
+        self.margin = font_size * 0.5 + 40
+        first, last = (self.xs[0], self.xs[-1]) if self.xs else (0.0, 0.0)
+        # Scroll from just past the right edge until just past the left one
+        self.start = self.right + self.margin - first + 1
+        self.period = self.start - (self.left - self.margin - last) + 1
+        self.shift = self.start
+        self.slots = max(1, self.max_visible())
+
+    def __len__(self):
+        return len(self.positions)
+
+    def max_visible(self):
+        """Return the most glyphs that can fall in the viewport at once."""
+        span = self.right - self.left + 2 * self.margin
+        xs, first, most = self.xs, 0, 0
+        for end, x in enumerate(xs):
+            while x - xs[first] > span:
+                first += 1
+            most = max(most, end - first + 1)
+        return most
+
+    def scroll_to(self, offset):
+        """Scroll the text `offset` units left of its starting point."""
+        self.shift = self.start - offset % self.period
+
+    def visible_range(self):
+        """Return the (first, end) glyph indices inside the viewport."""
+        shift, margin = self.shift, self.margin
+        return (bisect_left(self.xs, self.left - margin - shift),
+                bisect_right(self.xs, self.right + margin - shift))
+
+    def indexed(self):
+        """Yield (index, (char, x, y)) for the glyphs in the viewport."""
+        shift, positions = self.shift, self.positions
+        for i in range(*self.visible_range()):
+            ch, x, y = positions[i]
+            yield i, (ch, x + shift, y)
+
+    def slot_positions(self):
+        """Placeholder positions for allocating one pool item per slot."""
+        return [("M", 0.0, 0.0)] * self.slots
+
+
+def indexed(positions):
+    """Yield (index, (char, x, y)) for every glyph an effect should draw.
+
+    A positions list yields all of its glyphs; a MarqueeView only those in
+    the viewport, with their index in the whole text.
+    """
+    if isinstance(positions, MarqueeView):
+        return positions.indexed()
+    return enumerate(positions)
+
+
+class SlotPool:  # pylint: disable=too-few-public-methods
+    """Maps glyph keys (index, layer) onto a pool of `slots` recycled items.
+
+    The glyphs visible at once form a contiguous index range no longer than
+    `slots`, so index % slots never puts two of them on one item.
+    """
+
+    def __init__(self, pool, slots):
+        self.pool = pool
+        self.slots = slots
+
+    def put(self, key, spec, align="center"):
+        """Place a glyph on the item of its slot."""
+        return self.pool.put((key[0] % self.slots, key[1]), spec, align)
+
+
+class GlyphPool(TextLayer):
+    """Canvas text items for the animated glyphs, keyed by (index, layer).
+
+    Items are allocated once per layout by allocate(); frames then only move,
+    recolor or resize existing items through put(). Items that a frame does
+    not place are hidden rather than deleted, so switching between the 3D
+    effect and the single-layer effects creates no Tk items either.
+
+    Tk cannot clip canvas items, so clip() masks the canvas beside a
+    viewport with background-colored rectangles stacked between the glyphs
+    and everything else (the menu).
+    """
+
+    tag = "glyph"   # canvas tag of every glyph item
+
+    def __init__(self, screen):
+        super().__init__(screen)
+        self.masks = []     # rectangle items of clip(), left and right
+        self.layout = None
+        self.visible = set()
+        self.placed = set()
+        self.cycle = None       # FrameCycle replayed for the current layout
+        self.cycle_for = None   # animation inputs the cycle was looked up for
+        self.frame_start = (0, 0)   # (puts, skipped) when the frame began
+
+    def new_item(self, cx, cy, ch, font):
+        """Create one hidden glyph item at canvas coordinates."""
+        return self.canvas.create_text(
+            cx, cy, text=ch, anchor=TEXT_ANCHORS["center"],
+            fill="black", font=font_option(font), state="hidden",
+            tags=self.tag)
+
+    def allocate(self, positions):
+        """Create hidden items for every glyph and depth layer of a layout.
+
+        This is a no-op if the text and font size have not changed since
+        the last allocation.
+        """
+        layout = (tuple(positions), FONT_SIZE)
+        if layout == self.layout:
+            return
+        self.delete_all()
+        self.visible.clear()
+        self.layout = layout
+        self.cycle = self.cycle_for = None
+        font = FONTS.get(FONT_NAME, FONT_SIZE, FONT_STYLE)
+        # Back-to-front order matches the draw order of the 3D effect
+        for i, (ch, x, y) in enumerate(positions):
+            if ch == ' ':
+                continue
+            px, py = self.pixel_xy(x, y)
+            for layer in range(DEPTH_LAYERS, -1, -1):
+                key = (i, layer)
+                self.items[key] = self.new_item(px, py, ch, font)
+                self.applied[key] = (px, py, ch, (0, 0, 0), font)
+                self.hidden.add(key)
+
+    def clip(self, viewport, reach):
+        """Hide glyphs drawn up to `reach` units outside the x `viewport`.
+
+        Call after allocate(): the masks are stacked above the glyph items
+        that exist now. `viewport` None removes the masks.
+        """
+        canvas = self.canvas
+        if viewport is None:
+            for item in self.masks:
+                canvas.itemconfigure(item, state="hidden")
+            return
+        left, right = viewport
+        top, bottom = MASK_EXTENT, -MASK_EXTENT
+        boxes = ((*self.canvas_xy(left - reach, top),
+                  *self.canvas_xy(left, bottom)),
+                 (*self.canvas_xy(right, top),
+                  *self.canvas_xy(right + reach, bottom)))
+        if not self.masks:
+            self.masks = [canvas.create_rectangle(
+                *box, fill=BACKGROUND_COLOR, outline="") for box in boxes]
+        for item, box in zip(self.masks, boxes):
+            canvas.coords(item, *box)
+            canvas.itemconfigure(item, state="normal")
+            canvas.tag_lower(item)
+        canvas.tag_lower(self.tag)
+
+    def use_cycle(self, cycle, state):
+        """Remember the cycle replayed for the animation inputs `state`."""
+        self.cycle = cycle
+        self.cycle_for = state
+
+    def begin_frame(self):
+        """Start collecting the items placed by the next frame."""
+        self.placed = set()
+        self.frame_start = (self.puts, self.skipped)
+
+    def put(self, key, spec, align="center"):
+        """Place a glyph item for the current frame."""
+        self.placed.add(key)
+        return super().put(key, spec, align)
+
+    def end_frame(self):
+        """Hide the items that were visible before but not placed now."""
+        for key in self.visible - self.placed:
+            self.hide(key)
+        self.visible = self.placed
+
+    def hide_all(self):
+        """Hide every glyph and mask (e.g. while the input screen is shown)."""
+        super().hide_all()
+        self.clip(None, 0)
+        self.visible = set()
+
+
+def quantize_color(color, levels=SPRITE_COLOR_LEVELS):
+    """Round an (r, g, b) color to `levels` evenly spaced values per channel."""
+    top = levels - 1
+    return tuple(round(c * top / 255) * 255 // top for c in color)
+
+
+SPRITE_FONT_FILES = {"bold": "bd", "italic": "i", "bold italic": "bi"}
+_SPRITE_FONTS = {}
+
+
+def sprite_font(family, pixels, style="normal"):
+    """Return a Pillow font for a Tk font description (memoized).
+
+    Tries the family's font file under its Windows and macOS names, then
+    DejaVu Sans (common on Linux) and finally Pillow's bundled default font.
+    """
+    key = (family, pixels, style)
+    font = _SPRITE_FONTS.get(key)
+    if font is None:
+        suffix = SPRITE_FONT_FILES.get(style, "")
+        dejavu = "-Bold" if "bold" in style else ""
+        names = [f"{family.lower()}{suffix}.ttf",
+                 f"{family} {style.title()}.ttf" if suffix else
+                 f"{family}.ttf",
+                 f"DejaVuSans{dejavu}.ttf"]
+        for name in names:
+            try:
+                font = ImageFont.truetype(name, pixels)
+                break
+            except OSError:
+                continue
+        else:
+            font = ImageFont.load_default(pixels)
+        _SPRITE_FONTS[key] = font
+    return font
+
+
+def render_sprite(ch, font, color, scale=1.0):
+    """Rasterize one glyph into an RGBA Pillow image.
+
+    `font` is a Tk (family, points, style) tuple and `scale` the number of
+    pixels per point. The image is as wide as the glyph advance and as tall
+    as the font's line, so anchoring it at its bottom center matches a Tk
+    text item anchored "s".
+    """
+    family, size, style = font
+    face = sprite_font(family, max(1, round(size * scale)), style)
+    ascent, descent = face.getmetrics()
+    right = face.getbbox(ch)[2]
+    width = max(1, math.ceil(face.getlength(ch)), right)
+    image = Image.new("RGBA", (width, ascent + descent), (0, 0, 0, 0))
+    ImageDraw.Draw(image).text((0, 0), ch, font=face, fill=tuple(color))
+    return image
+
+
+def tk_photo(image):
+    """Convert a Pillow image into a Tk photo image (needs a Tk root)."""
+    from PIL import ImageTk  # pylint: disable=import-outside-toplevel
+    return ImageTk.PhotoImage(image)
+
+
+class SpriteCache:
+    """LRU cache of pre-rasterized, color-quantized glyph images.
+
+    Sprites are keyed by (char, font, quantized color), so every shade of
+    the 3D extrusion that rounds to the same color shares one image. The
+    cache is capped by the pixel memory of its images: `max_bytes`, raised
+    by prewarm() to what the current cycle needs, up to `limit`. `factory`
+    turns the rendered Pillow image into what the canvas displays.
+    """
+
+    def __init__(self, max_bytes=SPRITE_CACHE_BYTES,
+                 levels=SPRITE_COLOR_LEVELS, scale=1.0, factory=tk_photo,
+                 limit=SPRITE_CACHE_LIMIT):
+        self.base_bytes = self.max_bytes = max_bytes
+        self.limit = max(limit, max_bytes)
+        self.levels = levels
+        self.scale = scale
+        self.factory = factory
+        self.sprites = OrderedDict()   # key -> (sprite, nbytes)
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, ch, font, color):
+        """Return the cache key a glyph is drawn from."""
+        return ch, font, quantize_color(color, self.levels)
+
+    def get(self, key):
+        """Return the sprite for a key(), rendering it on a miss."""
+        entry = self.sprites.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.sprites.move_to_end(key)
+            return entry[0]
+        self.misses += 1
+        sprite = self._render(key)
+        self._evict()
+        return sprite
+
+    def _render(self, key):
+        ch, font, color = key
+        image = render_sprite(ch, font, color, self.scale)
+        nbytes = 4 * image.width * image.height
+        sprite = self.factory(image)
+        self.sprites[key] = (sprite, nbytes)
+        self.nbytes += nbytes
+        return sprite
+
+    def _evict(self):
+        while self.nbytes > self.max_bytes and len(self.sprites) > 1:
+            _, (_, old) = self.sprites.popitem(last=False)
+            self.nbytes -= old
+            self.evictions += 1
+
+    def prewarm(self, cycle):
+        """Render the sprites a FrameCycle needs and make room for them all.
+
+        The cap is set to the bytes of the cycle's sprites (at least
+        `base_bytes`), so replaying the cycle never evicts its own sprites;
+        sprites of earlier cycles are evicted first. Return False, with the
+        cap back at `base_bytes`, if the cycle needs more than `limit`.
+        """
+        needed = {}
+        chars, palette, font_table = cycle.chars, cycle.palette, \
+            cycle.font_table
+        count = len(cycle.keys)
+        for j, (color, font) in enumerate(zip(cycle.colors, cycle.fonts)):
+            key = self.key(chars[j % count], font_table[font],
+                           palette[color])
+            needed[key] = None
+        demand = 0
+        missing = []
+        for key in needed:
+            entry = self.sprites.get(key)
+            if entry is None:
+                missing.append(key)
+            else:
+                self.sprites.move_to_end(key)
+                demand += entry[1]
+        for key in missing:
+            if demand > self.limit:
+                break
+            self._render(key)
+            demand += self.sprites[key][1]
+        fits = demand <= self.limit
+        self.max_bytes = max(self.base_bytes, demand) if fits else \
+            self.base_bytes
+        self._evict()
+        return fits
+
+    def clear(self):
+        """Drop every cached sprite."""
+        self.sprites.clear()
+        self.nbytes = 0
+        self.max_bytes = self.base_bytes
+
+    def stats(self):
+        """Return hit/miss/eviction counters, hit rate and memory use."""
+        lookups = self.hits + self.misses
+        return {"entries": len(self.sprites), "bytes": self.nbytes,
+                "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0}
+
+
+class SpritePool(GlyphPool):
+    """Glyph pool whose items are canvas images taken from a SpriteCache.
+
+    Placing a glyph only moves its image item or swaps the image it shows;
+    Tk never lays out or rasterizes text during the animation. Each item
+    keeps a reference to its current sprite, so an image evicted from the
+    cache stays valid while it is on screen.
+
+    A layout whose cycle needs more sprites than the cache limit is drawn
+    with text items like a GlyphPool instead, until the next layout.
+    """
+
+    snap = staticmethod(tk_round_image)
+
+    def __init__(self, screen, sprites):
+        super().__init__(screen)
+        self.sprites = sprites
+        self.images = {}   # key -> sprite currently shown by the item
+        self.text_items = False
+
+    def new_item(self, cx, cy, ch, font):
+        """Create one hidden, empty image item at canvas coordinates."""
+        if self.text_items:
+            return super().new_item(cx, cy, ch, font)
+        return self.canvas.create_image(
+            cx, cy, anchor=TEXT_ANCHORS["center"], state="hidden",
+            tags=self.tag)
+
+    def allocate(self, positions):
+        """Allocate items for a layout; a new layout tries sprites again."""
+        if (tuple(positions), FONT_SIZE) != self.layout:
+            self.text_items = False
+            self.snap = tk_round_image
+        super().allocate(positions)
+
+    def use_cycle(self, cycle, state):
+        """Render the replayed cycle's sprites up front.
+
+        Switches the layout to text items if they do not fit the cache.
+        """
+        if (cycle is not None and not self.text_items and
+                not self.sprites.prewarm(cycle)):
+            self.text_items = True
+            self.snap = tk_round
+            positions, self.layout = self.layout[0], None
+            super().allocate(positions)
+        super().use_cycle(cycle, state)
+
+    def put(self, key, spec, align="center"):
+        """Place a glyph sprite for the current frame."""
+        if self.text_items:
+            return super().put(key, spec, align)
+        self.placed.add(key)
+        self.puts += 1
+        x, y, ch, color, font = spec
+        px, py = self.pixel_xy(x, y)
+        sprite_key = self.sprites.key(ch, font, color)
+        item = self.items.get(key)
+        if item is None:
+            item = self.items[key] = self.new_item(px, py, ch, font)
+            self.hidden.add(key)
+            old = None
+        else:
+            old = self.applied[key]
+            if old == (px, py, sprite_key) and key not in self.hidden:
+                self.skipped += 1
+                return False
+        if old is None or old[:2] != (px, py):
+            self.canvas.coords(item, px, py)
+        options = {}
+        if old is None or old[2] != sprite_key:
+            sprite = self.images[key] = self.sprites.get(sprite_key)
+            options["image"] = sprite
+        if key in self.hidden:
+            self.hidden.discard(key)
+            options["state"] = "normal"
+        if options:
+            self.canvas.itemconfigure(item, **options)
+        self.applied[key] = (px, py, sprite_key)
+        return True
+
+    def delete_all(self):
+        """Delete every item and release the sprites they referenced."""
+        super().delete_all()
+        self.images.clear()
+
+
+def make_glyph_pool(screen):
+    """Return a SpritePool if glyphs can be pre-rasterized, else a GlyphPool.
+
+    Sprites need Pillow with a usable font; without them the animation is
+    drawn with plain canvas text items.
+    """
+    if not SPRITE_GLYPHS or not load_pillow():
+        return GlyphPool(screen)
+    canvas = screen.getcanvas()
+    try:
+        scale = float(canvas.winfo_fpixels("1p"))
+        render_sprite("A", (FONT_NAME, FONT_SIZE, FONT_STYLE), (0, 0, 0),
+                      scale)
+    except (AttributeError, OSError, ValueError):
+        return GlyphPool(screen)
+    return SpritePool(screen, SpriteCache(scale=scale))
+
+
+def quality_settings(level=0):
+    """Return (layers, depth_step, hue_steps) for a QUALITY_LEVELS index.
+
+    Lower levels of detail draw fewer extrusion layers spaced further
+    apart, so the extrusion keeps its full depth, and quantize the hue.
+    """
+    fraction, hue_steps = QUALITY_LEVELS[level]
+    layers = min(DEPTH_LAYERS, max(1, round(DEPTH_LAYERS * fraction)))
+    depth_step = DEPTH_LAYERS / layers if layers else 0.0
+    return layers, depth_step, hue_steps
+
+
+class Effect:  # pylint: disable=too-few-public-methods
+    """One composable per-glyph transform of an Animation.
+
+    Each effect is a function of the glyph index `i` and the animation
+    frame (in degrees), written once against a math module `m`: the fused
+    scalar pass calls it with `math` and numbers, the NumPy kernel with `np`
+    and arrays of indices and frames. `kind` names the part of the glyph it
+    transforms: "color", "offset", "size" or "layers".
+    """
+
+    kind = None
+
+
+class HueCycle(Effect):  # pylint: disable=too-few-public-methods
+    """Color: hues step along the text and cycle with the frame."""
+
+    kind = "color"
+
+    def __init__(self, speed=1, spacing=15):
+        self.speed = speed
+        self.spacing = spacing
+
+    def hue(self, m, i, frame, count):
+        """Return the hue (0..1) of glyph `i` of `count`."""
+        return ((frame * self.speed + i * self.spacing) % 360) / 360.0
+
+
+class HueSpread(Effect):  # pylint: disable=too-few-public-methods
+    """Color: one turn of the color wheel spread over the whole text."""
+
+    kind = "color"
+
+    def __init__(self, speed=0):
+        self.speed = speed
+
+    def hue(self, m, i, frame, count):
+        """Return the hue (0..1) of glyph `i` of `count`."""
+        return ((i / max(1, count)) % 1.0 +
+                (frame * self.speed % 360) / 360.0) % 1.0
+
+
+class Wave(Effect):  # pylint: disable=too-few-public-methods
+    """Offset: glyphs ride a sine wave up and down."""
+
+    kind = "offset"
+
+    def __init__(self, amplitude=30, speed=3, spacing=30):
+        self.amplitude = amplitude
+        self.speed = speed
+        self.spacing = spacing
+
+    def offset(self, m, i, frame):
+        """Return the (dx, dy) of glyph `i`."""
+        return 0.0, m.sin(m.radians(frame * self.speed +
+                                    i * self.spacing)) * self.amplitude
+
+
+class Orbit(Effect):  # pylint: disable=too-few-public-methods
+    """Offset: glyphs circle their place on a breathing radius."""
+
+    kind = "offset"
+
+    def __init__(self, radius=20, swing=15, speed=2, spacing=25, *,
+                 swing_speed=1, swing_spacing=30):
+        self.radius = radius
+        self.swing = swing
+        self.speed = speed
+        self.spacing = spacing
+        self.swing_speed = swing_speed
+        self.swing_spacing = swing_spacing
+
+    def offset(self, m, i, frame):
+        """Return the (dx, dy) of glyph `i`."""
+        angle = m.radians(frame * self.speed + i * self.spacing)
+        radius = self.radius + m.sin(m.radians(
+            frame * self.swing_speed + i * self.swing_spacing)) * self.swing
+        return m.cos(angle) * radius, m.sin(angle) * radius
+
+
+class Bounce(Effect):  # pylint: disable=too-few-public-methods
+    """Offset: glyphs hop up from their place and fall back."""
+
+    kind = "offset"
+
+    def __init__(self, height=50, speed=4, spacing=20):
+        self.height = height
+        self.speed = speed
+        self.spacing = spacing
+
+    def offset(self, m, i, frame):
+        """Return the (dx, dy) of glyph `i`."""
+        phase = (frame * self.speed + i * self.spacing) % 360
+        return 0.0, abs(m.sin(m.radians(phase))) * self.height
+
+
+class Pulse(Effect):  # pylint: disable=too-few-public-methods
+    """Size: glyphs grow and shrink around the font size."""
+
+    kind = "size"
+
+    def __init__(self, amount=0.3, speed=3, spacing=25):
+        self.amount = amount
+        self.speed = speed
+        self.spacing = spacing
+
+    def scale(self, m, i, frame):
+        """Return the font size factor of glyph `i`."""
+        return 1.0 + m.sin(m.radians(frame * self.speed +
+                                     i * self.spacing)) * self.amount
+
+
+class Extrude(Effect):  # pylint: disable=too-few-public-methods
+    """Layers: fake 3D extrusion of DEPTH_LAYERS darker copies.
+
+    The copies trail each glyph along an ellipse (`spread` wide, `tilt`
+    flattened) that turns with the frame, `twist` radians further per
+    glyph. The level of detail (QUALITY_LEVELS) applies to animations with
+    this effect.
+    """
+
+    kind = "layers"
+
+    def __init__(self, spread=0.8, tilt=0.45, speed=1, twist=0.18):
+        self.spread = spread
+        self.tilt = tilt
+        self.speed = speed
+        self.twist = twist
+
+    def angle(self, m, i, frame):
+        """Return the direction (radians) the layers of glyph `i` trail in."""
+        return m.radians(frame * self.speed) + i * self.twist
+
+
+class Animation:
+    """An animation type: a stack of Effects fused into one pass per frame.
+
+    The last color and the last layers effect apply; offsets add up and
+    size factors multiply. Calling the animation draws one frame into a
+    glyph pool with a single loop over the glyphs, whatever the number of
+    effects, and kernel() computes many frames at once with NumPy from the
+    same effect formulas.
+    """
+
+    def __init__(self, *effects):
+        self.effects = effects
+        kinds = {}
+        for effect in effects:
+            kinds.setdefault(effect.kind, []).append(effect)
+        self.color = kinds.get("color", [HueSpread()])[-1]
+        self.offsets = kinds.get("offset", [])
+        self.scales = kinds.get("size", [])
+        self.extrude = kinds.get("layers", [None])[-1]
+
+    @property
+    def adaptive(self):
+        """True if the level of detail (QUALITY_LEVELS) applies."""
+        return self.extrude is not None
+
+    def __call__(self, pool, positions, frame, font_size=None, *, quality=0):
+        """Draw `frame` into `pool`; `quality` is a QUALITY_LEVELS index."""
+        if font_size is None:
+            font_size = FONT_SIZE
+        font = FONTS.get(FONT_NAME, font_size, FONT_STYLE)
+        hue_of, offsets, scales = self.color.hue, self.offsets, self.scales
+        extrude = self.extrude
+        hue_steps = 0
+        rows = [PALETTE.base]
+        if extrude is not None:
+            layers, depth_step, hue_steps = quality_settings(quality)
+            # One shaded palette row per depth layer, back-to-front
+            depths = [(layer, layer * depth_step)
+                      for layer in range(layers, -1, -1)]
+            rows = [PALETTE.shaded(1.0 - (depth / (DEPTH_LAYERS + 3)) * 0.7)
+                    for _, depth in depths]
+        count = len(positions)
+        put = pool.put
+
+        for i, (ch, x, y) in indexed(positions):
+            if ch == ' ':
+                continue
+            hue = hue_of(math, i, frame, count)
+            if hue_steps:
+                hue = math.floor(hue * hue_steps) / hue_steps
+            hue_index = PALETTE.index(hue)
+            for effect in offsets:
+                dx, dy = effect.offset(math, i, frame)
+                x += dx
+                y += dy
+            if scales:
+                scale = 1.0
+                for effect in scales:
+                    scale *= effect.scale(math, i, frame)
+                font = FONTS.scaled(FONT_NAME, font_size * scale, FONT_STYLE)
+            lift = font[1] * 0.35
+            if extrude is None:
+                put((i, 0), (x, y - lift, ch, rows[0][hue_index], font))
+                continue
+            # Depth layers back-to-front
+            theta = extrude.angle(math, i, frame)
+            trail_x = math.cos(theta)
+            trail_y = math.sin(theta)
+            for (layer, depth), row in zip(depths, rows):
+                put((i, layer),
+                    (x + depth * trail_x * extrude.spread,
+                     y + depth * trail_y * extrude.spread * extrude.tilt -
+                     lift, ch, row[hue_index], font))
+
+    def kernel(self, positions, frames, font_size=None, quality=0):
+        """Compute the draw commands of all `frames` at once (NumPy).
+
+        Returns (keys, chars, xs, ys, rgb, sizes); the per-command arrays
+        have shape (frames, commands) and commands follow the draw order of
+        calling the animation. Needs load_numpy() to have succeeded.
+        """
+        if font_size is None:
+            font_size = FONT_SIZE
+        idx, chars, xs, ys = _glyph_arrays(positions)
+        fr = frames[:, None]
+        shape = (len(frames), len(idx))
+        hue = np.broadcast_to(self.color.hue(np, idx, fr, len(positions)),
+                              shape)
+        xs, ys = np.broadcast_to(xs, shape), np.broadcast_to(ys, shape)
+        for effect in self.offsets:
+            dx, dy = effect.offset(np, idx, fr)
+            xs, ys = xs + dx, ys + dy
+        sizes = np.full(shape, font_size)
+        if self.scales:
+            scale = 1.0
+            for effect in self.scales:
+                scale = scale * effect.scale(np, idx, fr)
+            step = FONTS.step
+            sizes = np.maximum(step, step * np.rint(font_size * scale / step))
+            sizes = sizes.astype(np.int64)
+        lift = sizes * 0.35
+        keys = [(int(i), 0) for i in idx]
+        extrude = self.extrude
+        if extrude is None:
+            return keys, chars, xs, ys - lift, PALETTE.rgb_array(hue), sizes
+
+        layers, depth_step, hue_steps = quality_settings(quality)
+        if hue_steps:
+            hue = np.floor(hue * hue_steps) / hue_steps
+        theta = extrude.angle(np, idx, fr)
+        trail_x = np.cos(theta)[:, :, None]
+        trail_y = np.sin(theta)[:, :, None]
+        layer_ids = np.arange(layers, -1, -1)               # back -> front
+        depth = layer_ids * depth_step
+        shade = 1.0 - (depth / (DEPTH_LAYERS + 3)) * 0.7
+        rgb = np.clip(np.trunc(PALETTE.rgb_array(hue)[:, :, None, :] *
+                               shade[None, None, :, None]), 0, 255)
+        xs = xs[:, :, None] + depth * trail_x * extrude.spread
+        ys = (ys[:, :, None] + depth * trail_y * extrude.spread *
+              extrude.tilt - lift[:, :, None])
+        sizes = np.broadcast_to(sizes[:, :, None], xs.shape)
+        keys = [(key[0], int(layer)) for key in keys for layer in layer_ids]
+        chars = [ch for ch in chars for _ in layer_ids]
+        n_frames = len(frames)
+        return (keys, chars, xs.reshape(n_frames, -1),
+                ys.reshape(n_frames, -1), rgb.reshape(n_frames, -1, 3),
+                sizes.reshape(n_frames, -1))
+
+
+# Animation types by name. Register a new Animation here to make it
+# selectable (e.g. with --type); the menu keys A-E pick the first five.
+ANIMATIONS = {
+    "3d_rotation": Animation(HueSpread(speed=1), Extrude()),
+    "wave": Animation(HueCycle(spacing=15), Wave()),
+    "spiral": Animation(HueCycle(spacing=20), Orbit()),
+    "bounce": Animation(HueSpread(), Bounce()),
+    "rainbow_pulse": Animation(HueCycle(speed=2, spacing=15), Pulse()),
+}
+
+
+def get_animation(name=None):
+    """Return the Animation registered as `name` (ANIMATION_TYPE if None).
+
+    Unknown names fall back to the 3D rotation.
+    """
+    if name is None:
+        name = ANIMATION_TYPE
+    return ANIMATIONS.get(name) or ANIMATIONS["3d_rotation"]
+
+
+class FrameCycle:
+    """One full animation cycle of glyph draw commands in compact arrays.
+
+    Every animation draws the same (index, layer) items in the same order on
+    every frame, so the keys and characters are stored once and each of the
+    360 / FRAME_STEP frames only stores position, color and font indices.
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.chars = []
+        self.xs = array("d")
+        self.ys = array("d")
+        self.colors = array("I")   # index into self.palette
+        self.fonts = array("H")    # index into self.font_table
+        self.palette = []
+        self.font_table = []
+        self._palette_index = {}
+        self._font_index = {}
+        self._frame_keys = None
+        self.valid = True
+
+    def begin_frame(self):
+        """Start recording the next frame."""
+        self._frame_keys = []
+
+    def put(self, key, spec, align="center"):
+        """Record one draw command (same signature as GlyphPool.put)."""
+        x, y, ch, color, font = spec
+        if not self.keys:
+            self.chars.append(ch)
+        self._frame_keys.append(key)
+        self.xs.append(x)
+        self.ys.append(y)
+        color_id = self._palette_index.get(color)
+        if color_id is None:
+            color_id = self._palette_index[color] = len(self.palette)
+            self.palette.append(color)
+        self.colors.append(color_id)
+        font_id = self._font_index.get(font)
+        if font_id is None:
+            font_id = self._font_index[font] = len(self.font_table)
+            self.font_table.append(font)
+        self.fonts.append(font_id)
+
+    def end_frame(self):
+        """Finish a frame; a cycle whose item set varies is marked invalid."""
+        if not self.keys:
+            self.keys = self._frame_keys
+        elif self._frame_keys != self.keys:
+            self.valid = False
+        self._frame_keys = None
+
+    @property
+    def count(self):
+        """Number of draw commands per frame."""
+        return len(self.keys)
+
+    @property
+    def nbytes(self):
+        """Approximate memory footprint in bytes."""
+        arrays = (self.xs, self.ys, self.colors, self.fonts)
+        return (sum(a.itemsize * len(a) for a in arrays) +
+                64 * (len(self.keys) + len(self.palette) +
+                      len(self.font_table)))
+
+    def replay(self, pool, frame):
+        """Apply the recorded commands of `frame` to the glyph pool."""
+        base = (frame % 360) // FRAME_STEP * len(self.keys)
+        xs, ys, colors, fonts = self.xs, self.ys, self.colors, self.fonts
+        palette, font_table, chars = self.palette, self.font_table, self.chars
+        put = pool.put
+        for k, key in enumerate(self.keys):
+            j = base + k
+            put(key, (xs[j], ys[j], chars[k], palette[colors[j]],
+                      font_table[fonts[j]]))
+
+
+def _glyph_arrays(positions):
+    """Return indices, chars, x and y arrays of the non-space glyphs."""
+    glyphs = [(i, ch, x, y) for i, (ch, x, y) in enumerate(positions)
+              if ch != ' ']
+    idx = np.array([g[0] for g in glyphs], dtype=np.int64)
+    base_x = np.array([g[2] for g in glyphs], dtype=np.float64)
+    base_y = np.array([g[3] for g in glyphs], dtype=np.float64)
+    return idx, [g[1] for g in glyphs], base_x, base_y
+
+
+def frame_cycle_from_arrays(arrays):
+    """Pack kernel output (keys, chars, xs, ys, rgb, sizes) into a FrameCycle.
+    """
+    keys, chars, xs, ys, rgb, sizes = arrays
+    cycle = FrameCycle()
+    cycle.keys = keys
+    cycle.chars = chars
+    cycle.xs.frombytes(np.ascontiguousarray(xs, dtype=np.float64).tobytes())
+    cycle.ys.frombytes(np.ascontiguousarray(ys, dtype=np.float64).tobytes())
+
+    rgb = rgb.astype(np.int64).reshape(-1, 3)
+    packed = (rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2]
+    unique, inverse = np.unique(packed, return_inverse=True)
+    cycle.palette = [intern_color((int(c) >> 16, (int(c) >> 8) & 255,
+                                   int(c) & 255)) for c in unique]
+    cycle.colors.frombytes(inverse.astype(np.uint32).tobytes())
+
+    unique, inverse = np.unique(np.asarray(sizes).ravel(),
+                                return_inverse=True)
+    cycle.font_table = [FONTS.get(FONT_NAME, int(size), FONT_STYLE)
+                        for size in unique]
+    cycle.fonts.frombytes(inverse.astype(np.uint16).tobytes())
+    return cycle
+
+
+def build_frame_cycle(positions, animation_type, font_size=None, quality=0):
+    """Compute every frame of an animation cycle into a FrameCycle.
+
+    Uses the animation's batched NumPy kernel when NumPy is installed and
+    falls back to recording its scalar pass otherwise. `quality` only
+    applies to adaptive animations (the 3D rotation).
+    """
+    animation = get_animation(animation_type)
+    if load_numpy():
+        frames = np.arange(0, 360, FRAME_STEP)
+        return frame_cycle_from_arrays(
+            animation.kernel(positions, frames, font_size, quality))
+
+    cycle = FrameCycle()
+    for frame in range(0, 360, FRAME_STEP):
+        cycle.begin_frame()
+        animation(cycle, positions, frame, font_size, quality=quality)
+        cycle.end_frame()
+    return cycle
+
+
+class FrameCycleCache:
+    """LRU cache of FrameCycle objects with a bounded memory footprint.
+
+    Cycles are keyed by (positions, FONT_SIZE, DEPTH_LAYERS, Animation,
+    quality level, PALETTE, FONTS.step), so switching back to a previously
+    seen size, animation or level of detail reuses the cycle computed the
+    first time, while an Animation registered again under the same name
+    or a new font step gets cycles of its own. Lookups are serialized by a lock, since the frame pipeline's
+    worker builds cycles too.
+    """
+
+    def __init__(self, max_bytes=CYCLE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.lock = threading.RLock()
+        self.cycles = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, layout, animation_type, font_size=None, quality=0):
+        """Return the cycle for a layout tuple, or None if it cannot fit."""
+        if font_size is None:
+            font_size = FONT_SIZE
+        if not get_animation(animation_type).adaptive:
+            quality = 0
+        key = (layout, font_size, DEPTH_LAYERS, get_animation(animation_type),
+               quality, PALETTE, FONTS.step)
+        with self.lock:
+            cycle = self.cycles.get(key)
+            if cycle is not None:
+                self.hits += 1
+                self.cycles.move_to_end(key)
+                return cycle
+            self.misses += 1
+            cycle = build_frame_cycle(layout, animation_type, font_size,
+                                      quality)
+            if not cycle.valid or cycle.nbytes > self.max_bytes:
+                return None
+            self.cycles[key] = cycle
+            self.nbytes += cycle.nbytes
+            while self.nbytes > self.max_bytes:
+                _, old = self.cycles.popitem(last=False)
+                self.nbytes -= old.nbytes
+                self.evictions += 1
+            return cycle
+
+    def clear(self):
+        """Drop every cached cycle."""
+        with self.lock:
+            self.cycles.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        """Return hit/miss/eviction counters and memory use."""
+        return {"entries": len(self.cycles), "bytes": self.nbytes,
+                "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions}
+
+
+FRAME_CYCLES = FrameCycleCache()
+
+
+def draw_frame(pool, positions, frame):
+    """Draw a single animation frame into the glyph pool.
+
+    Glyph items persist between frames: the selected animation moves and
+    recolors them, and items it does not place this frame are hidden.
+    Frames on the regular FRAME_STEP grid are replayed from the cached
+    cycle; anything else is computed directly. `positions` may also be a
+    MarqueeView, whose visible glyphs are drawn onto recycled pool slots.
+    """
+    pool.begin_frame()
+    quality = GOVERNOR.level if get_animation().adaptive else 0
+    
+    target = pool
+    cycle = None
+    if isinstance(positions, MarqueeView):
+        # Scrolling glyphs never repeat a cycle; draw the visible ones live
+        target = SlotPool(pool, positions.slots)
+    elif frame % FRAME_STEP == 0:
+        if pool.layout is None:
+            cycle = FRAME_CYCLES.get(tuple(positions), ANIMATION_TYPE,
+                                     quality=quality)
+        else:
+            # Only look the cycle up again when the animation inputs change
+            state = (ANIMATION_TYPE, FONT_SIZE, DEPTH_LAYERS, quality,
+                     PALETTE, get_animation(), FONTS.step)
+            if pool.cycle_for != state:
+                pool.use_cycle(FRAME_CYCLES.get(pool.layout[0],
+                                                ANIMATION_TYPE,
+                                                quality=quality), state)
+            cycle = pool.cycle
+    
+    if cycle is not None:
+        cycle.replay(pool, frame)
+    else:
+        get_animation()(target, positions, frame, quality=quality)
+    
+    pool.end_frame()
+
+
+class FrameScheduler:
+    """Deadline-based frame clock for the animation loop.
+
+    Ticks are aimed at fixed deadlines on a monotonic clock and the frame
+    drawn on each tick is derived from the elapsed time, so motion speed
+    does not depend on how long rendering takes. When a tick arrives late,
+    the frames whose deadlines were missed are skipped and counted as
+    dropped.
+    """
+
+    def __init__(self, fps=None, clock=time.monotonic):
+        self.fps = fps
+        self.clock = clock
+        self.origin = None   # clock time of frame index 0
+        self.phase0 = 0      # animation frame (degrees) at the origin
+        self.index = -1      # last frame index drawn
+        self.drawn = 0
+        self.dropped = 0
+
+    @property
+    def rate(self):
+        """Frames per second currently targeted."""
+        return self.fps or TARGET_FPS
+
+    def start(self, frame=0):
+        """Restart the clock so that `frame` is drawn right now."""
+        self.origin = self.clock()
+        self.phase0 = frame
+        self.index = -1
+
+    def next_frame(self):
+        """Return the frame to draw now, or None if this tick is early."""
+        if self.origin is None:
+            self.start()
+        # Rounded like delay_ms(), so a tick at its deadline is never
+        # taken for an early one because of float error
+        index = int(round((self.clock() - self.origin) * self.rate, 6))
+        if index <= self.index:
+            return None
+        if self.index >= 0:
+            self.dropped += index - self.index - 1
+        self.index = index
+        self.drawn += 1
+        return self.frame_at(index)
+
+    def frame_at(self, index):
+        """Return the animation frame drawn at frame index `index`.
+
+        At rates other than TARGET_FPS most frames fall between the
+        FRAME_STEP grid of the cached cycles; draw_frame() computes those
+        directly, so every tick still shows a new frame.
+        """
+        return (self.phase0 + int(index * ANIMATION_SPEED / self.rate)) % 360
+
+    def delay_ms(self):
+        """Milliseconds until the deadline of the next frame."""
+        deadline = self.origin + (self.index + 1) / self.rate
+        return max(1, math.ceil(round((deadline - self.clock()) * 1000, 6)))
+
+    def stats(self):
+        """Return the target rate and drawn/dropped frame counters."""
+        return {"fps": self.rate, "drawn": self.drawn,
+                "dropped": self.dropped}
+
+
+SCHEDULER = FrameScheduler()
+
+
+class QualityGovernor:
+    """Adaptive level of detail for the 3D rotation effect.
+
+    Render times of the last `window` frames are averaged against the
+    frame budget of the SCHEDULER. Above `degrade_at` of the budget the
+    level drops one step down QUALITY_LEVELS (fewer extrusion layers,
+    coarser colors); below `restore_at` it climbs one step back. The gap
+    between the two thresholds, and starting a fresh window after every
+    change, keep the level from flickering.
+    """
+
+    def __init__(self, window=QUALITY_WINDOW, degrade_at=0.9,
+                 restore_at=0.5, clock=time.perf_counter):
+        self.samples = deque(maxlen=window)
+        self.degrade_at = degrade_at
+        self.restore_at = restore_at
+        self.clock = clock
+        self.enabled = True
+        self.level = 0
+        self.changes = 0
+
+    @property
+    def budget_ms(self):
+        """Milliseconds available to render one frame."""
+        return 1000 / SCHEDULER.rate
+
+    def set_level(self, level):
+        """Force a QUALITY_LEVELS index and restart the measurement."""
+        self.level = max(0, min(len(QUALITY_LEVELS) - 1, level))
+        self.samples.clear()
+
+    def record(self, frame_ms):
+        """Add one frame time; return True if the level changed."""
+        if not self.enabled:
+            return False
+        self.samples.append(frame_ms)
+        if len(self.samples) < self.samples.maxlen:
+            return False
+        mean = sum(self.samples) / len(self.samples)
+        if (mean > self.budget_ms * self.degrade_at and
+                self.level < len(QUALITY_LEVELS) - 1):
+            self.level += 1
+        elif mean < self.budget_ms * self.restore_at and self.level > 0:
+            self.level -= 1
+        else:
+            return False
+        self.samples.clear()
+        self.changes += 1
+        return True
+
+    def label(self):
+        """Menu text for the current level, highest quality first."""
+        layers = quality_settings(self.level)[0]
+        return (f"Quality: {len(QUALITY_LEVELS) - self.level}/"
+                f"{len(QUALITY_LEVELS)} ({layers} layers)")
+
+    def stats(self):
+        """Return the current level, layers drawn and recent frame times."""
+        layers, _, hue_steps = quality_settings(self.level)
+        mean = sum(self.samples) / len(self.samples) if self.samples else 0.0
+        return {"level": self.level, "layers": layers,
+                "hue_steps": hue_steps, "mean_ms": mean,
+                "budget_ms": self.budget_ms, "changes": self.changes}
+
+
+GOVERNOR = QualityGovernor()
+
+
+class CountingCanvas:
+    """Canvas proxy counting the item operations made through it."""
+
+    def __init__(self, canvas, counts):
+        self.canvas = canvas
+        self.counts = counts
+
+    def __getattr__(self, name):
+        return getattr(self.canvas, name)
+
+    def _create(self, kind, coords, options):
+        self.counts["created"] += 1
+        return getattr(self.canvas, "create_" + kind)(*coords, **options)
+
+    def create_text(self, *coords, **options):
+        """Create a text item (counted)."""
+        return self._create("text", coords, options)
+
+    def create_image(self, *coords, **options):
+        """Create an image item (counted)."""
+        return self._create("image", coords, options)
+
+    def create_line(self, *coords, **options):
+        """Create a line item (counted)."""
+        return self._create("line", coords, options)
+
+    def delete(self, *items):
+        """Delete items (counted)."""
+        self.counts["deleted"] += len(items)
+        return self.canvas.delete(*items)
+
+    def coords(self, item, *coords):
+        """Move an item (counted as a reconfiguration)."""
+        self.counts["configured"] += 1
+        return self.canvas.coords(item, *coords)
+
+    def itemconfigure(self, item, **options):
+        """Reconfigure an item (counted)."""
+        self.counts["configured"] += 1
+        return self.canvas.itemconfigure(item, **options)
+
+
+class FrameProfiler:
+    """Optional per-frame instrumentation of the animation loop.
+
+    While enabled, animate() times the draw, menu and update phases of every
+    frame and the layers' canvases are wrapped to count the items created,
+    deleted and reconfigured. The last `capacity` frame records are kept in
+    a ring buffer. When disabled nothing is wrapped or timed, so the
+    profiler can stay in production builds.
+    """
+
+    PHASES = ("draw", "menu", "update")
+
+    def __init__(self, capacity=PROFILE_FRAMES, clock=time.perf_counter):
+        self.records = deque(maxlen=capacity)
+        self.clock = clock
+        self.enabled = False
+        self.output = None    # JSON lines file written when the app exits
+        self.layers = []
+        self.counts = dict.fromkeys(("created", "deleted", "configured"), 0)
+        self._record = None
+        self._mark = 0.0
+
+    def start(self, *layers):
+        """Enable profiling and count canvas work of the given layers."""
+        if self.enabled:
+            return
+        self.enabled = True
+        self.layers = list(layers)
+        for layer in self.layers:
+            layer.canvas = CountingCanvas(layer.canvas, self.counts)
+
+    def stop(self):
+        """Disable profiling and unwrap the layers; records are kept."""
+        if not self.enabled:
+            return
+        self.enabled = False
+        for layer in self.layers:
+            layer.canvas = layer.canvas.canvas
+        self.layers = []
+
+    def begin(self, frame):
+        """Start timing `frame`."""
+        for name in self.counts:
+            self.counts[name] = 0
+        self._record = {"frame": frame}
+        self._mark = self.clock()
+
+    def mark(self, phase):
+        """Close `phase`, which ran since begin() or the previous mark()."""
+        now = self.clock()
+        self._record[phase + "_ms"] = (now - self._mark) * 1000
+        self._mark = now
+
+    def end(self, **extra):
+        """Store the record of the current frame with `extra` fields."""
+        record = self._record
+        record["total_ms"] = sum(record[phase + "_ms"]
+                                 for phase in self.PHASES)
+        record.update(self.counts)
+        record.update(extra)
+        self.records.append(record)
+        self._record = None
+
+    def percentiles(self, field="total_ms", points=(50, 95, 99)):
+        """Return {"p50": ..., ...} of a field over the buffered frames."""
+        values = sorted(record[field] for record in self.records)
+        if not values:
+            return {f"p{point}": 0.0 for point in points}
+        return {f"p{point}": values[max(0, math.ceil(point / 100 *
+                                                     len(values)) - 1)]
+                for point in points}
+
+    def summary(self):
+        """Return frame count, frame time percentiles and phase means."""
+        count = len(self.records)
+        result = {"frames": count}
+        result.update(self.percentiles())
+        for phase in self.PHASES:
+            result[phase + "_ms"] = (sum(r[phase + "_ms"] for r in
+                                         self.records) / count
+                                     if count else 0.0)
+        for name in self.counts:
+            result[name] = sum(r[name] for r in self.records)
+        ratios = [r["skip_ratio"] for r in self.records if "skip_ratio" in r]
+        result["skip_ratio"] = sum(ratios) / len(ratios) if ratios else 0.0
+        return result
+
+    def write_jsonl(self, out):
+        """Write the buffered frame records as JSON lines."""
+        for record in self.records:
+            out.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+
+PROFILER = FrameProfiler()
+
+
+class AnimationLoop:
+    """Owner of the single timer chain that drives animate().
+
+    Every tick is armed through arm(), which first cancels the pending one
+    (Tk after_cancel), so at most one tick is ever queued however often
+    the animation is started, paused or resumed. Each armed tick also
+    carries the loop's generation; cancel() starts a new generation, so a
+    tick that still fires after being cancelled returns without drawing.
+    The tick callback is a single bound method created once, not a new
+    closure per frame.
+    """
+
+    def __init__(self):
+        self.generation = 0
+        self.armed = None       # generation of the pending tick
+        self.timer = None       # Tk id of the pending tick
+        self.canvas = None
+        self.context = None     # animate() arguments of the current chain
+        self.ticks = 0
+        self.cancels = 0
+        self.stale = 0
+        self._tick = self.tick
+
+    def start(self, screen, anim_t, menu_t, positions, frame=0):
+        """Begin a new chain at `frame`, replacing any running one."""
+        self.cancel()
+        animate(screen, anim_t, menu_t, positions, frame=frame)
+
+    def arm(self, screen, anim_t, menu_t, positions, delay_ms):
+        """Queue the next tick of the chain in `delay_ms` milliseconds."""
+        if self.timer is not None:
+            self.canvas.after_cancel(self.timer)
+        self.context = (screen, anim_t, menu_t, positions)
+        self.canvas = screen.getcanvas()
+        self.armed = self.generation
+        self.timer = self.canvas.after(delay_ms, self._tick)
+
+    def cancel(self):
+        """Stop the chain: drop the pending tick and start a generation."""
+        if self.timer is not None:
+            self.canvas.after_cancel(self.timer)
+            self.timer = None
+            self.cancels += 1
+        self.generation += 1
+
+    def tick(self):
+        """Timer callback: draw the next frame unless cancelled meanwhile."""
+        self.timer = None
+        if self.armed != self.generation:
+            self.stale += 1
+            return
+        self.ticks += 1
+        animate(*self.context)
+
+    def active(self):
+        """Number of chains with a tick queued (0 or 1)."""
+        return int(self.timer is not None)
+
+    def stats(self):
+        """Return the tick, cancellation and stale tick counters."""
+        return {"generation": self.generation, "ticks": self.ticks,
+                "cancels": self.cancels, "stale": self.stale}
+
+
+LOOP = AnimationLoop()
+
+
+def produce_frame(state, frame):
+    """Return the DrawList of `frame` for the frame inputs `state`.
+
+    Mirrors draw_frame() for a wrapped layout: frames on the FRAME_STEP
+    grid are replayed from the cached cycle, anything else is computed.
+    """
+    layout, animation_type, font_size, _, quality, *_ = state
+    draw_list = DrawList()
+    cycle = None
+    if frame % FRAME_STEP == 0:
+        cycle = FRAME_CYCLES.get(layout, animation_type, font_size, quality)
+    if cycle is not None:
+        cycle.replay(draw_list, frame)
+    else:
+        get_animation(animation_type)(draw_list, layout, frame, font_size,
+                                      quality=quality)
+    return draw_list
+
+
+class FramePipeline:
+    """Worker thread that computes the draw lists of upcoming frames.
+
+    The worker produces the DrawLists of the next SCHEDULER frame indices
+    into a buffer of `depth` frames and waits while it is full, so the Tk
+    thread only applies finished lists. Lists are tagged with the frame
+    inputs they were computed for: when the inputs change, cancel() was
+    called or the frame due is not buffered, take() reports a stall, the
+    caller draws that frame directly and the worker restarts after it.
+    """
+
+    def __init__(self, depth=PIPELINE_DEPTH):
+        self.depth = depth
+        self.ready = deque()    # (index, frame, draw_list), oldest first
+        self.cond = threading.Condition()
+        self.state = None       # frame inputs being produced for, if any
+        self.next_index = 0     # frame index the worker computes next
+        self.generation = 0
+        self.thread = None
+        self.closed = False
+        self.takes = 0
+        self.queued = 0         # buffered frames summed over take() calls
+        self.produced = 0
+        self.applied = 0
+        self.stalls = 0
+        self.discarded = 0
+        self.waits = 0          # times the worker waited on a full buffer
+        self.cancels = 0
+
+    def take(self, state, index, frame):
+        """Return the DrawList of frame index `index`, or None on a stall."""
+        with self.cond:
+            self.takes += 1
+            self.queued += len(self.ready)
+            ready = self.ready
+            if state == self.state:
+                while ready and ready[0][0] < index:
+                    ready.popleft()   # frames the scheduler dropped
+                    self.discarded += 1
+                if ready and ready[0][:2] == (index, frame):
+                    self.applied += 1
+                    self.cond.notify()
+                    return ready.popleft()[2]
+            self.stalls += 1
+            self._restart(state, index + 1)
+            return None
+
+    def _restart(self, state, index):
+        """Drop the buffer and produce frames from `index` for `state`."""
+        self.discarded += len(self.ready)
+        self.ready.clear()
+        self.state = state
+        self.next_index = index
+        self.generation += 1
+        if self.thread is None or not self.thread.is_alive():
+            self.closed = False
+            self.thread = threading.Thread(target=self._run, daemon=True,
+                                           name="frame-pipeline")
+            self.thread.start()
+        self.cond.notify()
+
+    def cancel(self):
+        """Drop the buffered frames; the worker idles until the next take."""
+        with self.cond:
+            self.discarded += len(self.ready)
+            self.ready.clear()
+            self.state = None
+            self.generation += 1
+            self.cancels += 1
+
+    def close(self):
+        """Cancel and stop the worker thread."""
+        self.cancel()
+        with self.cond:
+            self.closed = True
+            self.cond.notify()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def _run(self):
+        """Worker loop: fill the buffer for the current inputs."""
+        while True:
+            with self.cond:
+                while not self.closed and (self.state is None or
+                                           len(self.ready) >= self.depth):
+                    if self.state is not None:
+                        self.waits += 1
+                    self.cond.wait()
+                if self.closed:
+                    return
+                generation, state = self.generation, self.state
+                index = self.next_index
+                self.next_index += 1
+            frame = SCHEDULER.frame_at(index)
+            draw_list = produce_frame(state, frame)
+            with self.cond:
+                if generation == self.generation:
+                    self.ready.append((index, frame, draw_list))
+                    self.produced += 1
+
+    def stats(self):
+        """Return queue depth, mean depth at take() and frame counters."""
+        return {"depth": len(self.ready),
+                "mean_depth": self.queued / self.takes if self.takes else 0.0,
+                "produced": self.produced, "applied": self.applied,
+                "stalls": self.stalls, "discarded": self.discarded,
+                "waits": self.waits, "cancels": self.cancels}
+
+
+PIPELINE = FramePipeline()
+
+
+def draw_next_frame(pool, glyphs, frame):
+    """Draw the frame due now, taking it from PIPELINE when it is ready.
+
+    Marquee frames depend on the scroll position and are always drawn
+    directly, as is every frame the pipeline stalls on.
+    """
+    if PIPELINE.depth and MARQUEE is None and pool.layout is not None:
+        quality = GOVERNOR.level if get_animation().adaptive else 0
+        state = (pool.layout[0], ANIMATION_TYPE, FONT_SIZE, DEPTH_LAYERS,
+                 quality, PALETTE, get_animation(), FONTS.step)
+        draw_list = PIPELINE.take(state, SCHEDULER.index, frame)
+        if draw_list is not None:
+            FONTS.realize()
+            if pool.cycle_for != state[1:]:
+                # Lets a SpritePool render the sprites of the cycle ahead
+                pool.use_cycle(FRAME_CYCLES.get(
+                    pool.layout[0], ANIMATION_TYPE, quality=quality),
+                    state[1:])
+            pool.begin_frame()
+            put = pool.put
+            for key, spec in draw_list:
+                put(key, spec)
+            pool.end_frame()
+            return
+    draw_frame(pool, glyphs, frame)
+
+
+def current_glyphs(positions):
+    """Return the glyphs drawn by the frame at SCHEDULER.index.
+
+    That is `positions`, or in marquee mode the MARQUEE scrolled by the
+    elapsed time, like the effects themselves.
+    """
+    if MARQUEE is None:
+        return positions
+    MARQUEE.scroll_to(SCHEDULER.index * MARQUEE_SPEED / SCHEDULER.rate)
+    return MARQUEE
+
+
+def draw_current_frame(anim_t, positions):
+    """Draw the frame last drawn by the SCHEDULER again, if there was one.
+
+    A relayout while paused leaves the new glyph items hidden; this puts
+    the frozen text back on screen.
+    """
+    if SCHEDULER.index >= 0:
+        draw_frame(anim_t, current_glyphs(positions),
+                   SCHEDULER.frame_at(SCHEDULER.index))
+
+
+def animate(screen, anim_t, menu_t, positions, frame=None):
+    """Animation callback using ontimer so the window remains responsive.
+
+    Passing `frame` (re)starts the SCHEDULER clock at that frame; each tick
+    then draws the frame due at the current time and re-arms the timer for
+    the next deadline. The timer belongs to LOOP, so calling this again
+    replaces the pending tick instead of starting a second chain.
+    """
+    if frame is not None:
+        SCHEDULER.start(frame)
+    # Key presses since the last frame take effect together
+    KEYS.apply()
+    # Always check if we should continue
+    if not IS_ANIMATING:
+        # Keep menu visible when paused (text stays frozen)
+        draw_menu(menu_t, screen)
+        screen.update()
+        return
+    
+    due = SCHEDULER.next_frame()
+    if due is not None:
+        glyphs = current_glyphs(positions)
+        started = GOVERNOR.clock()
+        if PROFILER.enabled:
+            PROFILER.begin(due)
+            draw_next_frame(anim_t, glyphs, due)
+            PROFILER.mark("draw")
+            draw_menu(menu_t, screen)
+            PROFILER.mark("menu")
+            screen.update()
+            PROFILER.mark("update")
+            PROFILER.end(dropped=SCHEDULER.dropped, quality=GOVERNOR.level,
+                         skip_ratio=round(anim_t.skip_ratio(
+                             anim_t.frame_start), 4))
+        else:
+            draw_next_frame(anim_t, glyphs, due)
+            # Menu is retained; this only touches lines whose inputs
+            # changed
+            draw_menu(menu_t, screen)
+            # Single flush per frame
+            screen.update()
+        if get_animation().adaptive:
+            # Level of detail follows render cost; the menu shows the
+            # new level on the next frame
+            GOVERNOR.record((GOVERNOR.clock() - started) * 1000)
+    # schedule next frame only if still animating
+    if IS_ANIMATING:
+        LOOP.arm(screen, anim_t, menu_t, positions, SCHEDULER.delay_ms())
+
+
+def relayout(anim_t, positions):
+    """Lay NAME out again and allocate the glyph items it needs.
+
+    `positions` is refilled with the wrapped layout; in marquee mode the
+    MarqueeView is rebuilt too and only its recycled slots are allocated,
+    with the canvas beside the viewport masked.
+    """
+    global MARQUEE
+    positions.clear()
+    positions.extend(prepare_letters(NAME))
+    if MARQUEE is not None:
+        MARQUEE = MarqueeView(NAME)
+        anim_t.allocate(MARQUEE.slot_positions())
+        # Glyphs culled at the margin are still drawn partly outside
+        anim_t.clip(VIEWPORT, 2 * MARQUEE.margin)
+    else:
+        anim_t.allocate(positions)
+        anim_t.clip(None, 0)
+
+
+def toggle_marquee(screen, menu_t, anim_t, positions):
+    """Switch between the wrapped layout and the scrolling marquee."""
+    global MARQUEE
+    MARQUEE = None if MARQUEE is not None else MarqueeView(NAME)
+    PIPELINE.cancel()
+    KEYS.request(reflow=True)
+
+
+def handle_size_key(key, screen, menu_t, anim_t, positions):
+    """Handle font size selection."""
+    global FONT_SIZE
+    
+    size_map = {"1": 32, "2": 48, "3": 64, "4": 80, "5": 96}
+    if size_map.get(key, FONT_SIZE) != FONT_SIZE:
+        FONT_SIZE = size_map[key]
+        # Frames computed ahead are for the old size
+        PIPELINE.cancel()
+        # Update positions with new size (will wrap to multiple lines if
+        # needed) once, before the next frame
+        KEYS.request(reflow=True)
+
+
+def handle_animation_key(key, screen, menu_t, anim_t):
+    """Handle animation type selection."""
+    global ANIMATION_TYPE
+    
+    anim_map = {
+        "a": "3d_rotation",
+        "b": "wave",
+        "c": "spiral",
+        "d": "bounce",
+        "e": "rainbow_pulse"
+    }
+    if anim_map.get(key, ANIMATION_TYPE) != ANIMATION_TYPE:
+        ANIMATION_TYPE = anim_map[key]
+        PIPELINE.cancel()
+        KEYS.request()
+
+
+def start_animation(screen, anim_t, menu_t, positions):
+    """Start the animation after menu selection."""
+    global IS_ANIMATING
+    
+    if not IS_ANIMATING:
+        IS_ANIMATING = True
+        LOOP.start(screen, anim_t, menu_t, positions)
+    draw_menu(menu_t, screen)
+
+
+def toggle_animation(screen, anim_t, menu_t, positions):
+    """Toggle animation on/off."""
+    global IS_ANIMATING
     
-    # Q to quit
-    screen.onkey(screen.bye, "q")
+    if IS_ANIMATING:
+        # Pause the animation (keep text visible by not clearing)
+        IS_ANIMATING = False
+        LOOP.cancel()
+        draw_menu(menu_t, screen)
+        screen.update()
+    else:
+        # Resume/start the animation
+        IS_ANIMATING = True
+        LOOP.start(screen, anim_t, menu_t, positions)
+
+
+def toggle_profiling(anim_t, menu_t):
+    """Switch the frame profiler on or off; print a summary when stopped."""
+    if PROFILER.enabled:
+        PROFILER.stop()
+        summary = PROFILER.summary()
+        print(f"frames: {summary['frames']}  p50 {summary['p50']:.2f} ms  "
+              f"p95 {summary['p95']:.2f} ms  p99 {summary['p99']:.2f} ms  "
+              f"unchanged glyphs {summary['skip_ratio']:.0%}",
+              file=sys.stderr)
+    else:
+        PROFILER.start(anim_t, menu_t)
+
+
+def setup_main_keys(screen, menu_t, anim_t, positions):
+    """Setup the main menu's key dispatch table and switch to it."""
+    def size_key(key):
+        handle_size_key(key, screen, menu_t, anim_t, positions)
+
+    def animation_key(key):
+        handle_animation_key(key.lower(), screen, menu_t, anim_t)
+
+    table = dict.fromkeys("12345", size_key)
+    table.update(dict.fromkeys("abcdeABCDE", animation_key))
+    table.update({
+        # Space to start/toggle
+        "space": lambda _key: start_animation(
+            screen, anim_t, menu_t, positions),
+        # M to pause/resume
+        "m": lambda _key: toggle_animation(
+            screen, anim_t, menu_t, positions),
+        # N to change name
+        "n": lambda _key: change_name(screen, menu_t, anim_t, positions),
+        # S to switch between wrapped and scrolling (marquee) text
+        "s": lambda _key: toggle_marquee(screen, menu_t, anim_t, positions),
+        # P to toggle the frame profiler
+        "p": lambda _key: toggle_profiling(anim_t, menu_t),
+        # Q to quit
+        "q": lambda _key: screen.bye(),
+    })
+    KEYS.studio = (screen, menu_t, anim_t, positions)
+    KEYS.set_mode(screen, "menu", table)
 
 
 def change_name(screen, menu_t, anim_t, positions):
     """Prompt user to enter a new name."""
-    global NAME, IS_ANIMATING
+    global IS_ANIMATING
     
     # Pause animation
     IS_ANIMATING = False
+    LOOP.cancel()
+    PIPELINE.cancel()
     # Immediately clear previous animated text so it doesn't linger
-    anim_t.clear()
-    # Refresh menu while entering input
-    draw_menu(menu_t, screen)
+    anim_t.hide_all()
+    # Hide the menu while the input screen is shown; it is re-rendered
+    # from scratch afterwards
+    menu_t.hide_all()
+    menu_t.invalidate()
     screen.update()
     
-    # Get user input using on-screen keyboard
-    new_name = get_text_input(screen, menu_t)
+    # Get user input using on-screen keyboard; finish_name_change()
+    # continues once the text has been entered
+    get_text_input(screen, input_turtle(),
+                   lambda new_name: finish_name_change(
+                       screen, menu_t, anim_t, positions, new_name))
+
+
+def finish_name_change(screen, menu_t, anim_t, positions, new_name):
+    """Apply a newly entered name (continuation of change_name)."""
+    global NAME, IS_ANIMATING
     
     if new_name and new_name.strip():
         NAME = new_name.strip()
         # Update positions with new name
-        positions.clear()
-        positions.extend(prepare_letters(NAME))
+        relayout(anim_t, positions)
     
-    # Rebind main menu keys
-    setup_main_keys(screen, menu_t, anim_t, positions)
+    # Back to the main menu keys
+    KEYS.set_mode(screen, "menu")
     
     # After changing name with N key, wait for SPACE to start
     IS_ANIMATING = False
     draw_menu(menu_t, screen)
 
 
-def main():
-    """Create screen/turtles, collect name and run animation loop."""
-    global MENU_TURTLE, NAME
+def current_rss():
+    """Resident set size of this process in bytes, or None if unknown.
+
+    Read from /proc where available; elsewhere getrusage() only reports
+    the peak, which is used instead.
+    """
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Watchdog:
+    """Health samples of an unattended session.
+
+    Every `interval_ms` (and whenever the playlist switches entries) it
+    records the process RSS, the number of items on the canvas and the
+    frame-rate drift: the fraction of the target rate the loop fell short
+    of since the previous sample. The last `capacity` samples are kept.
+
+    settle() takes the baseline, normally once the playlist has shown every
+    entry and its caches are warm. From then on an RSS more than
+    WATCHDOG_RSS_GROWTH above the baseline, more canvas items than at the
+    baseline, or a drift above WATCHDOG_DRIFT raises an alarm: it is
+    counted and reported on stderr, and an RSS alarm also empties the frame
+    cycle cache.
+    """
+
+    def __init__(self, canvas, interval_ms=WATCHDOG_INTERVAL_MS,
+                 capacity=WATCHDOG_SAMPLES, rss=current_rss, out=None):
+        self.canvas = canvas
+        self.interval_ms = interval_ms
+        self.samples = deque(maxlen=capacity)
+        self.rss = rss
+        self.out = out
+        self.baseline = None
+        self.alarms = dict.fromkeys(("rss", "items", "drift"), 0)
+        self.timer = None
+        self.last = None        # (clock, frames drawn) at the last sample
+        self._tick = self.tick
+
+    def start(self):
+        """Sample now and then every `interval_ms`."""
+        self.stop()
+        self.tick()
+
+    def stop(self):
+        """Cancel the pending sample."""
+        if self.timer is not None:
+            self.canvas.after_cancel(self.timer)
+            self.timer = None
+
+    def tick(self):
+        """Timer callback: take a sample and arm the next one."""
+        self.sample()
+        self.timer = self.canvas.after(self.interval_ms, self._tick)
+
+    def sample(self):
+        """Record and check one sample; return it."""
+        now, drawn = SCHEDULER.clock(), SCHEDULER.drawn
+        drift = 0.0
+        if self.last is not None and IS_ANIMATING and now > self.last[0]:
+            expected = (now - self.last[0]) * SCHEDULER.rate
+            drift = max(0.0, 1.0 - (drawn - self.last[1]) / expected)
+        self.last = (now, drawn)
+        record = {"time": now, "rss": self.rss(),
+                  "items": len(self.canvas.find_all()),
+                  "drift": round(drift, 4)}
+        self.samples.append(record)
+        self.check(record)
+        return record
+
+    def settle(self):
+        """Take the largest RSS and item count sampled so far as baseline."""
+        rss = [record["rss"] for record in self.samples
+               if record["rss"] is not None]
+        self.baseline = {
+            "rss": max(rss, default=None),
+            "items": max((record["items"] for record in self.samples),
+                         default=0)}
+
+    def check(self, record):
+        """Raise the alarms a sample calls for."""
+        if record["drift"] > WATCHDOG_DRIFT:
+            self.alarm("drift", f"frame rate {record['drift']:.0%} below "
+                                "target")
+        baseline = self.baseline
+        if baseline is None:
+            return
+        if (baseline["rss"] is not None and record["rss"] is not None and
+                record["rss"] > baseline["rss"] + WATCHDOG_RSS_GROWTH):
+            growth = (record["rss"] - baseline["rss"]) / 2**20
+            self.alarm("rss", f"RSS grew {growth:.0f} MiB; frame cycle "
+                              "cache dropped")
+            FRAME_CYCLES.clear()
+        if record["items"] > baseline["items"]:
+            self.alarm("items", f"{record['items']} canvas items, "
+                                f"{baseline['items']} expected")
+
+    def alarm(self, kind, message):
+        """Count an alarm and report it."""
+        self.alarms[kind] += 1
+        print(f"watchdog: {message}", file=self.out or sys.stderr)
+
+    def stats(self):
+        """Return the baseline, the last sample and the alarm counts."""
+        return {"baseline": self.baseline,
+                "last": self.samples[-1] if self.samples else None,
+                "alarms": dict(self.alarms)}
+
+
+class Playlist:
+    """Unattended cycling through texts, sizes and animation types.
+
+    Entries are (text, font size, animation type, seconds) and are shown in
+    turn, forever. A switch sets NAME, FONT_SIZE and ANIMATION_TYPE, lays
+    the text out with relayout() and restarts LOOP, the same path a key
+    press in the studio takes; one Tk timer is pending at a time. After the
+    first full pass the watchdog, if any, takes its baseline.
+    """
+
+    def __init__(self, entries, watchdog=None):
+        if not entries:
+            raise ValueError("empty playlist")
+        self.entries = list(entries)
+        self.watchdog = watchdog
+        self.index = -1
+        self.switches = 0
+        self.studio = None      # (screen, menu_t, anim_t, positions)
+        self.canvas = None
+        self.timer = None
+        self._advance = self.advance
+
+    def start(self, screen, menu_t, anim_t, positions):
+        """Show the first entry and keep switching on a timer."""
+        self.stop()
+        self.studio = (screen, menu_t, anim_t, positions)
+        self.canvas = screen.getcanvas()
+        self.index = -1
+        self.advance()
+        if self.watchdog is not None:
+            self.watchdog.start()
+
+    def stop(self):
+        """Cancel the pending switch and watchdog sample."""
+        if self.timer is not None:
+            self.canvas.after_cancel(self.timer)
+            self.timer = None
+        if self.watchdog is not None:
+            self.watchdog.stop()
+
+    def advance(self):
+        """Timer callback: switch to the next entry."""
+        global NAME, FONT_SIZE, ANIMATION_TYPE, IS_ANIMATING
+        
+        self.index = (self.index + 1) % len(self.entries)
+        watchdog = self.watchdog
+        if (self.index == 0 and self.switches and watchdog is not None and
+                watchdog.baseline is None):
+            watchdog.settle()
+        NAME, FONT_SIZE, ANIMATION_TYPE, seconds = self.entries[self.index]
+        screen, menu_t, anim_t, positions = self.studio
+        PIPELINE.cancel()
+        relayout(anim_t, positions)
+        IS_ANIMATING = True
+        LOOP.start(screen, anim_t, menu_t, positions)
+        self.switches += 1
+        self.timer = self.canvas.after(max(1, round(seconds * 1000)),
+                                       self._advance)
+        if watchdog is not None and watchdog.last is not None:
+            watchdog.sample()
+
+
+def read_playlist(rows, font_size=FONT_SIZE, animation_type=ANIMATION_TYPE,
+                  seconds=PLAYLIST_SECONDS):
+    """Build playlist entries from CSV rows (dicts).
+
+    Rows need a `text`; `size`, `type` and `seconds` default to the
+    arguments when missing or empty, and must be positive like `--size`
+    and `--seconds`. Raises ValueError naming the line of a bad row (the
+    header is line 1).
+    """
+    entries = []
+    for line, row in enumerate(rows, start=2):
+        name = row.get("type") or animation_type
+        try:
+            if name not in ANIMATIONS:
+                raise ValueError(f"unknown animation type: {name!r}")
+            entries.append((row["text"],
+                            positive_int(row.get("size") or font_size),
+                            name,
+                            positive_float(row.get("seconds") or seconds)))
+        except (ValueError, argparse.ArgumentTypeError) as error:
+            raise ValueError(f"playlist line {line}: {error}") from error
+    return entries
+
+
+def start_playlist(screen, entries):
+    """Open the studio on the first entry and cycle the playlist."""
+    global PLAYLIST
+    
+    start_studio(screen, entries[0][0])
+    studio = KEYS.studio
+    # Nobody types at a kiosk; only Q (or Escape) quits
+    KEYS.set_mode(screen, "kiosk", {"q": lambda _key: screen.bye(),
+                                    "Escape": lambda _key: screen.bye()})
+    PLAYLIST = Playlist(entries, Watchdog(screen.getcanvas()))
+    PLAYLIST.start(*studio)
+
+
+class DrawList(list):
+    """Glyph pool stand-in that collects (key, spec) draw commands.
+
+    Frames produced without a canvas (headless rendering and export) are
+    drawn into a DrawList instead of a GlyphPool.
+    """
+
+    def put(self, key, spec, align="center"):
+        """Record one draw command (same signature as GlyphPool.put)."""
+        self.append((key, spec))
+
+
+def frame_draw_list(layout, animation_type, frame, font_size=None):
+    """Return the draw commands of one frame of a layout tuple."""
+    draw_list = DrawList()
+    frame %= 360
+    if frame % FRAME_STEP == 0:
+        cycle = FRAME_CYCLES.get(layout, animation_type, font_size)
+        if cycle is not None:
+            cycle.replay(draw_list, frame)
+            return draw_list
+    get_animation(animation_type)(draw_list, layout, frame, font_size)
+    return draw_list
+
+
+def render_svg(draw_list, width=WINDOW_WIDTH, height=WINDOW_HEIGHT):
+    """Render a frame's draw commands as a single-line SVG document.
+
+    The view box is centered on the origin like the turtle world, so world
+    x maps straight through and world y is negated.
+    """
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" '
+        f'height="{height}" viewBox="{-width / 2:g} {-height / 2:g} '
+        f'{width} {height}">',
+        f'<rect x="{-width / 2:g}" y="{-height / 2:g}" width="{width}" '
+        f'height="{height}" fill="black"/>',
+    ]
+    for _, (x, y, ch, color, font) in draw_list:
+        family, size, style = font
+        style_attrs = ""
+        if "bold" in style:
+            style_attrs += ' font-weight="bold"'
+        if "italic" in style:
+            style_attrs += ' font-style="italic"'
+        # Tk anchors "s" text at the bottom of the line box, SVG at the
+        # baseline: lift by the font descent (~0.28 px per point for Arial)
+        parts.append(
+            f'<text x="{x:.2f}" y="{-y - size * 0.28:.2f}" '
+            f'fill="{color_string(color)}" font-family="{family}" '
+            f'font-size="{size}pt" text-anchor="middle"{style_attrs}>'
+            f'{xml_escape(ch)}</text>')
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+# 5x8 column-major bitmap font for ASCII 32..126 (bit 0 is the top row,
+# bit 7 the descender row), used by the headless rasterizer.
+BITMAP_FONT = bytes.fromhex("""
+    0000000000 00005f0000 0007000700 147f147f14 242a7f2a12 2313086462
+    3649562050 0008070300 001c224100 0041221c00 2a1c7f1c2a 08083e0808
+    0080703000 0808080808 0000606000 2010080402 3e5149453e 00427f4000
+    7249494946 2141494d33 1814127f10 2745454539 3c4a494931 4121110907
+    3649494936 464949291e 0000140000 0040340000 0008142241 1414141414
+    0041221408 0201590906 3e415d594e 7c1211127c 7f49494936 3e41414122
+    7f4141413e 7f49494941 7f09090901 3e41415173 7f0808087f 00417f4100
+    2040413f01 7f08142241 7f40404040 7f021c027f 7f0408107f 3e4141413e
+    7f09090906 3e4151215e 7f09192946 2649494932 03017f0103 3f4040403f
+    1f2040201f 3f4038403f 6314081463 0304780403 6159494d43 007f414141
+    0204081020 004141417f 0402010204 4040404040 0003070800 2054547840
+    7f28444438 3844444428 384444287f 3854545418 00087e0902 18a4a49c78
+    7f08040478 00447d4000 2040403d00 7f10284400 00417f4000 7c04780478
+    7c08040478 3844444438 fc18242418 18242418fc 7c08040408 4854545424
+    04043f4424 3c4040207c 1c2040201c 3c4030403c 4428102844 4c9090907c
+    4464544c44 0008364100 0000770000 0041360800 0201020402
+""")
+UNKNOWN_GLYPH = bytes.fromhex("7f4141417f")  # hollow box
+
+_GLYPH_RUNS = {}
+
+
+def glyph_runs(ch):
+    """Return the (row, first column, width) pixel runs of a bitmap glyph."""
+    runs = _GLYPH_RUNS.get(ch)
+    if runs is None:
+        code = ord(ch) - 32
+        if 0 <= code < len(BITMAP_FONT) // 5:
+            columns = BITMAP_FONT[code * 5:code * 5 + 5]
+        else:
+            columns = UNKNOWN_GLYPH
+        runs = []
+        for row in range(8):
+            col = 0
+            while col < 5:
+                if columns[col] >> row & 1:
+                    start = col
+                    while col < 5 and columns[col] >> row & 1:
+                        col += 1
+                    runs.append((row, start, col - start))
+                else:
+                    col += 1
+        _GLYPH_RUNS[ch] = runs
+    return runs
+
+
+def rasterize(draw_list, width, height, pixels):
+    """Paint draw commands back-to-front into a packed pixel buffer.
+
+    `pixels` maps each command color to its packed bytes (three for RGB,
+    one for a palette index); the background is all zero bytes (black).
+    Glyphs use the bitmap font with one dot per tenth of the font size, so
+    the advance matches the 0.6 * size spacing of prepare_letters().
+    """
+    bpp = len(pixels[(0, 0, 0)])
+    buf = bytearray(width * height * bpp)
+    stride = width * bpp
+    for _, (x, y, ch, color, font) in draw_list:
+        dot = max(1, round(font[1] / 10))
+        left = round(x + width / 2 - 2.5 * dot)
+        top = round(height / 2 - y - 8 * dot)
+        pixel = pixels[color]
+        for row, col, count in glyph_runs(ch):
+            x0 = max(0, left + col * dot)
+            x1 = min(width, left + (col + count) * dot)
+            if x0 >= x1:
+                continue
+            span = pixel * (x1 - x0)
+            for py in range(max(0, top + row * dot),
+                            min(height, top + (row + 1) * dot)):
+                offset = py * stride + x0 * bpp
+                buf[offset:offset + len(span)] = span
+    return buf
+
+
+class _RGBPixels(dict):
+    """Color -> packed RGB bytes mapping that fills itself on demand."""
+
+    def __missing__(self, color):
+        value = self[color] = bytes(color)
+        return value
+
+
+def render_rgb(draw_list, width=WINDOW_WIDTH, height=WINDOW_HEIGHT):
+    """Rasterize a frame into a raw RGB buffer of width * height * 3 bytes."""
+    return rasterize(draw_list, width, height, _RGBPixels())
+
+
+def render_frames(text, font_size=FONT_SIZE, animation_type=ANIMATION_TYPE,
+                  *, frames=None, fmt="svg", width=WINDOW_WIDTH,
+                  height=WINDOW_HEIGHT):
+    """Lazily yield rendered animation frames without a display.
+
+    `frames` is an iterable of frame numbers (default: one full cycle) and
+    `fmt` is "svg" (yields str documents) or "rgb" (yields raw RGB
+    bytearrays). Frames are produced one at a time, so arbitrarily long
+    ranges can be streamed in constant memory.
+    """
+    renderers = {"svg": render_svg, "rgb": render_rgb}
+    if fmt not in renderers:
+        raise ValueError(f"unknown frame format: {fmt!r}")
+    render = renderers[fmt]
+    layout = tuple(prepare_letters(text, font_size))
+    if frames is None:
+        frames = range(0, 360, FRAME_STEP)
+    for frame in frames:
+        yield render(frame_draw_list(layout, animation_type, frame,
+                                     font_size), width, height)
+
+
+def write_svg_frames(frames, output):
+    """Write SVG frames to a printf-style pattern or one document per line.
+
+    `output` is either a path pattern such as "frame%04d.svg" (one file per
+    frame) or a binary stream that receives newline-separated documents.
+    """
+    if isinstance(output, str):
+        for number, svg in enumerate(frames):
+            with open(output % number, "w", encoding="utf-8") as handle:
+                handle.write(svg)
+        return
+    for svg in frames:
+        output.write(svg.encode("utf-8") + b"\n")
+
+
+def write_ppm_stream(frames, out, width, height):
+    """Write RGB frames as a concatenated binary PPM (P6) stream."""
+    header = f"P6\n{width} {height}\n255\n".encode("ascii")
+    for rgb in frames:
+        out.write(header)
+        out.write(rgb)
+
+
+def gif_lzw(indices, min_code_size):
+    """Return GIF LZW-compressed data for a sequence of palette indices."""
+    clear = 1 << min_code_size
+    end = clear + 1
+    out = bytearray()
+    bits = 0
+    nbits = 0
+    code_size = min_code_size + 1
+    next_code = end + 1
+    table = {}
+
+    def emit(code):
+        nonlocal bits, nbits
+        bits |= code << nbits
+        nbits += code_size
+        while nbits >= 8:
+            out.append(bits & 0xFF)
+            bits >>= 8
+            nbits -= 8
+
+    emit(clear)
+    prefix = indices[0]
+    for index in indices[1:]:
+        key = prefix << 8 | index
+        code = table.get(key)
+        if code is not None:
+            prefix = code
+            continue
+        emit(prefix)
+        if next_code < 4096:
+            table[key] = next_code
+            if next_code == 1 << code_size:
+                code_size += 1
+            next_code += 1
+        else:
+            emit(clear)
+            table.clear()
+            code_size = min_code_size + 1
+            next_code = end + 1
+        prefix = index
+    emit(prefix)
+    emit(end)
+    if nbits:
+        out.append(bits & 0xFF)
+    return out
+
+
+def gif_palette(draw_list):
+    """Return (palette, color -> index byte) for a frame, at most 256 colors.
+
+    Frames with more distinct colors are quantized by dropping low bits
+    until they fit.
+    """
+    colors = {(0, 0, 0)}
+    colors.update(spec[3] for _, spec in draw_list)
+    shift = 0
+    while True:
+        quantized = {color: tuple(c >> shift << shift for c in color)
+                     for color in colors}
+        palette = sorted(set(quantized.values()),
+                         key=lambda c: c != (0, 0, 0))
+        if len(palette) <= 256:
+            break
+        shift += 1
+    index = {color: i for i, color in enumerate(palette)}
+    return palette, {color: bytes((index[q],))
+                     for color, q in quantized.items()}
+
+
+GIF_TRAILER = b"\x3b"
+
+
+def gif_header(width, height):
+    """Return the header of a looping animated GIF (before any frame)."""
+    return (b"GIF89a" + width.to_bytes(2, "little") +
+            height.to_bytes(2, "little") + b"\x00\x00\x00" +
+            # Loop forever (NETSCAPE2.0 application extension)
+            b"\x21\xff\x0bNETSCAPE2.0\x03\x01\x00\x00\x00")
+
+
+def gif_frame(draw_list, width, height, delay_ms=ANIMATION_DELAY_MS):
+    """Encode one frame (given as a draw list) as a GIF image block."""
+    delay = max(1, round(delay_ms / 10))
+    palette, pixels = gif_palette(draw_list)
+    table_bits = max(1, (len(palette) - 1).bit_length())
+    color_table = b"".join(bytes(c) for c in palette)
+    color_table += b"\x00" * (3 * (1 << table_bits) - len(color_table))
+    min_code_size = max(2, table_bits)
+    data = gif_lzw(rasterize(draw_list, width, height, pixels),
+                   min_code_size)
+    block = bytearray(b"\x21\xf9\x04\x04" + delay.to_bytes(2, "little") +
+                      b"\x00\x00")
+    block += (b"\x2c\x00\x00\x00\x00" + width.to_bytes(2, "little") +
+              height.to_bytes(2, "little") +
+              bytes((0x80 | (table_bits - 1),)) + color_table)
+    block.append(min_code_size)
+    for start in range(0, len(data), 255):
+        chunk = data[start:start + 255]
+        block += bytes((len(chunk),)) + chunk
+    block.append(0)
+    return bytes(block)
+
+
+def write_gif(draw_lists, out, width, height, delay_ms=ANIMATION_DELAY_MS):
+    """Stream frames (given as draw lists) into a looping animated GIF."""
+    out.write(gif_header(width, height))
+    for draw_list in draw_lists:
+        out.write(gif_frame(draw_list, width, height, delay_ms))
+    out.write(GIF_TRAILER)
+
+
+def export_frames(args, out=None):
+    """Render frames headlessly as requested on the command line."""
+    layout = tuple(prepare_letters(args.text, args.size))
+    frame_numbers = range(args.start, args.start + args.frames * FRAME_STEP,
+                          FRAME_STEP)
+    draw_lists = (frame_draw_list(layout, args.type, frame, args.size)
+                  for frame in frame_numbers)
+    if args.export == "svg" and "%" in args.output:
+        write_svg_frames((render_svg(d, args.width, args.height)
+                          for d in draw_lists), args.output)
+        return
+    if out is None:
+        if args.output == "-":
+            out = sys.stdout.buffer
+        else:
+            with open(args.output, "wb") as handle:
+                export_frames(args, handle)
+            return
+    if args.export == "svg":
+        write_svg_frames((render_svg(d, args.width, args.height)
+                          for d in draw_lists), out)
+    elif args.export == "ppm":
+        write_ppm_stream((render_rgb(d, args.width, args.height)
+                          for d in draw_lists), out, args.width, args.height)
+    else:
+        write_gif(draw_lists, out, args.width, args.height)
+    out.flush()
+
+
+class StartupTimer:
+    """Wall-clock phases from main() to the first frame on screen.
+
+    CPU time spent before main() (interpreter start-up and imports) is
+    taken from the process clock, as nothing in this module runs earlier.
+    """
+
+    def __init__(self, clock=time.perf_counter, out=None):
+        self.clock = clock
+        self.out = out
+        self.before_main = time.process_time()
+        self.started = self.last = clock()
+        self.phases = []
+
+    def mark(self, phase):
+        """End `phase` now; it lasted since the previous mark."""
+        now = self.clock()
+        self.phases.append((phase, (now - self.last) * 1000))
+        self.last = now
+
+    def total_ms(self):
+        """Milliseconds from main() to the last mark."""
+        return (self.last - self.started) * 1000
+
+    def report(self):
+        """Write the time to the first frame and its phases."""
+        phases = ", ".join(f"{name} {ms:.1f}" for name, ms in self.phases)
+        print(f"first frame after {self.total_ms():.1f} ms ({phases}); "
+              f"{self.before_main * 1000:.0f} ms CPU before main()",
+              file=self.out or sys.stderr)
+
+
+def positive_int(text):
+    """argparse type: an integer greater than zero."""
+    value = int(text)
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"must be positive: {text}")
+    return value
+
+
+def positive_float(text):
+    """argparse type: a number greater than zero."""
+    value = float(text)
+    if not value > 0 or math.isinf(value):
+        raise argparse.ArgumentTypeError(f"must be positive: {text}")
+    return value
+
+
+def parse_args(argv=None):
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Text Animator Studio")
+    parser.add_argument("--export", choices=("svg", "ppm", "gif"),
+                        help="render frames headlessly instead of opening "
+                             "a window")
+    parser.add_argument("--text",
+                        help="text to animate; the window skips the input "
+                             "prompt and starts animating right away")
+    parser.add_argument("--size", type=positive_int, default=FONT_SIZE,
+                        help="font size in points")
+    parser.add_argument("--type", choices=sorted(ANIMATIONS),
+                        default=ANIMATION_TYPE, help="animation type")
+    parser.add_argument("--fps", type=positive_float,
+                        help=f"target frame rate (default {TARGET_FPS:g})")
+    parser.add_argument("--fullscreen", action="store_true",
+                        help="cover the whole display")
+    parser.add_argument("--start", type=int, default=0,
+                        help="first frame number to export")
+    parser.add_argument("--frames", type=int, default=360 // FRAME_STEP,
+                        help="number of frames to export (default: one "
+                             "full cycle)")
+    parser.add_argument("--output", "-o", default="-",
+                        help="output file, '-' for stdout, or a pattern "
+                             "like frame%%04d.svg for SVG sequences")
+    parser.add_argument("--width", type=int, default=WINDOW_WIDTH,
+                        help="exported frame width in pixels")
+    parser.add_argument("--height", type=int, default=WINDOW_HEIGHT,
+                        help="exported frame height in pixels")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="profile every frame from the start and write "
+                             "the records to FILE as JSON lines on exit "
+                             "(P toggles profiling at runtime)")
+    parser.add_argument("--playlist", metavar="CSV",
+                        help="kiosk mode: cycle through the rows of CSV "
+                             "(columns text, size, type, seconds) without "
+                             "user input")
+    parser.add_argument("--seconds", type=positive_float,
+                        default=PLAYLIST_SECONDS,
+                        help="time each playlist entry is shown unless its "
+                             "row says otherwise")
+    parser.add_argument("--record", metavar="FILE",
+                        help="log key events and state changes to FILE on "
+                             "exit, for replay with replay.py")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Create screen/turtles, collect name and run animation loop.
+
+    With --export the frames are rendered headlessly instead and no window
+    (or turtle/Tk import) is involved. With --text the input prompt is
+    skipped and the time to the first frame is reported on stderr. With
+    --playlist the studio cycles through the playlist unattended.
+    """
+    global FONT_SIZE, ANIMATION_TYPE
     
-    screen = init()
+    args = parse_args(argv)
+    if args.export:
+        if args.text is None:
+            args.text = "Your Name Here"
+        export_frames(args)
+        return
+    entries = None
+    if args.playlist:
+        with open(args.playlist, newline="", encoding="utf-8") as handle:
+            entries = read_playlist(csv.DictReader(handle), args.size,
+                                    args.type, args.seconds)
+    
+    startup = StartupTimer() if args.text is not None else None
+    FONT_SIZE = args.size
+    ANIMATION_TYPE = args.type
+    SCHEDULER.fps = args.fps
+    PROFILER.output = args.profile
+    screen = init(fullscreen=args.fullscreen)
+    # Every screen draws with named Tk fonts and real metrics from here on
+    use_tk_metrics(screen)
+    if args.record:
+        KEYS.recorder = SessionRecorder()
+        KEYS.recorder.start(args.text)
+    
+    if entries:
+        start_playlist(screen, entries)
+    elif startup is not None:
+        startup.mark("window")
+        start_studio(screen, args.text, startup)
+        startup.report()
+    else:
+        # Get user's name using on-screen input; start_studio() continues
+        # once the text has been entered
+        get_text_input(screen, input_turtle(),
+                       lambda text: start_studio(screen, text))
+    if KEYS.recorder is not None:
+        KEYS.recorder.transitions()
     
-    # Create turtle for input screen
-    input_t = myName.Turtle()
-    input_t.hideturtle()
-    input_t.speed(0)
-    input_t.penup()
+    screen.mainloop()
+    if PROFILER.output:
+        with open(PROFILER.output, "w", encoding="utf-8") as out:
+            PROFILER.write_jsonl(out)
+    if args.record:
+        with open(args.record, "w", encoding="utf-8") as out:
+            KEYS.recorder.write(out)
+    if PLAYLIST is not None:
+        alarms = PLAYLIST.watchdog.stats()["alarms"]
+        print(f"playlist: {PLAYLIST.switches} switches, watchdog alarms "
+              + ", ".join(f"{kind} {count}" for kind, count in alarms.items()),
+              file=sys.stderr)
+
+
+def input_turtle():
+    """Return the turtle that draws the input prompt, created on first use."""
+    global INPUT_TURTLE
+    
+    if INPUT_TURTLE is None:
+        input_t = myName.Turtle()
+        input_t.hideturtle()
+        input_t.speed(0)
+        input_t.penup()
+        INPUT_TURTLE = input_t
+    return INPUT_TURTLE
+
+
+def start_studio(screen, text, startup=None):
+    """Set up the menu and animation for `text` (continuation of main).
+
+    `startup`, if given, is a StartupTimer marked after the layout and
+    after the first frame has been flushed to the screen.
+    """
+    global MENU_LAYER, NAME, IS_ANIMATING
     
-    # Get user's name using on-screen input
-    NAME = get_text_input(screen, input_t)
+    NAME = text
     
-    # Create separate turtles for menu and animation
-    menu_t = myName.Turtle()
-    menu_t.hideturtle()
-    menu_t.speed(0)
-    menu_t.penup()
-    MENU_TURTLE = menu_t
+    # Create the retained menu layer
+    menu_t = MenuLayer(screen)
+    MENU_LAYER = menu_t
     
-    anim_t = myName.Turtle()
-    anim_t.hideturtle()
-    anim_t.speed(0)
-    anim_t.penup()
+    # Animated glyphs live in a pool of persistent canvas items
+    anim_t = make_glyph_pool(screen)
 
     positions = list(prepare_letters(NAME))
+    anim_t.allocate(positions)
+    if startup is not None:
+        startup.mark("layout")
 
     # Setup keyboard handlers
     setup_main_keys(screen, menu_t, anim_t, positions)
+    if PROFILER.output:
+        PROFILER.start(anim_t, menu_t)
     
     # Auto-start animation after initial text entry
-    global IS_ANIMATING
     IS_ANIMATING = True
-    animate(screen, anim_t, menu_t, positions, frame=0)
-    
-    screen.mainloop()
+    LOOP.start(screen, anim_t, menu_t, positions)
+    if startup is not None:
+        startup.mark("first frame")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,408 @@
+"""Parallel batch export of Text Animator Studio renders.
+
+Jobs come from a CSV file with a `text` column and optional `size`, `type`,
+`start` and `frames` columns. `size` and `type` may list several values
+separated by spaces; when a column is missing or empty, --sizes and --types
+apply, so a plain list of names expands to names x sizes x types. Every job
+renders to one output file, named after its position in the batch.
+
+Work is spread over a process pool by job and, for long jobs, by frame
+range: each range is rendered into a part file and the parts are joined in
+order, so the output is byte-identical whatever the number of workers.
+Finished jobs are appended (in batch order) to a JSON lines manifest in the
+output directory; running the same batch again skips them, as well as any
+part of an interrupted job that was already complete.
+
+    python batch.py names.csv -o renders --format gif --sizes 32 48 64 \\
+        --types wave bounce spiral rainbow_pulse 3d_rotation
+"""
+# pylint: disable=too-many-instance-attributes,too-many-arguments
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import time
+from collections import deque
+from contextlib import closing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+import MyName
+
+FORMATS = ("gif", "ppm", "svg")
+MANIFEST = "manifest.jsonl"
+CHUNK_FRAMES = 45  # frames per task; longer jobs are split into ranges
+IN_FLIGHT = 2  # submitted tasks per worker, bounds the parent's memory
+TASKS_PER_CHILD = 64  # tasks before a worker is replaced (Python 3.11+)
+PROGRESS_INTERVAL = 1.0  # seconds between progress lines
+
+
+class Job:
+    """One output file: a text rendered at one size with one animation."""
+
+    def __init__(self, number, text, size, animation_type, *, start=0,
+                 frames=360 // MyName.FRAME_STEP, fmt="gif",
+                 width=MyName.WINDOW_WIDTH, height=MyName.WINDOW_HEIGHT):
+        self.number = number
+        self.text = text
+        self.size = size
+        self.type = animation_type
+        self.start = start
+        self.frames = frames
+        self.fmt = fmt
+        self.width = width
+        self.height = height
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", text).strip("_")[:40] or "text"
+        self.filename = (f"{number:06d}-{slug}-{animation_type}-{size}."
+                         f"{fmt}")
+
+    @property
+    def key(self):
+        """Fingerprint of everything that determines the output bytes."""
+        spec = [self.filename, self.text, self.size, self.type, self.start,
+                self.frames, self.width, self.height]
+        return hashlib.sha1(json.dumps(spec).encode("utf-8")).hexdigest()
+
+    def frame_numbers(self, begin=0, end=None):
+        """Frame numbers of the job's frames `begin` to `end` (exclusive)."""
+        end = self.frames if end is None else end
+        step = MyName.FRAME_STEP
+        return range(self.start + begin * step, self.start + end * step,
+                     step)
+
+    def chunks(self, chunk_frames=CHUNK_FRAMES):
+        """Split the job into (begin, end) frame ranges."""
+        return [(begin, min(begin + chunk_frames, self.frames))
+                for begin in range(0, self.frames, chunk_frames)] or [(0, 0)]
+
+
+def read_jobs(rows, sizes=(MyName.FONT_SIZE,),
+              types=(MyName.ANIMATION_TYPE,), **options):
+    """Expand CSV rows (dicts) into numbered jobs, in row order.
+
+    `options` (start, frames, fmt, width, height) are the defaults for
+    every job; `start` and `frames` can be overridden per row.
+    """
+    jobs = []
+    for row in rows:
+        row_sizes = [int(s) for s in (row.get("size") or "").split()] or sizes
+        row_types = (row.get("type") or "").split() or types
+        for name in row_types:
+            if name not in MyName.ANIMATIONS:
+                raise ValueError(f"unknown animation type: {name!r}")
+        overrides = {field: int(row[field]) for field in ("start", "frames")
+                     if row.get(field)}
+        for animation_type in row_types:
+            for size in row_sizes:
+                jobs.append(Job(len(jobs), row["text"], size,
+                                animation_type, **dict(options, **overrides)))
+    return jobs
+
+
+def write_frames(job, draw_lists, out, head=True, tail=True):
+    """Encode draw lists in the job's format; `head`/`tail` frame the file.
+
+    Only GIF has a header and trailer; SVG and PPM streams are plain
+    concatenations of frames, so their parts need no framing.
+    """
+    if job.fmt == "svg":
+        MyName.write_svg_frames((MyName.render_svg(d, job.width, job.height)
+                                 for d in draw_lists), out)
+    elif job.fmt == "ppm":
+        MyName.write_ppm_stream((MyName.render_rgb(d, job.width, job.height)
+                                 for d in draw_lists), out, job.width,
+                                job.height)
+    else:
+        if head:
+            out.write(MyName.gif_header(job.width, job.height))
+        for draw_list in draw_lists:
+            out.write(MyName.gif_frame(draw_list, job.width, job.height))
+        if tail:
+            out.write(MyName.GIF_TRAILER)
+
+
+def render_chunk(job, begin, end, path):
+    """Render frames `begin` to `end` of `job` into `path`; return the count.
+
+    Runs in a worker process. Frames are encoded as they are drawn, and the
+    file only gets its final name once it is complete.
+    """
+    layout = tuple(MyName.prepare_letters(job.text, job.size))
+    draw_lists = (MyName.frame_draw_list(layout, job.type, frame, job.size)
+                  for frame in job.frame_numbers(begin, end))
+    with open(path + ".tmp", "wb") as out:
+        write_frames(job, draw_lists, out, head=begin == 0,
+                     tail=end == job.frames)
+    os.replace(path + ".tmp", path)
+    return end - begin
+
+
+def part_paths(job, out_dir, chunk_frames=CHUNK_FRAMES):
+    """Return [(begin, end, path)] for the chunks of `job`.
+
+    A job of a single chunk is rendered straight into its output file. Part
+    names include the job key, so parts left by an interrupted run are only
+    reused for the very same job.
+    """
+    output = os.path.join(out_dir, job.filename)
+    chunks = job.chunks(chunk_frames)
+    if len(chunks) == 1:
+        return [(0, job.frames, output)]
+    return [(begin, end, f"{output}.{job.key[:12]}.part{begin:06d}")
+            for begin, end in chunks]
+
+
+def join_parts(paths, output):
+    """Concatenate part files into `output` and remove them."""
+    with open(output + ".tmp", "wb") as out:
+        for path in paths:
+            with open(path, "rb") as part:
+                shutil.copyfileobj(part, out)
+    os.replace(output + ".tmp", output)
+    for path in paths:
+        os.remove(path)
+
+
+def load_manifest(path):
+    """Return {job key: record} for the jobs a manifest lists as finished.
+
+    A line cut short by an interrupted run is ignored.
+    """
+    done = {}
+    try:
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                done[record["key"]] = record
+    except FileNotFoundError:
+        pass
+    return done
+
+
+def open_manifest(path):
+    """Open the manifest for appending, ending a line cut short first."""
+    manifest = open(path, "a+b")  # pylint: disable=consider-using-with
+    if manifest.tell():
+        manifest.seek(-1, os.SEEK_END)
+        if manifest.read(1) != b"\n":
+            manifest.write(b"\n")
+    return manifest
+
+
+def is_finished(job, out_dir, done):
+    """Whether the manifest lists `job` and its output is still intact."""
+    record = done.get(job.key)
+    if record is None:
+        return False
+    try:
+        return os.path.getsize(os.path.join(out_dir, job.filename)) == \
+            record["bytes"]
+    except OSError:
+        return False
+
+
+def run_tasks(tasks, workers, tasks_per_child=TASKS_PER_CHILD):
+    """Render (job, begin, end, path) tasks; yield (task, frames) as done.
+
+    With `workers` 0 the tasks run in this process. Otherwise at most
+    IN_FLIGHT tasks per worker are submitted at a time, and workers are
+    replaced after `tasks_per_child` tasks so caches cannot grow without
+    bound over a long batch.
+    """
+    if workers == 0:
+        for task in tasks:
+            yield task, render_chunk(*task)
+        return
+    options = {}
+    if sys.version_info >= (3, 11):
+        options["max_tasks_per_child"] = tasks_per_child
+    tasks = iter(tasks)
+    with ProcessPoolExecutor(workers, **options) as pool:
+        running = {pool.submit(render_chunk, *task): task
+                   for task in islice(tasks, workers * IN_FLIGHT)}
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                yield running.pop(future), future.result()
+            for task in islice(tasks, len(finished)):
+                running[pool.submit(render_chunk, *task)] = task
+
+
+class Progress:
+    """Throttled progress lines: jobs and frames done, rate and ETA."""
+
+    def __init__(self, jobs, frames, out=sys.stderr,
+                 interval=PROGRESS_INTERVAL, clock=time.perf_counter):
+        self.total_jobs = jobs
+        self.total_frames = frames
+        self.jobs = 0
+        self.frames = 0
+        self.rendered = 0  # frames rendered by this run (not resumed)
+        self.out = out
+        self.interval = interval
+        self.clock = clock
+        self.started = self.last = clock()
+
+    def advance(self, frames=0, jobs=0, rendered=True):
+        """Count finished frames and jobs; report if the interval passed."""
+        self.frames += frames
+        self.jobs += jobs
+        if rendered:
+            self.rendered += frames
+        if self.clock() - self.last >= self.interval:
+            self.report()
+
+    def rate(self):
+        """Frames rendered per second by this run."""
+        elapsed = self.clock() - self.started
+        return self.rendered / elapsed if elapsed > 0 else 0.0
+
+    def report(self):
+        """Write one progress line."""
+        self.last = self.clock()
+        if self.out is None:
+            return
+        rate = self.rate()
+        left = self.total_frames - self.frames
+        eta = f"{left / rate:.0f}s" if rate else "-"
+        self.out.write(f"{self.jobs}/{self.total_jobs} jobs, "
+                       f"{self.frames}/{self.total_frames} frames, "
+                       f"{rate:.1f} frames/s, ETA {eta}\n")
+        self.out.flush()
+
+
+def plan_tasks(jobs, out_dir, done, chunk_frames, progress):
+    """Return (pending, tasks, outstanding) for the jobs left to render.
+
+    `pending` lists (job, parts) in batch order, `tasks` the chunks still
+    to render and `outstanding` counts them per job number. Finished jobs
+    and finished parts are counted as progress straight away.
+    """
+    pending = []
+    tasks = []
+    outstanding = {}
+    for job in jobs:
+        if is_finished(job, out_dir, done):
+            progress.advance(job.frames, 1, rendered=False)
+            continue
+        parts = part_paths(job, out_dir, chunk_frames)
+        pending.append((job, parts))
+        outstanding[job.number] = 0
+        for begin, end, path in parts:
+            if len(parts) > 1 and os.path.exists(path):
+                progress.advance(end - begin, rendered=False)
+            else:
+                tasks.append((job, begin, end, path))
+                outstanding[job.number] += 1
+    return pending, tasks, outstanding
+
+
+def finish_job(job, parts, out_dir, manifest):
+    """Join the parts of a rendered job and record it in the manifest."""
+    output = os.path.join(out_dir, job.filename)
+    if len(parts) > 1:
+        join_parts([path for _, _, path in parts], output)
+    record = {"key": job.key, "output": job.filename, "text": job.text,
+              "size": job.size, "type": job.type, "frames": job.frames,
+              "bytes": os.path.getsize(output)}
+    manifest.write(json.dumps(record).encode("utf-8") + b"\n")
+    manifest.flush()
+
+
+def run_batch(jobs, out_dir, workers=0, chunk_frames=CHUNK_FRAMES,
+              progress=None):
+    """Render every job not yet in the manifest; return the Progress.
+
+    Tasks are submitted in batch order and jobs are finished (parts
+    joined, manifest record appended) in the same order, whichever worker
+    completes first.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, MANIFEST)
+    if progress is None:
+        progress = Progress(len(jobs), sum(job.frames for job in jobs))
+    pending, tasks, outstanding = plan_tasks(
+        jobs, out_dir, load_manifest(manifest_path), chunk_frames, progress)
+    pending = deque(pending)
+    with open_manifest(manifest_path) as manifest, \
+            closing(run_tasks(tasks, workers)) as results:
+        while pending:
+            job, parts = pending[0]
+            if outstanding[job.number]:
+                (done, _, _, _), frames = next(results)
+                outstanding[done.number] -= 1
+                progress.advance(frames)
+                continue
+            finish_job(job, parts, out_dir, manifest)
+            progress.advance(jobs=1)
+            pending.popleft()
+    progress.report()
+    return progress
+
+
+def worker_count(text):
+    """argparse type: a worker count, zero or more."""
+    value = int(text)
+    if value < 0:
+        raise argparse.ArgumentTypeError(f"must not be negative: {text}")
+    return value
+
+
+def parse_args(argv=None):
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("jobs", help="CSV file with a 'text' column")
+    parser.add_argument("--output", "-o", default="renders",
+                        help="output directory (holds the manifest)")
+    parser.add_argument("--format", choices=FORMATS, default="gif",
+                        help="output format of every job")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[MyName.FONT_SIZE],
+                        help="font sizes for rows without a 'size'")
+    parser.add_argument("--types", nargs="+",
+                        choices=sorted(MyName.ANIMATIONS),
+                        default=[MyName.ANIMATION_TYPE],
+                        help="animation types for rows without a 'type'")
+    parser.add_argument("--start", type=int, default=0,
+                        help="first frame number of every job")
+    parser.add_argument("--frames", type=MyName.positive_int,
+                        default=360 // MyName.FRAME_STEP,
+                        help="frames per job (default: one full cycle)")
+    parser.add_argument("--width", type=int, default=MyName.WINDOW_WIDTH,
+                        help="frame width in pixels")
+    parser.add_argument("--height", type=int, default=MyName.WINDOW_HEIGHT,
+                        help="frame height in pixels")
+    parser.add_argument("--workers", "-j", type=worker_count,
+                        default=os.cpu_count() or 1,
+                        help="worker processes (0 renders in-process)")
+    parser.add_argument("--chunk-frames", type=MyName.positive_int,
+                        default=CHUNK_FRAMES,
+                        help="frames per task; longer jobs are split")
+    parser.add_argument("--quiet", "-q", action="store_true",
+                        help="do not report progress")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run the batch described on the command line."""
+    args = parse_args(argv)
+    with open(args.jobs, newline="", encoding="utf-8") as handle:
+        jobs = read_jobs(csv.DictReader(handle), args.sizes, args.types,
+                         start=args.start, frames=args.frames,
+                         fmt=args.format, width=args.width,
+                         height=args.height)
+    progress = Progress(len(jobs), sum(job.frames for job in jobs),
+                        out=None if args.quiet else sys.stderr)
+    run_batch(jobs, args.output, args.workers, args.chunk_frames, progress)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
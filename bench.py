@@ -0,0 +1,370 @@
+"""Headless benchmarks for the Text Animator Studio hot paths.
+
+The `turtle` module is swapped for a call-recording stub, so the real
+drawing code runs without a display while every canvas, screen and turtle
+call it makes is counted. Each case reports microseconds and draw calls per
+frame; results are compared to a stored baseline and the run fails when a
+case regresses by more than the threshold.
+
+    python bench.py                  # full grid, compared to the baseline
+    python bench.py --quick          # small grid for CI
+    python bench.py --save-baseline  # record the current numbers
+"""
+import argparse
+import json
+import sys
+import time
+import types
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+import MyName
+
+TEXT_LENGTHS = (1, 10, 100, 500)
+FONT_SIZES = (32, 64, 96)
+LAYER_COUNTS = (4, 10, 20)  # DEPTH_LAYERS values for the 3D cases
+QUICK_GRID = {"lengths": (1, 10, 100), "sizes": (64,), "layers": (10,)}
+FRAMES = tuple(range(0, 360, 30))  # frames drawn per repetition
+MIN_TIME = 0.05  # seconds each case is repeated for
+BASELINE_FILE = "bench_baseline.json"
+THRESHOLD = 0.25  # allowed relative slowdown before a case fails
+NOISE_US = 2.0  # slowdowns smaller than this are timer noise
+
+
+class RecordingCanvas:
+    """Tk canvas stand-in that counts the calls made on it."""
+
+    def __init__(self, calls):
+        self.calls = calls
+        self.next_id = 0
+
+    def _create(self, name):
+        self.calls[name] += 1
+        self.next_id += 1
+        return self.next_id
+
+    def create_text(self, *_coords, **_options):
+        """Count a created text item."""
+        return self._create("create_text")
+
+    def create_image(self, *_coords, **_options):
+        """Count a created image item."""
+        return self._create("create_image")
+
+    def create_line(self, *_coords, **_options):
+        """Count a created line item."""
+        return self._create("create_line")
+
+    def create_rectangle(self, *_coords, **_options):
+        """Count a created rectangle item."""
+        return self._create("create_rectangle")
+
+    def coords(self, _item, *_coords):
+        """Count a moved item."""
+        self.calls["coords"] += 1
+
+    def itemconfigure(self, _item, **_options):
+        """Count a reconfigured item."""
+        self.calls["itemconfigure"] += 1
+
+    def delete(self, *items):
+        """Count deleted items."""
+        self.calls["delete"] += len(items)
+
+    def tag_lower(self, _tag):
+        """Count a restacking."""
+        self.calls["tag_lower"] += 1
+
+    def after(self, _ms, _func):
+        """Return a timer id; the benchmark drives the ticks itself."""
+        self.next_id += 1
+        return self.next_id
+
+    def after_cancel(self, _after_id):
+        """Accept a cancelled timer id."""
+
+    def bind(self, sequence, _func):
+        """Count an event binding."""
+        self.calls["bind " + sequence] += 1
+
+    def bbox(self, _item):
+        """Count a bounding box query (the box itself is empty)."""
+        self.calls["bbox"] += 1
+        return 0, 0, 0, 0
+
+
+class RecordingScreen:
+    """TurtleScreen stand-in; timers are collected instead of run."""
+
+    def __init__(self, calls):
+        self.calls = calls
+        self.cv = RecordingCanvas(calls)
+        self.xscale = self.yscale = 1.0
+        self.timers = []
+
+    def getcanvas(self):
+        """Return the recording canvas."""
+        return self.cv
+
+    def update(self):
+        """Count a flush."""
+        self.calls["update"] += 1
+
+    def ontimer(self, fun, t=0):
+        """Collect a timer callback."""
+        self.timers.append((fun, t))
+
+    def __getattr__(self, name):
+        return recorder(self.calls, "screen." + name)
+
+
+class RecordingTurtle:  # pylint: disable=too-few-public-methods
+    """Turtle stand-in; every method call is counted and ignored."""
+
+    def __init__(self, calls):
+        self.calls = calls
+
+    def __getattr__(self, name):
+        return recorder(self.calls, "turtle." + name)
+
+
+def recorder(calls, name):
+    """Return a no-op function that counts its calls under `name`."""
+    def record(*_args, **_kwargs):
+        calls[name] += 1
+    return record
+
+
+def turtle_stub(calls):
+    """Build a module object that replaces `turtle` for MyName."""
+    module = types.ModuleType("turtle")
+    screen = RecordingScreen(calls)
+    module.Screen = lambda: screen
+    module.Turtle = lambda *_args, **_kwargs: RecordingTurtle(calls)
+    module.setworldcoordinates = recorder(calls, "setworldcoordinates")
+    return module
+
+
+SAVED_STATE = ("myName", "NAME", "FONT_SIZE", "DEPTH_LAYERS",
+               "ANIMATION_TYPE", "IS_ANIMATING", "SCHEDULER", "GOVERNOR",
+               "FRAME_CYCLES", "PROFILER", "KEYS", "LOOP", "PIPELINE",
+               "MARQUEE", "MENU_LAYER", "INPUT_TURTLE")
+
+
+@contextmanager
+def recording_turtle():
+    """Run MyName against the stub; yield (screen, calls).
+
+    The real turtle module (if it was imported) and MyName's global state
+    are restored afterwards.
+    """
+    saved = {name: getattr(MyName, name) for name in SAVED_STATE}
+    real_turtle = sys.modules.get("turtle")
+    calls = Counter()
+    sys.modules["turtle"] = turtle_stub(calls)
+    MyName.myName = None
+    MyName.FRAME_CYCLES = MyName.FrameCycleCache()
+    MyName.PROFILER = MyName.FrameProfiler()
+    MyName.KEYS = MyName.KeyRouter()
+    MyName.LOOP = MyName.AnimationLoop()
+    # Cases time the Tk thread doing all the work, as in the baseline
+    MyName.PIPELINE = MyName.FramePipeline(depth=0)
+    # The governor would change the level of detail between repetitions
+    MyName.GOVERNOR = MyName.QualityGovernor()
+    MyName.GOVERNOR.enabled = False
+    try:
+        yield MyName.init(), calls
+    finally:
+        if real_turtle is None:
+            del sys.modules["turtle"]
+        else:
+            sys.modules["turtle"] = real_turtle
+        for name, value in saved.items():
+            setattr(MyName, name, value)
+
+
+def measure(step, calls, frames=FRAMES, min_time=MIN_TIME):
+    """Time `step(frame)` over `frames`; return (us, calls) per frame.
+
+    One untimed pass warms caches up; draw calls are counted during the
+    first timed pass, so they do not depend on how often it is repeated.
+    """
+    for frame in frames:
+        step(frame)
+    calls.clear()
+    started = time.perf_counter()
+    for frame in frames:
+        step(frame)
+    per_frame = sum(calls.values()) / len(frames)
+    reps = 1
+    while time.perf_counter() - started < min_time:
+        for frame in frames:
+            step(frame)
+        reps += 1
+    elapsed = time.perf_counter() - started
+    return elapsed * 1e6 / (reps * len(frames)), per_frame
+
+
+def sample_text(length):
+    """Return a text of `length` characters with a space every 6."""
+    words = "Hello brave new world of text animation "
+    return (words * (length // len(words) + 1))[:length]
+
+
+def glyph_pool(screen, positions):
+    """Return a GlyphPool allocated for `positions`."""
+    pool = MyName.GlyphPool(screen)
+    pool.allocate(positions)
+    return pool
+
+
+def animate_step(screen, pool, menu, positions):
+    """Return a step function running one animate() tick per frame."""
+    scheduler = MyName.FrameScheduler(clock=lambda: scheduler.now)
+    scheduler.now = 0.0
+    MyName.SCHEDULER = scheduler
+    MyName.IS_ANIMATING = True
+    scheduler.start(0)
+
+    def tick(_frame):
+        # Every tick lands half-way into the next frame slot
+        scheduler.now = (scheduler.index + 1.5) / scheduler.rate
+        screen.timers.clear()
+        MyName.animate(screen, pool, menu, positions)
+    return tick
+
+
+def menu_cases(screen, calls, min_time):
+    """Time an unchanged menu refresh and one whose status line changes."""
+    menu = MyName.MenuLayer(screen)
+    results = {"draw_menu": measure(
+        lambda _f: MyName.draw_menu(menu, screen), calls, min_time=min_time)}
+
+    def toggle_status(frame):
+        MyName.IS_ANIMATING = frame % 60 == 0
+        MyName.draw_menu(menu, screen)
+    results["draw_menu[changed]"] = measure(toggle_status, calls,
+                                            min_time=min_time)
+    return results
+
+
+def layout_cases(screen, calls, case, layers, min_time):
+    """Time layout, every animation type and animate() for NAME/FONT_SIZE."""
+    results = {f"prepare_letters[{case}]": measure(
+        lambda _f: MyName.prepare_letters(MyName.NAME), calls, frames=(0,),
+        min_time=min_time)}
+    positions = MyName.prepare_letters(MyName.NAME)
+    pool = glyph_pool(screen, positions)
+    for name, animation in MyName.ANIMATIONS.items():
+        if name != "3d_rotation":
+            results[f"draw_frame_{name}[{case}]"] = measure(
+                lambda f, fn=animation: fn(pool, positions, f), calls,
+                min_time=min_time)
+
+    saved_layers = MyName.DEPTH_LAYERS
+    MyName.ANIMATION_TYPE = "3d_rotation"
+    menu = MyName.MenuLayer(screen)
+    for depth in layers:
+        MyName.DEPTH_LAYERS = depth
+        deep = f"{case} layers={depth}"
+        pool_3d = glyph_pool(screen, positions)
+        results[f"draw_frame_3d_rotation[{deep}]"] = measure(
+            lambda f, p=pool_3d: MyName.ANIMATIONS["3d_rotation"](
+                p, positions, f), calls, min_time=min_time)
+        results[f"animate[{deep}]"] = measure(
+            animate_step(screen, glyph_pool(screen, positions), menu,
+                         positions), calls, min_time=min_time)
+        MyName.FRAME_CYCLES.clear()
+    MyName.DEPTH_LAYERS = saved_layers
+    return results
+
+
+def run_suite(lengths=TEXT_LENGTHS, sizes=FONT_SIZES, layers=LAYER_COUNTS,
+              min_time=MIN_TIME):
+    """Run every benchmark case; return {case: (us, calls) per frame}."""
+    with recording_turtle() as (screen, calls):
+        results = menu_cases(screen, calls, min_time)
+        for length in lengths:
+            MyName.NAME = sample_text(length)
+            for size in sizes:
+                MyName.FONT_SIZE = size
+                results.update(layout_cases(
+                    screen, calls, f"len={length} size={size}", layers,
+                    min_time))
+    return results
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """Return a message for every case slower or busier than the baseline."""
+    regressions = []
+    for case, (us, calls) in results.items():
+        base = baseline.get(case)
+        if base is None:
+            continue
+        if us > base["us"] * (1 + threshold) and us - base["us"] > NOISE_US:
+            regressions.append(f"{case}: {us:.1f} us/frame vs "
+                               f"{base['us']:.1f} baseline")
+        if calls > base["calls"] * (1 + threshold):
+            regressions.append(f"{case}: {calls:g} calls/frame vs "
+                               f"{base['calls']:g} baseline")
+    return regressions
+
+
+def report(results, baseline, out):
+    """Write a table of the results next to their baseline values."""
+    out.write(f"{'case':<52} {'us/frame':>10} {'calls':>8} {'baseline':>10}"
+              "\n")
+    for case, (us, calls) in results.items():
+        base = baseline.get(case)
+        ref = f"{base['us']:.1f}" if base else "-"
+        out.write(f"{case:<52} {us:>10.1f} {calls:>8g} {ref:>10}\n")
+
+
+def parse_args(argv=None):
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true",
+                        help="run a small grid of cases")
+    parser.add_argument("--baseline", default=BASELINE_FILE,
+                        help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="relative regression that fails the run")
+    parser.add_argument("--min-time", type=float, default=MIN_TIME,
+                        help="seconds to repeat each case for")
+    parser.add_argument("--output", "-o", default="-",
+                        help="report file, '-' for stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run the suite; return 1 if a case regressed past the threshold."""
+    args = parse_args(argv)
+    grid = QUICK_GRID if args.quick else {}
+    results = run_suite(min_time=args.min_time, **grid)
+    try:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+    except FileNotFoundError:
+        baseline = {}
+
+    regressions = [] if args.save_baseline else compare(
+        results, baseline, args.threshold)
+    with (nullcontext(sys.stdout) if args.output == "-" else
+          open(args.output, "w", encoding="utf-8")) as out:
+        report(results, baseline, out)
+        for message in regressions:
+            out.write("REGRESSION " + message + "\n")
+
+    if args.save_baseline:
+        baseline.update({case: {"us": round(us, 2), "calls": calls}
+                         for case, (us, calls) in results.items()})
+        with open(args.baseline, "w", encoding="utf-8") as handle:
+            json.dump(baseline, handle, indent=1, sort_keys=True)
+            handle.write("\n")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""Shared pytest fixtures: a display-free stand-in for the turtle screen."""
+# pylint: disable=missing-function-docstring,redefined-outer-name
+from types import SimpleNamespace
+
+import pytest
+
+import MyName
+import replay
+
+
+class FakeCanvas:
+    """Records the Tk canvas calls made by the retained-mode layers."""
+
+    def __init__(self):
+        self.items = {}
+        self.calls = []
+        self.next_id = 1
+        self.bindings = {}
+        self.timers = []
+        self.afters = {}
+
+    def _new(self, kind, coords, options):
+        item = self.next_id
+        self.next_id += 1
+        self.items[item] = dict(options, kind=kind, coords=list(coords))
+        self.calls.append(("create_" + kind, item))
+        return item
+
+    def create_text(self, *coords, **options):
+        return self._new("text", coords, options)
+
+    def create_line(self, *coords, **options):
+        return self._new("line", coords, options)
+
+    def create_image(self, *coords, **options):
+        return self._new("image", coords, options)
+
+    def create_rectangle(self, *coords, **options):
+        return self._new("rectangle", coords, options)
+
+    def coords(self, item, *coords):
+        self.calls.append(("coords", item))
+        self.items[item]["coords"] = list(coords)
+
+    def itemconfigure(self, item, **options):
+        self.calls.append(("itemconfigure", item))
+        self.items[item].update(options)
+
+    def delete(self, item):
+        self.calls.append(("delete", item))
+        self.items.pop(item, None)
+
+    def bbox(self, item):
+        """Pretend every character is 10 canvas units wide."""
+        opts = self.items[item]
+        x, y = opts["coords"]
+        width = 10 * len(opts["text"])
+        left = {"sw": x, "s": x - width / 2, "se": x - width}[opts["anchor"]]
+        return left, y - 20, left + width, y
+
+    def find_all(self):
+        return tuple(self.items)
+
+    def tag_lower(self, tag):
+        """Move the items with `tag` (or id) to the bottom of the stack."""
+        self.calls.append(("tag_lower", tag))
+        lowered = {item: opts for item, opts in self.items.items()
+                   if tag in (item, opts.get("tags"))}
+        for item in lowered:
+            del self.items[item]
+        self.items = {**lowered, **self.items}
+
+    def bind(self, sequence, func):
+        self.bindings[sequence] = func
+
+    def after(self, ms, func):
+        timer = (func, ms)
+        self.timers.append(timer)
+        after_id = f"after#{len(self.afters)}"
+        self.afters[after_id] = timer
+        return after_id
+
+    def after_cancel(self, after_id):
+        timer = self.afters.pop(after_id)
+        self.timers[:] = [t for t in self.timers if t is not timer]
+
+    def visible_texts(self):
+        return [opts["text"] for opts in self.items.values()
+                if opts["kind"] == "text" and opts.get("state") != "hidden"]
+
+
+class FakeScreen:
+    """Minimal TurtleScreen replacement with a 1:1 world-to-canvas scale."""
+
+    def __init__(self):
+        self.cv = FakeCanvas()
+        self.xscale = 1.0
+        self.yscale = 1.0
+        self.updates = 0
+        self.timers = self.cv.timers  # ontimer() and canvas after() alike
+
+    def getcanvas(self):
+        return self.cv
+
+    def update(self):
+        self.updates += 1
+
+    def ontimer(self, fun, t=0):
+        self.timers.append((fun, t))
+
+    def listen(self):
+        pass
+
+    def bye(self):
+        self.cv.bindings.clear()
+
+    def press(self, *keys):
+        """Deliver KeyPress events (by Tk keysym) to the canvas binding."""
+        for key in keys:
+            self.cv.bindings["<KeyPress>"](SimpleNamespace(keysym=key))
+
+    def run_timers(self, delay=None):
+        """Fire the pending timers (only those of `delay` ms if given)."""
+        due = [(fun, t) for fun, t in self.timers if delay in (None, t)]
+        self.timers[:] = [timer for timer in self.timers if timer not in due]
+        for fun, _ in due:
+            fun()
+
+
+class FakeTurtle:
+    """Turtle stand-in that keeps the text written since the last clear()."""
+
+    def __init__(self):
+        self.written = []
+
+    def clear(self):
+        self.written.clear()
+
+    def write(self, text, **_):
+        self.written.append(text)
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def wired_studio(screen, text="Hi"):
+    """Name, menu and allocated glyph pool with the menu keys bound."""
+    MyName.NAME = text
+    menu = MyName.MenuLayer(screen)
+    pool = MyName.GlyphPool(screen)
+    positions = MyName.prepare_letters(text)
+    pool.allocate(positions)
+    MyName.setup_main_keys(screen, menu, pool, positions)
+    return menu, pool, positions
+
+
+@pytest.fixture
+def screen():
+    return FakeScreen()
+
+
+@pytest.fixture
+def tk(screen):
+    """replay.VirtualTk firing the screen's timers on the SCHEDULER clock."""
+    virtual = replay.VirtualTk(screen)
+    MyName.SCHEDULER = MyName.FrameScheduler(clock=lambda: virtual.now)
+    MyName.INPUT_TURTLE = FakeTurtle()
+    return virtual
+
+
+@pytest.fixture
+def studio(screen):
+    """(menu, pool, positions) of a wired_studio() showing "Hi"."""
+    return wired_studio(screen)
+
+
+@pytest.fixture(autouse=True)
+def app_state():
+    """Restore the module-level application state after each test."""
+    saved = {name: getattr(MyName, name) for name in
+             ("NAME", "FONT_SIZE", "ANIMATION_TYPE", "IS_ANIMATING",
+              "MARQUEE", "MENU_LAYER", "PLAYLIST", "GOVERNOR", "SCHEDULER",
+              "KEYS", "LOOP", "PIPELINE", "INPUT_TURTLE")}
+    MyName.GOVERNOR = MyName.QualityGovernor()
+    MyName.KEYS = MyName.KeyRouter()
+    MyName.LOOP = MyName.AnimationLoop()
+    MyName.SCHEDULER = MyName.FrameScheduler()
+    # Frames are drawn synchronously unless a test installs a pipeline
+    MyName.PIPELINE = MyName.FramePipeline(depth=0)
+    yield
+    for name, value in saved.items():
+        setattr(MyName, name, value)
@@ -0,0 +1,245 @@
+"""Replay a recorded Text Animator Studio session headlessly.
+
+A session log written with `MyName.py --record FILE` holds every key event
+and state change with its time. The replay runs the studio against the
+call-recording turtle stub of bench.py, fires Tk timers in due order on a
+virtual clock and delivers each key to KEYS at its recorded time, so the
+same handlers run in the same order as in the session, much faster than
+real time. It reports the time and draw calls of every frame drawn and
+checks that the state transitions match the recording.
+
+    python replay.py session.jsonl          # summary table
+    python replay.py session.jsonl --json   # summary as JSON
+
+Frames are computed on the replaying thread (no pipeline worker) and
+layout uses estimated glyph metrics rather than the Tk fonts of the
+recorded machine, so frame counts and draw calls are identical between
+replays of a log, but not comparable with the original session.
+"""
+import argparse
+import heapq
+import json
+import math
+import sys
+import time
+from types import SimpleNamespace
+
+import bench
+import MyName
+
+REPEATS = 1  # replays whose frame times are pooled
+
+
+class VirtualTk:
+    """Tk timers of the stub screen, fired in due order on a virtual clock.
+
+    Both screen.ontimer() and canvas after()/after_cancel() are redirected
+    here; run_until() advances `now` from deadline to deadline.
+    """
+
+    def __init__(self, screen):
+        self.now = 0.0
+        self.queue = []         # heap of (due, after id, callback)
+        self.cancelled = set()
+        self.next_id = 0
+        screen.ontimer = lambda fun, t=0: self.after(t, fun)
+        screen.cv.after = self.after
+        screen.cv.after_cancel = self.after_cancel
+
+    def after(self, ms, func):
+        """Queue `func` to run `ms` milliseconds from now; return its id."""
+        self.next_id += 1
+        heapq.heappush(self.queue, (self.now + ms / 1000, self.next_id, func))
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        """Drop a queued callback."""
+        self.cancelled.add(after_id)
+
+    def pending(self, func):
+        """Return how many queued, uncancelled callbacks are `func`."""
+        return sum(queued == func for _, after_id, queued in self.queue
+                   if after_id not in self.cancelled)
+
+    def run_until(self, end, run=None):
+        """Fire every callback due by `end` (seconds).
+
+        Callbacks are called through `run(func)` if given.
+        """
+        while self.queue and self.queue[0][0] <= end:
+            due, after_id, func = heapq.heappop(self.queue)
+            if after_id in self.cancelled:
+                self.cancelled.discard(after_id)
+                continue
+            self.now = due
+            if run is None:
+                func()
+            else:
+                run(func)
+        self.now = max(self.now, end)
+
+
+class Replayer:
+    """Runs studio callbacks and keeps per-frame time and draw calls."""
+
+    def __init__(self, screen, calls):
+        self.screen = screen
+        self.calls = calls
+        self.tk = VirtualTk(screen)
+        self.frames = []        # (ms, draw calls) per callback that drew
+        self.keys = []          # ms per key event
+
+    def run(self, func, *args):
+        """Call `func(*args)`; record it as a frame if it drew one."""
+        drawn = MyName.SCHEDULER.drawn
+        calls = sum(self.calls.values())
+        started = time.perf_counter()
+        func(*args)
+        elapsed = (time.perf_counter() - started) * 1000
+        if MyName.SCHEDULER.drawn != drawn:
+            self.frames.append((elapsed, sum(self.calls.values()) - calls))
+        return elapsed
+
+    def start(self, text):
+        """Open the studio like main(): prompt for text unless given."""
+        screen = self.screen
+        if text is None:
+            self.run(MyName.get_text_input, screen, MyName.input_turtle(),
+                     lambda name: MyName.start_studio(screen, name))
+        else:
+            self.run(MyName.start_studio, screen, text)
+
+    def play(self, events):
+        """Deliver the logged key events at their times."""
+        for event in events:
+            self.tk.run_until(event[0] / 1000, self.run)
+            if event[1] == "k":
+                self.keys.append(self.run(MyName.KEYS.dispatch,
+                                          SimpleNamespace(keysym=event[2])))
+
+
+def percentile(values, point):
+    """Nearest-rank percentile of sorted `values` (0.0 if empty)."""
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(point / 100 * len(values)) - 1)]
+
+
+def replay(header, events):
+    """Replay a session log; return (frames, keys, stats, transitions).
+
+    `frames` holds (ms, draw calls) per frame and `keys` the milliseconds
+    spent handling each key event; `transitions` are the state changes
+    logged during the replay, to compare with the recording.
+    """
+    with bench.recording_turtle() as (screen, calls):
+        MyName.MARQUEE = MyName.MENU_LAYER = MyName.INPUT_TURTLE = None
+        for field, value in header["state"].items():
+            setattr(MyName, field, value)
+        MyName.DEPTH_LAYERS = header["depth_layers"]
+        player = Replayer(screen, calls)
+        MyName.SCHEDULER = MyName.FrameScheduler(
+            fps=header["fps"], clock=lambda: player.tk.now)
+        recorder = MyName.SessionRecorder(clock=lambda: player.tk.now)
+        MyName.KEYS.recorder = recorder
+        recorder.start(header["text"])
+
+        wall = time.perf_counter()
+        player.start(header["text"])
+        recorder.transitions()
+        player.play(events)
+        stats = {"wall_s": time.perf_counter() - wall,
+                 "virtual_s": player.tk.now,
+                 "dropped": MyName.SCHEDULER.dropped,
+                 "calls": sum(calls.values())}
+    transitions = [event for event in recorder.events if event[1] == "s"]
+    return player.frames, player.keys, stats, transitions
+
+
+def summarize(frames, keys, stats):
+    """Return frame-time and draw-call statistics of a replay."""
+    times = sorted(ms for ms, _ in frames)
+    draws = [count for _, count in frames]
+    count = len(frames)
+    summary = {"frames": count, "keys": len(keys)}
+    summary.update({f"frame_ms_p{point}": percentile(times, point)
+                    for point in (50, 95, 99)})
+    summary.update({
+        "frame_ms_max": times[-1] if times else 0.0,
+        "frame_ms_mean": sum(times) / count if count else 0.0,
+        "calls_per_frame": sum(draws) / count if count else 0.0,
+        "calls_max": max(draws, default=0),
+        "key_ms_max": max(keys, default=0.0),
+    })
+    summary.update(stats)
+    summary["speedup"] = (stats["virtual_s"] / stats["wall_s"]
+                          if stats["wall_s"] else 0.0)
+    return summary
+
+
+def diverged(recorded, replayed):
+    """Return a message per state transition that differs in the replay.
+
+    Transitions are compared by field and value; their times differ by
+    the handler run time, which is zero on the virtual clock.
+    """
+    expected = [event[2:] for event in recorded if event[1] == "s"]
+    actual = [event[2:] for event in replayed]
+    messages = []
+    for index in range(max(len(expected), len(actual))):
+        want = expected[index] if index < len(expected) else None
+        got = actual[index] if index < len(actual) else None
+        if want != got:
+            messages.append(f"transition {index}: recorded {want}, "
+                            f"replayed {got}")
+    return messages
+
+
+def replay_repeated(header, events, repeat=REPEATS):
+    """Replay a log `repeat` times; return (summary, divergence messages).
+
+    Frame times are pooled and the counters summed over the replays.
+    """
+    frames, keys, totals = [], [], {}
+    for _ in range(max(1, repeat)):
+        run_frames, run_keys, stats, transitions = replay(header, events)
+        frames += run_frames
+        keys += run_keys
+        for name, value in stats.items():
+            totals[name] = totals.get(name, 0) + value
+    return summarize(frames, keys, totals), diverged(events, transitions)
+
+
+def parse_args(argv=None):
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("log", help="session log written with --record")
+    parser.add_argument("--repeat", type=int, default=REPEATS,
+                        help="replay the session N times and pool the "
+                             "frame times")
+    parser.add_argument("--json", action="store_true",
+                        help="print the summary as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Replay a log; return 1 if the replay diverged from the recording."""
+    args = parse_args(argv)
+    with open(args.log, encoding="utf-8") as handle:
+        header, events = MyName.read_session(handle)
+
+    summary, messages = replay_repeated(header, events, args.repeat)
+
+    if args.json:
+        json.dump(summary, sys.stdout, indent=1)
+        sys.stdout.write("\n")
+    else:
+        for name, value in summary.items():
+            print(f"{name:<16} {value:>12.6g}")
+    for message in messages:
+        print("DIVERGED " + message, file=sys.stderr)
+    return 1 if messages else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""Tests for the parallel batch exporter."""
+# pylint: disable=missing-function-docstring
+import io
+import json
+
+import pytest
+
+import MyName
+import batch
+
+SMALL = {"width": 80, "height": 40}
+
+
+def small_jobs(fmt="gif", frames=7):
+    rows = [{"text": "Hi"}, {"text": "Yo!", "type": "spiral 3d_rotation",
+                             "size": "20"}]
+    return batch.read_jobs(rows, sizes=(16, 24), types=("wave",),
+                           frames=frames, fmt=fmt, **SMALL)
+
+
+def outputs(out_dir):
+    return {path.name: path.read_bytes() for path in sorted(out_dir.iterdir())
+            if path.name != batch.MANIFEST}
+
+
+def test_rows_expand_in_order():
+    jobs = small_jobs()
+    assert [(j.text, j.type, j.size) for j in jobs] == [
+        ("Hi", "wave", 16), ("Hi", "wave", 24),
+        ("Yo!", "spiral", 20), ("Yo!", "3d_rotation", 20)]
+    assert jobs[2].filename == "000002-Yo-spiral-20.gif"
+    assert len({job.key for job in jobs}) == 4
+
+
+def test_row_overrides_and_unknown_type():
+    job = batch.read_jobs([{"text": "A", "start": "8", "frames": "3"}])[0]
+    assert list(job.frame_numbers()) == [8, 12, 16]
+    with pytest.raises(ValueError):
+        batch.read_jobs([{"text": "A", "type": "sparkle"}])
+
+
+def test_chunks_cover_the_job():
+    job = batch.Job(0, "A", 20, "wave", frames=10)
+    assert job.chunks(4) == [(0, 4), (4, 8), (8, 10)]
+    assert list(job.frame_numbers(4, 8)) == [16, 20, 24, 28]
+
+
+@pytest.mark.parametrize("fmt", batch.FORMATS)
+def test_split_jobs_match_whole_jobs(tmp_path, fmt):
+    batch.run_batch(small_jobs(fmt), tmp_path / "whole", chunk_frames=100,
+                    progress=batch.Progress(4, 28, out=None))
+    batch.run_batch(small_jobs(fmt), tmp_path / "split", chunk_frames=3,
+                    progress=batch.Progress(4, 28, out=None))
+    whole = outputs(tmp_path / "whole")
+    assert len(whole) == 4
+    assert outputs(tmp_path / "split") == whole
+
+
+def test_gif_matches_single_export(tmp_path):
+    job = batch.read_jobs([{"text": "Hi"}], sizes=(24,),
+                          types=("bounce",), frames=5, **SMALL)[0]
+    batch.run_batch([job], tmp_path, chunk_frames=2,
+                    progress=batch.Progress(1, 5, out=None))
+    single = tmp_path / "single.gif"
+    MyName.main(["--export", "gif", "--text", "Hi", "--size", "24",
+                 "--type", "bounce", "--frames", "5", "--width", "80",
+                 "--height", "40", "-o", str(single)])
+    assert (tmp_path / job.filename).read_bytes() == single.read_bytes()
+
+
+def test_process_pool_output_is_deterministic(tmp_path):
+    batch.run_batch(small_jobs(frames=5), tmp_path / "serial",
+                    chunk_frames=2, progress=batch.Progress(4, 20, out=None))
+    batch.run_batch(small_jobs(frames=5), tmp_path / "pool", workers=2,
+                    chunk_frames=2, progress=batch.Progress(4, 20, out=None))
+    assert outputs(tmp_path / "pool") == outputs(tmp_path / "serial")
+    lines = (tmp_path / "pool" / batch.MANIFEST).read_text().splitlines()
+    assert [json.loads(line)["output"] for line in lines] == \
+        [job.filename for job in small_jobs()]
+
+
+def test_resume_skips_finished_jobs(tmp_path):
+    jobs = small_jobs()
+    first = batch.run_batch(jobs, tmp_path, chunk_frames=3,
+                            progress=batch.Progress(4, 28, out=None))
+    assert first.rendered == 28
+    before = outputs(tmp_path)
+
+    again = batch.run_batch(jobs, tmp_path, chunk_frames=3,
+                            progress=batch.Progress(4, 28, out=None))
+    assert (again.rendered, again.jobs, again.frames) == (0, 4, 28)
+
+    (tmp_path / jobs[1].filename).unlink()
+    redo = batch.run_batch(jobs, tmp_path, chunk_frames=3,
+                           progress=batch.Progress(4, 28, out=None))
+    assert redo.rendered == 7
+    assert outputs(tmp_path) == before
+
+
+def test_interrupted_job_reuses_finished_parts(tmp_path):
+    job = batch.read_jobs([{"text": "Hi"}], frames=7, **SMALL)[0]
+    parts = batch.part_paths(job, str(tmp_path), 3)
+    assert len(parts) == 3
+    batch.render_chunk(job, *parts[0])
+    (tmp_path / batch.MANIFEST).write_text('{"key": "cut sh')
+
+    resumed = batch.run_batch([job], tmp_path, chunk_frames=3,
+                              progress=batch.Progress(1, 7, out=None))
+    assert resumed.rendered == 4
+    assert sorted(p.name for p in tmp_path.iterdir()) == \
+        sorted([job.filename, batch.MANIFEST])
+    done = batch.load_manifest(tmp_path / batch.MANIFEST)
+    assert batch.is_finished(job, tmp_path, done)
+
+
+def test_progress_is_throttled():
+    now = [0.0]
+    out = io.StringIO()
+    progress = batch.Progress(2, 20, out=out, interval=1.0,
+                              clock=lambda: now[0])
+    progress.advance(5)
+    assert out.getvalue() == ""
+    now[0] = 2.0
+    progress.advance(5, jobs=1)
+    assert out.getvalue() == \
+        "1/2 jobs, 10/20 frames, 5.0 frames/s, ETA 2s\n"
+
+
+def test_command_line(tmp_path):
+    jobs = tmp_path / "jobs.csv"
+    jobs.write_text("text,size\nHello,20\nBye,\n", encoding="utf-8")
+    out = tmp_path / "out"
+    assert batch.main([str(jobs), "-o", str(out), "--format", "ppm",
+                       "--sizes", "12", "--types", "wave", "rainbow_pulse",
+                       "--frames", "2", "--width", "20", "--height", "10",
+                       "--workers", "0", "--quiet"]) == 0
+    names = sorted(outputs(out))
+    assert names == ["000000-Hello-wave-20.ppm",
+                     "000001-Hello-rainbow_pulse-20.ppm",
+                     "000002-Bye-wave-12.ppm",
+                     "000003-Bye-rainbow_pulse-12.ppm"]
+
+
+@pytest.mark.parametrize("option, value", [
+    ("--chunk-frames", "0"), ("--frames", "0"), ("--frames", "-3"),
+    ("--workers", "-2")])
+def test_counts_are_validated(option, value, capsys):
+    with pytest.raises(SystemExit):
+        batch.parse_args(["jobs.csv", option, value])
+    assert "must" in capsys.readouterr().err
@@ -0,0 +1,58 @@
+"""Tests for the headless benchmark suite."""
+# pylint: disable=missing-function-docstring
+import json
+import sys
+
+import bench
+import MyName
+
+
+def tiny_suite():
+    return bench.run_suite(lengths=(3,), sizes=(32,), layers=(2,),
+                           min_time=0)
+
+
+def test_suite_runs_against_the_stub():
+    real_turtle = sys.modules.get("turtle")
+    results = tiny_suite()
+    assert sys.modules.get("turtle") is real_turtle
+    assert MyName.myName is None or MyName.myName is real_turtle
+    assert set(results) >= {
+        "draw_menu", "prepare_letters[len=3 size=32]",
+        "draw_frame_wave[len=3 size=32]",
+        "draw_frame_3d_rotation[len=3 size=32 layers=2]",
+        "animate[len=3 size=32 layers=2]"}
+    # "Hel": 3 glyphs x 3 layers are moved (and mostly recolored) per frame
+    calls = results["draw_frame_3d_rotation[len=3 size=32 layers=2]"][1]
+    assert 9 < calls <= 18
+
+
+def test_draw_calls_are_deterministic():
+    first = {case: calls for case, (_, calls) in tiny_suite().items()}
+    second = {case: calls for case, (_, calls) in tiny_suite().items()}
+    assert first == second
+
+
+def test_compare_flags_slowdowns_and_extra_calls():
+    baseline = {"a": {"us": 100.0, "calls": 10}, "b": {"us": 1.0, "calls": 2}}
+    results = {"a": (130.0, 10), "b": (2.0, 3), "new": (5.0, 1)}
+    regressions = bench.compare(results, baseline, threshold=0.25)
+    # "b" is twice as slow but within timer noise; its calls regressed
+    assert regressions == ["a: 130.0 us/frame vs 100.0 baseline",
+                           "b: 3 calls/frame vs 2 baseline"]
+
+
+def test_main_fails_on_regression(tmp_path, monkeypatch):
+    monkeypatch.setattr(bench, "run_suite",
+                        lambda **_: {"draw_menu": (50.0, 4)})
+    baseline = tmp_path / "baseline.json"
+    report = tmp_path / "report.txt"
+    assert bench.main(["--baseline", str(baseline), "--save-baseline",
+                       "-o", str(report)]) == 0
+    assert json.loads(baseline.read_text()) == {
+        "draw_menu": {"us": 50.0, "calls": 4}}
+
+    monkeypatch.setattr(bench, "run_suite",
+                        lambda **_: {"draw_menu": (50.0, 8)})
+    assert bench.main(["--baseline", str(baseline), "-o", str(report)]) == 1
+    assert "REGRESSION draw_menu" in report.read_text()
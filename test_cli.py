@@ -0,0 +1,78 @@
+"""Tests for launching the window straight from the command line."""
+# pylint: disable=missing-function-docstring,redefined-outer-name
+import io
+import subprocess
+import sys
+
+import pytest
+
+import bench
+import MyName
+
+
+@pytest.fixture
+def window(monkeypatch):
+    """Run main() against the recording turtle stub; yield its calls."""
+    monkeypatch.setattr(MyName, "SPRITE_GLYPHS", False)
+    monkeypatch.setattr(MyName, "use_tk_metrics", lambda screen: None)
+    for name in ("MENU_LAYER", "INPUT_TURTLE", "PROFILER"):
+        monkeypatch.setattr(MyName, name, getattr(MyName, name))
+    with bench.recording_turtle() as (_screen, calls):
+        yield calls
+
+
+def test_text_skips_the_prompt(window, capsys):
+    MyName.main(["--text", "Hi there", "--size", "32", "--type", "wave",
+                 "--fps", "30"])
+    assert (MyName.NAME, MyName.FONT_SIZE, MyName.ANIMATION_TYPE) == \
+        ("Hi there", 32, "wave")
+    assert MyName.SCHEDULER.rate == 30
+    assert MyName.IS_ANIMATING and MyName.SCHEDULER.drawn == 1
+    # No input prompt: the input turtle is never created
+    assert MyName.INPUT_TURTLE is None
+    assert window["create_text"] > 0 and window["screen.mainloop"] == 1
+    report = capsys.readouterr().err
+    assert report.startswith("first frame after ")
+    for phase in ("window", "layout", "first frame"):
+        assert f"{phase} " in report.split("(", 1)[1]
+
+
+@pytest.mark.usefixtures("window")
+def test_without_text_the_prompt_is_shown(capsys):
+    MyName.main([])
+    assert MyName.INPUT_TURTLE is not None
+    assert not MyName.IS_ANIMATING
+    assert capsys.readouterr().err == ""
+
+
+def test_startup_timer_phases():
+    now = [10.0]
+    out = io.StringIO()
+    timer = MyName.StartupTimer(clock=lambda: now[0], out=out)
+    now[0] = 10.25
+    timer.mark("window")
+    now[0] = 10.3
+    timer.mark("first frame")
+    assert [name for name, _ in timer.phases] == ["window", "first frame"]
+    assert timer.total_ms() == pytest.approx(300)
+    timer.report()
+    assert out.getvalue().startswith(
+        "first frame after 300.0 ms (window 250.0, first frame 50.0); ")
+
+
+def test_parsing_arguments_does_not_import_tk_or_numpy():
+    code = ("import sys, MyName; MyName.parse_args(['--text', 'Hi', "
+            "'--fullscreen']); "
+            "print('turtle' in sys.modules or 'tkinter' in sys.modules "
+            "or 'numpy' in sys.modules)")
+    result = subprocess.run([sys.executable, "-c", code], check=True,
+                            capture_output=True, text=True)
+    assert result.stdout.strip() == "False"
+
+
+@pytest.mark.parametrize("option", ["--fps", "--size"])
+@pytest.mark.parametrize("value", ["0", "-25"])
+def test_rate_and_size_must_be_positive(option, value, capsys):
+    with pytest.raises(SystemExit):
+        MyName.parse_args([option, value])
+    assert "must be positive" in capsys.readouterr().err
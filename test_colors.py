@@ -0,0 +1,64 @@
+"""Tests for the precomputed color palette and interned color strings."""
+# pylint: disable=missing-function-docstring
+import colorsys
+
+import pytest
+
+import MyName
+
+
+def test_colors_are_interned_with_their_tk_string():
+    color = MyName.intern_color((255, 16, 0))
+    assert color == (255, 16, 0)
+    assert MyName.intern_color((255, 16, 0)) is color
+    assert color.tk == "#ff1000"
+    assert MyName.color_string(color) is color.tk
+
+
+def test_whole_degree_hues_match_colorsys():
+    palette = MyName.ColorPalette()
+    for degree in range(0, 360, 7):
+        rgb = colorsys.hsv_to_rgb(degree / 360.0, 0.85, 0.95)
+        expected = tuple(int(c * 255) for c in rgb)
+        assert palette.color(degree / 360.0) == expected
+
+
+def test_shade_rows_match_the_3d_shading():
+    palette = MyName.ColorPalette(hues=12)
+    shade = 1.0 - (4 / 13) * 0.7
+    row = palette.shaded(shade)
+    assert palette.shaded(shade) is row
+    for base, dark in zip(palette.base, row):
+        assert dark == tuple(max(0, min(255, int(c * shade))) for c in base)
+
+
+def test_custom_palette_colors_every_effect(screen, monkeypatch):
+    brand = [(255, 0, 0), (0, 0, 255)]
+    monkeypatch.setattr(MyName, "PALETTE", MyName.ColorPalette(colors=brand))
+    positions = MyName.prepare_letters("Hello")
+    pool = MyName.GlyphPool(screen)
+    pool.allocate(positions)
+    for animation in MyName.ANIMATIONS:
+        MyName.ANIMATION_TYPE = animation
+        MyName.draw_frame(pool, positions, 8)
+        fills = {pool.applied[key][3] for key in pool.visible}
+        if animation == "3d_rotation":
+            # Back layers are darker shades of the same two colors
+            front = {pool.applied[key][3] for key in pool.visible
+                     if key[1] == 0}
+            assert front <= set(brand)
+        else:
+            assert fills <= set(brand)
+
+
+def test_kernels_use_the_palette(monkeypatch):
+    pytest.importorskip("numpy")
+    monkeypatch.setattr(MyName, "PALETTE", MyName.ColorPalette(hues=7))
+    positions = tuple(MyName.prepare_letters("Hey there"))
+    vectorized = MyName.build_frame_cycle(positions, "3d_rotation")
+    monkeypatch.setattr(MyName, "load_numpy", lambda: False)
+    scalar = MyName.build_frame_cycle(positions, "3d_rotation")
+    assert vectorized.palette and set(vectorized.palette) == set(
+        scalar.palette)
+    assert all(isinstance(color, MyName.Color)
+               for color in vectorized.palette)
@@ -0,0 +1,151 @@
+"""Tests for the composable effects against the original animation formulas."""
+# pylint: disable=missing-function-docstring
+import math
+
+import pytest
+
+import MyName
+
+TEXTS = ["Hi", "Hello brave new world", "a  b", ""]
+
+
+def font(size):
+    return MyName.FONTS.get(MyName.FONT_NAME, size, MyName.FONT_STYLE)
+
+
+def depth_layers(quality):
+    layers, depth_step, _ = MyName.quality_settings(quality)
+    for layer in range(layers, -1, -1):
+        depth = layer * depth_step
+        yield layer, depth, MyName.PALETTE.shaded(
+            1.0 - (depth / (MyName.DEPTH_LAYERS + 3)) * 0.7)
+
+
+def rotation_hue(i, count, frame, quality):
+    hue = ((i / max(1, count)) % 1.0 + (frame % 360) / 360.0) % 1.0
+    steps = MyName.quality_settings(quality)[2]
+    return math.floor(hue * steps) / steps if steps else hue
+
+
+def reference_3d_rotation(positions, frame, size, quality=0):
+    layers = list(depth_layers(quality))
+    for i, (ch, base_x, base_y) in enumerate(positions):
+        if ch == ' ':
+            continue
+        hue_index = MyName.PALETTE.index(
+            rotation_hue(i, len(positions), frame, quality))
+        trail = math.radians(frame) + i * 0.18
+        for layer, depth, row in layers:
+            yield (i, layer), (base_x + depth * math.cos(trail) * 0.8,
+                               base_y + depth * math.sin(trail) * 0.8 * 0.45 -
+                               size * 0.35, ch, row[hue_index], font(size))
+
+
+def reference_wave(positions, frame, size):
+    for i, (ch, base_x, base_y) in enumerate(positions):
+        if ch != ' ':
+            rgb = MyName.PALETTE.color(((frame + i * 15) % 360) / 360.0)
+            wave = math.sin(math.radians(frame * 3 + i * 30)) * 30
+            yield (i, 0), (base_x, base_y + wave - size * 0.35, ch, rgb,
+                           font(size))
+
+
+def reference_spiral(positions, frame, size):
+    for i, (ch, base_x, base_y) in enumerate(positions):
+        if ch != ' ':
+            rgb = MyName.PALETTE.color(((frame + i * 20) % 360) / 360.0)
+            angle = math.radians(frame * 2 + i * 25)
+            radius = 20 + math.sin(math.radians(frame + i * 30)) * 15
+            yield (i, 0), (base_x + math.cos(angle) * radius,
+                           base_y + math.sin(angle) * radius - size * 0.35,
+                           ch, rgb, font(size))
+
+
+def reference_bounce(positions, frame, size):
+    for i, (ch, base_x, base_y) in enumerate(positions):
+        if ch != ' ':
+            rgb = MyName.PALETTE.color((i / max(1, len(positions))) % 1.0)
+            phase = (frame * 4 + i * 20) % 360
+            bounce = abs(math.sin(math.radians(phase))) * 50
+            yield (i, 0), (base_x, base_y + bounce - size * 0.35, ch, rgb,
+                           font(size))
+
+
+def reference_rainbow_pulse(positions, frame, size):
+    for i, (ch, base_x, base_y) in enumerate(positions):
+        if ch != ' ':
+            rgb = MyName.PALETTE.color(((frame * 2 + i * 15) % 360) / 360.0)
+            pulse = 1.0 + math.sin(math.radians(frame * 3 + i * 25)) * 0.3
+            pulsed = MyName.FONTS.scaled(MyName.FONT_NAME, size * pulse,
+                                         MyName.FONT_STYLE)
+            yield (i, 0), (base_x, base_y - pulsed[1] * 0.35, ch, rgb,
+                           pulsed)
+
+
+REFERENCES = {
+    "3d_rotation": reference_3d_rotation,
+    "wave": reference_wave,
+    "spiral": reference_spiral,
+    "bounce": reference_bounce,
+    "rainbow_pulse": reference_rainbow_pulse,
+}
+
+
+def drawn(animation, positions, frame, size, **options):
+    draw_list = MyName.DrawList()
+    animation(draw_list, positions, frame, size, **options)
+    return draw_list
+
+
+@pytest.mark.parametrize("anim", sorted(REFERENCES))
+@pytest.mark.parametrize("text", TEXTS)
+def test_builtin_types_match_the_original_formulas(anim, text):
+    animation = MyName.ANIMATIONS[anim]
+    for size in (32, 64, 97):
+        positions = MyName.prepare_letters(text, size)
+        for frame in range(0, 360, 7):
+            assert drawn(animation, positions, frame, size) == \
+                list(REFERENCES[anim](positions, frame, size))
+
+
+@pytest.mark.parametrize("quality", range(len(MyName.QUALITY_LEVELS)))
+def test_reduced_quality_matches_the_original(quality):
+    positions = MyName.prepare_letters("Hello world")
+    for frame in range(0, 360, 11):
+        assert drawn(MyName.ANIMATIONS["3d_rotation"], positions, frame, 64,
+                     quality=quality) == \
+            list(reference_3d_rotation(positions, frame, 64, quality))
+
+
+def test_a_stack_of_effects_is_one_pass():
+    stack = MyName.Animation(MyName.Wave(), MyName.Orbit(), MyName.Pulse(),
+                             MyName.Extrude(), MyName.HueCycle(speed=2))
+    assert stack.adaptive
+    positions = MyName.prepare_letters("Hey you")
+    commands = drawn(stack, positions, 40, 64)
+    glyphs = sum(ch != ' ' for ch, _, _ in positions)
+    assert len(commands) == glyphs * (MyName.DEPTH_LAYERS + 1)
+    # Offsets add up and the pulse sets the font of every layer
+    (i, layer), (x, y, ch, _, pulsed) = commands[-1]
+    assert layer == 0 and ch == "u"
+    _, base_x, base_y = positions[i]
+    wave = MyName.Wave().offset(math, i, 40)
+    orbit = MyName.Orbit().offset(math, i, 40)
+    assert x == pytest.approx(base_x + wave[0] + orbit[0])
+    assert y == pytest.approx(base_y + wave[1] + orbit[1] - pulsed[1] * 0.35)
+    assert pulsed == MyName.FONTS.scaled(
+        MyName.FONT_NAME, 64 * MyName.Pulse().scale(math, i, 40),
+        MyName.FONT_STYLE)
+
+
+def test_registered_stacks_are_selectable(monkeypatch):
+    stack = MyName.Animation(MyName.Bounce(height=20), MyName.Pulse())
+    monkeypatch.setitem(MyName.ANIMATIONS, "bouncy_pulse", stack)
+    monkeypatch.setattr(MyName, "ANIMATION_TYPE", "bouncy_pulse")
+    assert MyName.get_animation() is stack
+    assert MyName.parse_args(["--type", "bouncy_pulse"]).type == \
+        "bouncy_pulse"
+    positions = tuple(MyName.prepare_letters("Hi"))
+    cycle = MyName.build_frame_cycle(positions, "bouncy_pulse")
+    assert cycle.keys == [(0, 0), (1, 0)]
+    assert MyName.get_animation("sparkle") is MyName.ANIMATIONS["3d_rotation"]
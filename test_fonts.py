@@ -0,0 +1,85 @@
+"""Tests for the shared font registry and pulse size quantization."""
+# pylint: disable=missing-function-docstring
+import itertools
+import tkinter.font
+
+import MyName
+
+
+class FakeTkFont:  # pylint: disable=too-few-public-methods
+    """tkinter.font.Font stand-in that only hands out names."""
+
+    names = itertools.count()
+
+    def __init__(self, root, **options):
+        self.root = root
+        self.options = options
+        self.name = f"font{next(self.names)}"
+
+    def measure(self, text):
+        return 10 * len(text)
+
+
+def test_fonts_are_shared_and_counted():
+    fonts = MyName.FontRegistry()
+    font = fonts.get("Arial", 24, "bold")
+    assert font == ("Arial", 24, "bold")
+    assert fonts.get("Arial", 24, "bold") is font
+    assert MyName.font_option(font) == ("Arial", 24, "bold")
+    assert MyName.font_option(("Arial", 9, "normal")) == \
+        ("Arial", 9, "normal")
+    assert fonts.stats() == {"fonts": 1, "tk_fonts": 0, "hits": 1,
+                             "misses": 1}
+
+
+def test_sizes_round_to_the_step():
+    fonts = MyName.FontRegistry(step=4)
+    assert [fonts.quantize(size) for size in (0.5, 45.9, 46.1, 83.2)] == \
+        [4, 44, 48, 84]
+    assert fonts.scaled("Arial", 61.7, "bold") is \
+        fonts.get("Arial", 60, "bold")
+    assert MyName.FontRegistry(step=1).quantize(63.4) == 63
+
+
+def test_bound_registry_names_tk_fonts(screen, monkeypatch):
+    monkeypatch.setattr(tkinter.font, "Font", FakeTkFont)
+    fonts = MyName.FontRegistry()
+    before = fonts.get("Arial", 12, "italic")
+    fonts.bind(screen.cv)
+    after = fonts.get("Arial", 20, "bold")
+    assert fonts.stats()["tk_fonts"] == 2
+    assert fonts.tk_font(before).options == {
+        "family": "Arial", "size": 12, "weight": "normal",
+        "slant": "italic"}
+    monkeypatch.setattr(MyName, "FONTS", fonts)
+
+    layer = MyName.TextLayer(screen)
+    layer.put("a", (0, 0, "a", (0, 0, 0), after))
+    assert screen.cv.items[layer.items["a"]]["font"] == after.tk
+    assert after.tk.startswith("font")
+
+
+def test_pulse_cycles_through_few_shared_fonts(screen, monkeypatch):
+    fonts = MyName.FontRegistry(step=2)
+    monkeypatch.setattr(MyName, "FONTS", fonts)
+    MyName.ANIMATION_TYPE = "rainbow_pulse"
+    positions = MyName.prepare_letters("Hello world")
+    pool = MyName.GlyphPool(screen)
+    pool.allocate(positions)
+    used = set()
+    for frame in range(0, 360, MyName.FRAME_STEP):
+        MyName.draw_frame(pool, positions, frame)
+        used.update(font for _, _, _, _, font in pool.applied.values())
+    sizes = sorted(font[1] for font in used)
+    assert all(size % 2 == 0 for size in sizes)
+    # 0.7x .. 1.3x of 64 in steps of 2, plus the allocated size
+    assert len(used) <= (83 - 44) // 2 + 2
+    assert all(font is fonts.get(*font) for font in used)
+
+
+def test_menu_and_input_fonts_come_from_the_registry(screen):
+    menu = MyName.MenuLayer(screen)
+    MyName.draw_menu(menu, screen)
+    fonts = {spec[4] for spec in menu.applied.values() if len(spec) == 5}
+    assert fonts and all(font is MyName.ui_font(*font[1:]) for font in fonts)
+    assert MyName.TextInputLayer.FONT is MyName.ui_font(24, "bold")
@@ -0,0 +1,99 @@
+"""Tests for the precomputed frame-cycle cache."""
+# pylint: disable=missing-function-docstring
+import pytest
+
+import MyName
+from conftest import FakeScreen
+
+
+def draw_live(positions, frame):
+    pool = MyName.GlyphPool(FakeScreen())
+    pool.begin_frame()
+    MyName.get_animation()(pool, positions, frame)
+    pool.end_frame()
+    return {key: pool.applied[key] for key in pool.visible}
+
+
+def draw_cached(pool, positions, frame):
+    MyName.draw_frame(pool, positions, frame)
+    return {key: pool.applied[key] for key in pool.visible}
+
+
+@pytest.mark.parametrize("anim", sorted(MyName.ANIMATIONS))
+def test_replay_matches_live_drawing(anim):
+    MyName.ANIMATION_TYPE = anim
+    positions = MyName.prepare_letters("Hi there")
+    pool = MyName.GlyphPool(FakeScreen())
+    pool.allocate(positions)
+    for frame in (0, 4, 180, 356):
+        assert draw_cached(pool, positions, frame) == \
+            draw_live(positions, frame)
+
+
+def test_switching_reuses_cycles(monkeypatch):
+    cache = MyName.FrameCycleCache()
+    monkeypatch.setattr(MyName, "FRAME_CYCLES", cache)
+    positions = MyName.prepare_letters("Hello")
+    pool = MyName.GlyphPool(FakeScreen())
+    pool.allocate(positions)
+    for anim in ("wave", "bounce", "wave", "bounce"):
+        MyName.ANIMATION_TYPE = anim
+        for frame in range(0, 360, MyName.FRAME_STEP):
+            MyName.draw_frame(pool, positions, frame)
+    assert cache.stats()["misses"] == 2
+    assert cache.stats()["hits"] == 2
+
+
+def test_new_animation_or_font_step_gets_a_new_cycle(monkeypatch):
+    monkeypatch.setattr(MyName, "FRAME_CYCLES", MyName.FrameCycleCache())
+    monkeypatch.setitem(MyName.ANIMATIONS, "wave", MyName.ANIMATIONS["wave"])
+    monkeypatch.setattr(MyName.FONTS, "step", MyName.FONTS.step)
+    MyName.ANIMATION_TYPE = "wave"
+    positions = MyName.prepare_letters("Hello")
+    pool = MyName.GlyphPool(FakeScreen())
+    pool.allocate(positions)
+    MyName.draw_frame(pool, positions, 0)
+    wave = pool.cycle
+
+    # The README's way of changing an animation: register it again
+    MyName.ANIMATIONS["wave"] = MyName.Animation(
+        MyName.HueCycle(), MyName.Bounce())
+    MyName.draw_frame(pool, positions, 0)
+    assert pool.cycle is not wave
+    assert draw_cached(pool, positions, 8) == draw_live(positions, 8)
+
+    bounced = pool.cycle
+    MyName.FONTS.step = 8
+    MyName.draw_frame(pool, positions, 0)
+    assert pool.cycle is not bounced
+    assert MyName.FRAME_CYCLES.stats()["misses"] == 3
+
+
+def test_off_grid_frames_are_drawn_live(monkeypatch):
+    cache = MyName.FrameCycleCache()
+    monkeypatch.setattr(MyName, "FRAME_CYCLES", cache)
+    MyName.ANIMATION_TYPE = "spiral"
+    positions = MyName.prepare_letters("Hi")
+    pool = MyName.GlyphPool(FakeScreen())
+    assert draw_cached(pool, positions, 7) == draw_live(positions, 7)
+    assert cache.stats()["misses"] == 0
+
+
+def test_lru_eviction_respects_memory_cap():
+    positions = tuple(MyName.prepare_letters("Hello"))
+    total = sum(MyName.build_frame_cycle(positions, anim).nbytes
+                for anim in ("wave", "spiral", "bounce"))
+    cache = MyName.FrameCycleCache(max_bytes=total - 1)
+    for anim in ("wave", "spiral", "bounce"):
+        assert cache.get(positions, anim) is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.nbytes <= cache.max_bytes
+    assert cache.get(positions, "wave") is not None
+    assert cache.stats()["misses"] == 4
+
+
+def test_cycle_larger_than_cap_is_not_cached():
+    cache = MyName.FrameCycleCache(max_bytes=10)
+    positions = tuple(MyName.prepare_letters("Hello"))
+    assert cache.get(positions, "wave") is None
+    assert cache.stats()["entries"] == 0
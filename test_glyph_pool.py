@@ -0,0 +1,116 @@
+"""Tests for the persistent glyph item pool."""
+# pylint: disable=missing-function-docstring
+import MyName
+
+
+def visible(canvas):
+    return sorted((opts["text"], tuple(opts["coords"]), opts.get("fill"),
+                   opts.get("font")) for opts in canvas.items.values()
+                  if opts.get("state") != "hidden")
+
+
+def created(canvas):
+    return [call for call in canvas.calls if call[0].startswith("create")]
+
+
+def test_allocate_creates_one_item_per_glyph_layer(screen):
+    positions = MyName.prepare_letters("ab c")
+    pool = MyName.GlyphPool(screen)
+    pool.allocate(positions)
+    assert len(created(screen.cv)) == 3 * (MyName.DEPTH_LAYERS + 1)
+
+    pool.allocate(MyName.prepare_letters("ab c"))
+    assert len(created(screen.cv)) == 3 * (MyName.DEPTH_LAYERS + 1)
+
+
+def test_frames_only_reuse_items(screen):
+    positions = MyName.prepare_letters("Hello world")
+    pool = MyName.GlyphPool(screen)
+    pool.allocate(positions)
+    screen.cv.calls.clear()
+
+    for anim in ("3d_rotation", "wave", "spiral", "bounce",
+                 "rainbow_pulse", "3d_rotation"):
+        MyName.ANIMATION_TYPE = anim
+        for frame in range(0, 40, 4):
+            MyName.draw_frame(pool, positions, frame)
+    kinds = {call[0] for call in screen.cv.calls}
+    assert kinds <= {"coords", "itemconfigure"}
+
+
+def test_single_layer_effects_hide_depth_layers(screen):
+    positions = MyName.prepare_letters("Hi")
+    pool = MyName.GlyphPool(screen)
+    pool.allocate(positions)
+    MyName.draw_frame(pool, positions, 0)
+    assert len(screen.cv.visible_texts()) == 2 * (MyName.DEPTH_LAYERS + 1)
+
+    MyName.ANIMATION_TYPE = "wave"
+    MyName.draw_frame(pool, positions, 4)
+    assert screen.cv.visible_texts() == ["H", "i"]
+
+
+def test_size_change_reallocates(screen):
+    MyName.NAME = "Hi"
+    positions = MyName.prepare_letters("Hi")
+    pool = MyName.GlyphPool(screen)
+    menu = MyName.MenuLayer(screen)
+    pool.allocate(positions)
+    before = set(pool.items.values())
+
+    MyName.setup_main_keys(screen, menu, pool, positions)
+    screen.press("5")
+    screen.run_timers()
+    assert not before & set(pool.items.values())
+    assert all(item in screen.cv.items for item in pool.items.values())
+    assert not any(item in screen.cv.items for item in before)
+
+
+def test_sub_pixel_moves_are_skipped(screen):
+    layer = MyName.TextLayer(screen)
+    font = ("Arial", 20, "normal")
+    assert layer.put("a", (10.0, 5.0, "a", (1, 0, 0), font))
+    screen.cv.calls.clear()
+    assert not layer.put("a", (10.3, 4.8, "a", (1, 0, 0), font))
+    assert not screen.cv.calls
+    assert layer.put("a", (10.7, 5.0, "a", (1, 0, 0), font))
+    assert screen.cv.calls == [("coords", layer.items["a"])]
+    assert (layer.puts, layer.skipped) == (3, 1)
+    assert layer.skip_ratio() == 1 / 3
+    assert layer.skip_ratio(since=(3, 1)) == 0.0
+
+
+def test_incremental_frames_match_a_full_redraw(screen):
+    positions = MyName.prepare_letters("Hello world")
+    pool = MyName.GlyphPool(screen)
+    pool.allocate(positions)
+    for anim in ("3d_rotation", "wave", "spiral", "bounce", "rainbow_pulse"):
+        MyName.ANIMATION_TYPE = anim
+        for frame in range(0, 60, 7):
+            MyName.draw_frame(pool, positions, frame)
+            fresh_screen = type(screen)()
+            fresh = MyName.GlyphPool(fresh_screen)
+            fresh.allocate(positions)
+            MyName.draw_frame(fresh, positions, frame)
+            assert visible(screen.cv) == visible(fresh_screen.cv)
+
+
+def test_coordinates_round_like_tk(screen):
+    layer = MyName.TextLayer(screen)
+    for x, y in ((0.5, -0.5), (-1.5, 2.5), (12.49, -7.51)):
+        layer.put((x, y), (x, y, "x", (0, 0, 0), ("Arial", 9, "normal")))
+        cx, cy = layer.canvas_xy(x, y)
+        assert screen.cv.items[layer.items[(x, y)]]["coords"] == \
+            [MyName.tk_round(cx), MyName.tk_round(cy)]
+    assert [MyName.tk_round_image(v) for v in (-1.5, -0.5, 0.5, 1.5)] == \
+        [-2, -1, 1, 2]
+
+
+def test_bounce_rests_glyphs_between_frames(screen):
+    positions = MyName.prepare_letters("Hello brave new world")
+    pool = MyName.GlyphPool(screen)
+    pool.allocate(positions)
+    MyName.ANIMATION_TYPE = "bounce"
+    for frame in range(0, 360, 2):
+        MyName.draw_frame(pool, positions, frame)
+    assert pool.skipped > 0
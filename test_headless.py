@@ -0,0 +1,72 @@
+"""Tests for headless frame rendering and export."""
+# pylint: disable=missing-function-docstring
+import subprocess
+import sys
+import types
+
+import pytest
+
+import MyName
+
+
+def test_render_frames_is_lazy_svg():
+    frames = MyName.render_frames("Hi", 48, "wave", frames=range(0, 12, 4))
+    assert isinstance(frames, types.GeneratorType)
+    svgs = list(frames)
+    assert len(svgs) == 3
+    assert all(svg.startswith("<svg") and svg.count("<text") == 2
+               for svg in svgs)
+    assert svgs[0] != svgs[1]
+
+
+def test_render_rgb_buffer():
+    (rgb,) = MyName.render_frames("Hi", fmt="rgb", frames=[0],
+                                  width=200, height=100)
+    assert len(rgb) == 200 * 100 * 3
+    assert any(rgb)
+
+
+def test_unknown_format_rejected():
+    with pytest.raises(ValueError):
+        next(MyName.render_frames("Hi", fmt="bmp"))
+
+
+def test_headless_rendering_does_not_import_tk():
+    code = ("import sys, MyName; "
+            "list(MyName.render_frames('Hi', fmt='rgb', frames=[0, 2])); "
+            "print('turtle' in sys.modules or 'tkinter' in sys.modules)")
+    result = subprocess.run([sys.executable, "-c", code], check=True,
+                            capture_output=True, text=True)
+    assert result.stdout.strip() == "False"
+
+
+def test_ppm_stream_export(tmp_path):
+    out = tmp_path / "frames.ppm"
+    MyName.main(["--export", "ppm", "--text", "Hi", "--frames", "3",
+                 "--width", "40", "--height", "20", "-o", str(out)])
+    data = out.read_bytes()
+    header = b"P6\n40 20\n255\n"
+    assert data.count(header) == 3
+    assert len(data) == 3 * (len(header) + 40 * 20 * 3)
+
+
+def test_svg_sequence_export(tmp_path):
+    pattern = str(tmp_path / "frame%02d.svg")
+    MyName.main(["--export", "svg", "--frames", "2", "-o", pattern])
+    assert sorted(p.name for p in tmp_path.iterdir()) == \
+        ["frame00.svg", "frame01.svg"]
+
+
+def test_gif_export_round_trips(tmp_path):
+    image_module = pytest.importorskip("PIL.Image")
+    out = tmp_path / "anim.gif"
+    MyName.main(["--export", "gif", "--text", "Hey", "--type", "bounce",
+                 "--frames", "4", "--width", "300", "--height", "150",
+                 "-o", str(out)])
+    layout = tuple(MyName.prepare_letters("Hey"))
+    with image_module.open(out) as image:
+        assert image.n_frames == 4
+        image.seek(2)
+        expected = MyName.render_rgb(
+            MyName.frame_draw_list(layout, "bounce", 8), 300, 150)
+        assert image.convert("RGB").tobytes() == bytes(expected)
@@ -0,0 +1,64 @@
+"""Tests for the NumPy frame kernels against the scalar animation pass."""
+# pylint: disable=missing-function-docstring
+import pytest
+
+import MyName
+
+pytest.importorskip("numpy")
+
+TEXTS = ["Hi", "Hello brave new world", "a  b", ""]
+
+
+class Capture:  # pylint: disable=too-few-public-methods
+    """Glyph pool stand-in that records every placed command."""
+
+    def __init__(self):
+        self.commands = []
+
+    def put(self, key, spec, align="center"):
+        self.commands.append((key, spec, align))
+
+
+def replayed(cycle, frame):
+    capture = Capture()
+    cycle.replay(capture, frame)
+    return capture.commands
+
+
+@pytest.mark.parametrize("anim", sorted(MyName.ANIMATIONS))
+@pytest.mark.parametrize("text", TEXTS)
+def test_kernels_match_scalar_pass(anim, text, monkeypatch):
+    positions = tuple(MyName.prepare_letters(text))
+    vectorized = MyName.build_frame_cycle(positions, anim)
+    monkeypatch.setattr(MyName, "load_numpy", lambda: False)
+    scalar = MyName.build_frame_cycle(positions, anim)
+    assert vectorized.keys == scalar.keys
+    assert vectorized.chars == scalar.chars
+    for frame in range(0, 360, MyName.FRAME_STEP):
+        assert replayed(vectorized, frame) == replayed(scalar, frame)
+
+
+@pytest.mark.parametrize("quality", range(1, len(MyName.QUALITY_LEVELS)))
+def test_reduced_quality_kernel_matches_scalar(quality, monkeypatch):
+    positions = tuple(MyName.prepare_letters("Hello world"))
+    vectorized = MyName.build_frame_cycle(positions, "3d_rotation",
+                                          quality=quality)
+    monkeypatch.setattr(MyName, "load_numpy", lambda: False)
+    scalar = MyName.build_frame_cycle(positions, "3d_rotation",
+                                      quality=quality)
+    assert vectorized.keys == scalar.keys
+    for frame in range(0, 360, MyName.FRAME_STEP):
+        assert replayed(vectorized, frame) == replayed(scalar, frame)
+
+
+def test_stacked_effects_kernel_matches_scalar(monkeypatch):
+    stack = MyName.Animation(MyName.HueCycle(), MyName.Wave(),
+                             MyName.Pulse(amount=0.1), MyName.Extrude())
+    monkeypatch.setitem(MyName.ANIMATIONS, "wavy_3d", stack)
+    positions = tuple(MyName.prepare_letters("Hey there"))
+    vectorized = MyName.build_frame_cycle(positions, "wavy_3d", quality=2)
+    monkeypatch.setattr(MyName, "load_numpy", lambda: False)
+    scalar = MyName.build_frame_cycle(positions, "wavy_3d", quality=2)
+    assert vectorized.keys == scalar.keys
+    for frame in range(0, 360, MyName.FRAME_STEP):
+        assert replayed(vectorized, frame) == replayed(scalar, frame)
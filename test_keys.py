@@ -0,0 +1,82 @@
+"""Tests for the key router: one binding, dispatch tables, coalescing."""
+# pylint: disable=missing-function-docstring,redefined-outer-name
+import pytest
+
+import MyName
+from conftest import FakeTurtle
+
+
+def test_held_keys_coalesce_while_paused(screen, studio):
+    MyName.draw_menu(studio[0], screen)
+    screen.cv.calls.clear()
+    # Auto-repeat of a held size key and a burst of animation keys
+    screen.press(*"1111122222", *"abcdeABCDE")
+    assert len(screen.timers) == 1
+    assert not screen.cv.calls  # nothing is drawn until the flush
+    screen.run_timers()
+
+    assert MyName.FONT_SIZE == 48
+    assert MyName.ANIMATION_TYPE == "rainbow_pulse"
+    assert MyName.KEYS.stats() == {"events": 20, "relayouts": 1,
+                                   "refreshes": 1}
+    assert "Size: 48" in " ".join(screen.cv.visible_texts())
+
+
+def test_keys_apply_once_per_frame_while_animating(screen, studio):
+    menu, pool, positions = studio
+    MyName.IS_ANIMATING = True
+    MyName.animate(screen, pool, menu, positions, frame=0)
+    screen.timers.clear()
+
+    screen.press(*"5454545")
+    # No extra timer: the next animation tick applies the change
+    assert not screen.timers
+    assert pool.layout[0] != tuple(MyName.prepare_letters("Hi"))
+    MyName.animate(screen, pool, menu, positions)
+    assert MyName.KEYS.relayouts == 1
+    assert pool.layout[0] == tuple(positions)
+    assert positions == MyName.prepare_letters("Hi", 96)
+
+
+@pytest.mark.usefixtures("studio")
+def test_unchanged_settings_request_nothing(screen):
+    screen.press("3", "a", "F1", "z")
+    assert MyName.KEYS.stats()["events"] == 4
+    assert not screen.timers
+
+
+def test_modes_swap_tables_without_rebinding(screen, studio, monkeypatch):
+    monkeypatch.setattr(MyName, "INPUT_TURTLE", FakeTurtle())
+    menu, pool, positions = studio
+    bind_calls = []
+    monkeypatch.setattr(screen.cv, "bind",
+                        lambda *args: bind_calls.append(args))
+    for name in ("Ab", "Cd"):
+        MyName.change_name(screen, menu, pool, positions)
+        assert MyName.KEYS.mode == "input"
+        screen.press("1")  # typed, not a size key
+        screen.press(*name, "Return")
+        assert MyName.KEYS.mode == "menu"
+        assert MyName.NAME == "1" + name
+    assert not bind_calls
+
+
+@pytest.mark.parametrize("key", ["5", "s"])
+def test_relayout_while_paused_keeps_the_frozen_text(screen, studio,
+                                                     monkeypatch, key):
+    now = [0.0]
+    monkeypatch.setattr(MyName, "SCHEDULER",
+                        MyName.FrameScheduler(clock=lambda: now[0]))
+    menu, pool, positions = studio
+    MyName.IS_ANIMATING = True
+    MyName.animate(screen, pool, menu, positions, frame=0)
+    now[0] = 3.0
+    MyName.animate(screen, pool, menu, positions)
+    screen.press("m")
+    screen.timers.clear()
+    # A new size or layout allocates new, hidden glyph items
+    screen.press(key)
+    screen.run_timers()
+    assert MyName.KEYS.relayouts == 1
+    texts = screen.cv.visible_texts()
+    assert "H" in texts and "i" in texts
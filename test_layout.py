@@ -0,0 +1,90 @@
+"""Tests for the font-metric-aware text layout."""
+# pylint: disable=missing-function-docstring
+import pytest
+
+import MyName
+
+FONT = ("Arial", 10, "bold")
+
+
+class Measure:  # pylint: disable=too-few-public-methods
+    """Proportional test font: 'i' is narrow, "AV" kerns by -3."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, font, text):
+        self.calls += 1
+        width = sum(2 if ch == "i" else font[1] for ch in text)
+        return width - 3 * text.count("AV")
+
+
+def layout(max_width=550):
+    measure = Measure()
+    return MyName.TextLayout(MyName.GlyphMetrics(measure), max_width), measure
+
+
+def test_estimate_keeps_monospace_spacing():
+    positions = MyName.prepare_letters("Hi you", 50)
+    xs = [x for _, x, _ in positions]
+    assert [ch for ch, _, _ in positions] == list("Hi you")
+    assert xs == pytest.approx([-75, -45, -15, 15, 45, 75])
+
+
+def test_proportional_advances_and_kerning():
+    text_layout, _ = layout()
+    positions = text_layout.positions("AVi", FONT)
+    xs = [x for _, x, _ in positions]
+    # A (10) kerned -3 against V (10), then a narrow i (2): 19 wide
+    assert xs == pytest.approx([-9.5 + 5, -9.5 + 12, -9.5 + 18])
+
+
+def test_metrics_are_measured_once_per_glyph():
+    text_layout, measure = layout()
+    text_layout.positions("aaa aaa", FONT)
+    calls = measure.calls
+    text_layout.positions("aaa aaa aaa", FONT)
+    assert measure.calls == calls
+
+
+def test_wraps_proportional_text():
+    text_layout, _ = layout(max_width=50)
+    positions = text_layout.positions("iii wide iii", FONT)
+    rows = sorted({y for _, _, y in positions}, reverse=True)
+    # "iii" (6) + space (10) + "wide" (32) fits; the second "iii" wraps
+    assert len(rows) == 2
+    assert [ch for ch, _, y in positions if y == rows[1]] == list("iii")
+
+
+def test_edits_rewrap_from_the_changed_line():
+    text_layout, _ = layout(max_width=45)   # one "abc" per line
+    words = ["abc"] * 8
+    text_layout.positions(" ".join(words), FONT)
+    assert text_layout.rewrapped == 8
+    # The old last line and the new one
+    text_layout.positions(" ".join(words + ["d"]), FONT)
+    assert text_layout.rewrapped == 2
+    # Lines from the one before the edited word onwards
+    text_layout.positions(" ".join(words[:4] + ["x"] + words[5:]), FONT)
+    assert text_layout.rewrapped == 5
+
+
+def test_switching_back_to_a_size_reuses_its_lines():
+    text_layout, measure = layout()
+    small, large = ("Arial", 10, "bold"), ("Arial", 20, "bold")
+    first = text_layout.positions("Hello world", small)
+    text_layout.positions("Hello world", large)
+    calls = measure.calls
+    assert text_layout.positions("Hello world", small) == first
+    assert text_layout.rewrapped == 0
+    assert measure.calls == calls
+
+
+def test_incremental_result_matches_fresh_layout():
+    text_layout, _ = layout(max_width=80)
+    text = ""
+    for word in "the quick brown fox jumps over the lazy dog".split():
+        text = f"{text} {word}".strip()
+        fresh, _ = layout(max_width=80)
+        assert text_layout.positions(text, FONT) == fresh.positions(text,
+                                                                    FONT)
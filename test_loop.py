@@ -0,0 +1,65 @@
+"""Tests for the single-owner animation loop."""
+# pylint: disable=missing-function-docstring,redefined-outer-name
+import random
+
+import pytest
+
+import MyName
+
+
+@pytest.fixture
+def running(screen, tk, studio):
+    """The studio with LOOP ticking on the virtual Tk clock."""
+    menu, pool, positions = studio
+    MyName.IS_ANIMATING = True
+    MyName.LOOP.start(screen, pool, menu, positions)
+    return tk
+
+
+def test_one_chain_ticks_at_the_target_rate(running):
+    tk = running
+    tk.run_until(4.0)
+    assert tk.pending(MyName.LOOP.tick) == 1
+    assert MyName.LOOP.ticks == pytest.approx(4 * MyName.SCHEDULER.rate,
+                                              abs=1)
+
+
+def test_restarting_replaces_the_pending_tick(screen, running, studio):
+    tk = running
+    menu, pool, positions = studio
+    generation = MyName.LOOP.generation
+    for _ in range(5):
+        MyName.LOOP.start(screen, pool, menu, positions)
+        MyName.animate(screen, pool, menu, positions)
+    assert tk.pending(MyName.LOOP.tick) == 1
+    assert MyName.LOOP.generation == generation + 5
+
+
+@pytest.mark.usefixtures("running")
+def test_tick_after_cancel_does_not_draw():
+    MyName.LOOP.cancel()
+    assert MyName.LOOP.active() == 0
+    drawn = MyName.SCHEDULER.drawn
+    MyName.LOOP.tick()  # e.g. already dispatched when cancel() ran
+    assert MyName.SCHEDULER.drawn == drawn
+    assert MyName.LOOP.stats()["stale"] == 1
+
+
+def test_hammering_keys_keeps_a_single_chain(screen, running):
+    tk = running
+    rng = random.Random(19)
+    keys = ["m"] * 4 + ["space"] * 4 + ["n", "Return", "1", "a", "x"]
+    animating_time = 0.0
+    ticks = MyName.LOOP.ticks
+    for _ in range(400):
+        screen.press(rng.choice(keys))
+        assert tk.pending(MyName.LOOP.tick) == int(MyName.IS_ANIMATING)
+        gap = rng.choice((0.0, 0.001, 0.01, 0.05, 0.2))
+        if MyName.IS_ANIMATING:
+            animating_time += gap
+        tk.run_until(tk.now + gap)
+        assert tk.pending(MyName.LOOP.tick) == int(MyName.IS_ANIMATING)
+    # Ticks fire at the frame rate while animating, never faster
+    assert MyName.LOOP.ticks - ticks <= \
+        animating_time * MyName.SCHEDULER.rate + 1
+    assert MyName.LOOP.stats()["stale"] == 0
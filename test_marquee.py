@@ -0,0 +1,148 @@
+"""Tests for the scrolling marquee mode and viewport culling."""
+# pylint: disable=missing-function-docstring
+import pytest
+
+import MyName
+from conftest import FakeTurtle
+
+LONG_TEXT = "scrolling signage message " * 200
+
+
+class Capture:  # pylint: disable=too-few-public-methods
+    """Glyph pool stand-in that records every placed command."""
+
+    def __init__(self):
+        self.commands = {}
+
+    def put(self, key, spec, align="center"):
+        self.commands[key] = (spec, align)
+
+
+def test_only_glyphs_near_the_viewport_are_yielded():
+    view = MyName.MarqueeView(LONG_TEXT)
+    view.scroll_to(2000)
+    glyphs = list(view.indexed())
+    left, right = MyName.VIEWPORT
+    assert 0 < len(glyphs) <= view.slots < len(view) // 10
+    assert all(left - view.margin <= x <= right + view.margin
+               for _, (_, x, _) in glyphs)
+    first, end = view.visible_range()
+    assert [i for i, _ in glyphs] == list(range(first, end))
+    # Neighbours just outside the range are out of view
+    assert view.xs[first - 1] + view.shift < left - view.margin
+    assert view.xs[end] + view.shift > right + view.margin
+
+
+def test_text_enters_from_the_right_and_loops():
+    view = MyName.MarqueeView("Hello")
+    assert not list(view.indexed())
+    view.scroll_to(view.period / 2)
+    assert [ch for _, (ch, _, _) in view.indexed()] == list("Hello")
+    view.scroll_to(view.period + view.period / 2)
+    assert [ch for _, (ch, _, _) in view.indexed()] == list("Hello")
+
+
+def test_effects_keep_global_indices():
+    text = "abcdefghij" * 50
+    view = MyName.MarqueeView(text)
+    view.scroll_to(1000)
+    marquee = Capture()
+    MyName.ANIMATIONS["wave"](marquee, view, 40)
+    # Same glyphs drawn from the full single-line layout, shifted
+    full = Capture()
+    shifted = [(ch, x + view.shift, y) for ch, x, y in view.positions]
+    MyName.ANIMATIONS["wave"](full, shifted, 40)
+    assert marquee.commands
+    assert all(full.commands[key] == command
+               for key, command in marquee.commands.items())
+
+
+def test_slots_never_collide():
+    view = MyName.MarqueeView("i" * 300 + " W" * 100)
+    for offset in range(0, int(view.period), 37):
+        view.scroll_to(offset)
+        indices = [i for i, _ in view.indexed()]
+        assert len({i % view.slots for i in indices}) == len(indices)
+
+
+@pytest.mark.parametrize("length", [200, 5000])
+def test_frame_cost_depends_on_the_viewport_only(screen, length):
+    MyName.NAME = ("marquee " * length)[:length]
+    MyName.ANIMATION_TYPE = "3d_rotation"
+    positions = []
+    pool = MyName.GlyphPool(screen)
+    MyName.MARQUEE = MyName.MarqueeView(MyName.NAME)
+    MyName.relayout(pool, positions)
+    created = len(screen.cv.items)
+    assert created == MyName.MARQUEE.slots * (MyName.DEPTH_LAYERS + 1) + 2
+    assert created < 400 * (MyName.DEPTH_LAYERS + 1) + 2
+
+    MyName.MARQUEE.scroll_to(500)
+    screen.cv.calls.clear()
+    MyName.draw_frame(pool, MyName.MARQUEE, 0)
+    assert len(screen.cv.items) == created
+    assert len(screen.cv.calls) <= 3 * created
+
+
+def test_s_key_switches_layout(screen):
+    MyName.NAME = "Hello world"
+    positions = MyName.prepare_letters(MyName.NAME)
+    menu = MyName.MenuLayer(screen)
+    pool = MyName.GlyphPool(screen)
+    pool.allocate(positions)
+    MyName.setup_main_keys(screen, menu, pool, positions)
+    MyName.draw_menu(menu, screen)
+    assert "Layout: wrapped" in screen.cv.visible_texts()
+
+    screen.press("s")
+    screen.run_timers()
+    assert isinstance(MyName.MARQUEE, MyName.MarqueeView)
+    assert "Layout: marquee" in screen.cv.visible_texts()
+    MyName.IS_ANIMATING = True
+    MyName.animate(screen, pool, menu, positions, frame=0)
+    # The text starts just right of the viewport
+    assert not pool.visible
+
+    screen.press("s")
+    assert MyName.MARQUEE is None
+    # While animating, the relayout waits for the next frame
+    MyName.animate(screen, pool, menu, positions)
+    assert pool.layout[0] == tuple(positions)
+
+
+def test_glyphs_are_masked_beside_the_viewport(screen):
+    MyName.NAME = "Hello"
+    MyName.FONT_SIZE = 64
+    positions = []
+    pool = MyName.GlyphPool(screen)
+    menu = MyName.MenuLayer(screen)
+    MyName.draw_menu(menu, screen)
+    MyName.MARQUEE = MyName.MarqueeView(MyName.NAME)
+    MyName.relayout(pool, positions)
+    left, right = MyName.VIEWPORT
+    masks = [screen.cv.items[item] for item in pool.masks]
+    assert [mask["coords"][0::2] for mask in masks] == [
+        [left - 2 * MyName.MARQUEE.margin - 1, left - 1],
+        [right - 1, right + 2 * MyName.MARQUEE.margin - 1]]
+    # Stacked glyphs, then masks, then the menu
+    kinds = [opts.get("tags") or opts["kind"]
+             for opts in screen.cv.items.values()]
+    assert kinds.index("rectangle") == kinds.count("glyph")
+    assert kinds[-1] != "glyph"
+
+    MyName.MARQUEE = None
+    MyName.relayout(pool, positions)
+    assert all(mask["state"] == "hidden" for mask in masks)
+
+
+def test_marquee_input_is_not_capped(screen):
+    entered = []
+    MyName.get_text_input(screen, FakeTurtle(), entered.append)
+    screen.press(*"a" * 60)
+    MyName.MARQUEE = MyName.MarqueeView("")
+    screen.press(*"b" * 60)
+    screen.run_timers(MyName.INPUT_REPAINT_MS)
+    # Only the end of the text is shown on the input screen
+    assert "..." + "b" * MyName.INPUT_MAX_CHARS in screen.cv.visible_texts()
+    screen.press("Return")
+    assert entered == ["a" * MyName.INPUT_MAX_CHARS + "b" * 60]
@@ -0,0 +1,64 @@
+"""Tests for the retained-mode side menu."""
+# pylint: disable=missing-function-docstring
+import MyName
+
+
+def test_menu_built_once(screen):
+    MyName.NAME = "Hello"
+    menu = MyName.MenuLayer(screen)
+    MyName.draw_menu(menu, screen)
+    created = len(screen.cv.calls)
+    assert created == len(MyName.menu_lines()) + 2  # texts + separators
+
+    MyName.draw_menu(menu, screen)
+    assert len(screen.cv.calls) == created
+    assert screen.updates == 0
+
+
+def test_menu_only_touches_changed_lines(screen):
+    MyName.NAME = "Hello"
+    menu = MyName.MenuLayer(screen)
+    MyName.draw_menu(menu, screen)
+    screen.cv.calls.clear()
+
+    MyName.FONT_SIZE = 96
+    MyName.draw_menu(menu, screen)
+    assert screen.cv.calls == [("itemconfigure", menu.items["size"])]
+    assert "Size: 96px" in screen.cv.visible_texts()
+    # Unchanged lines are skipped before their position is snapped
+    assert menu.skipped == menu.puts - len(MyName.menu_lines()) - 1
+
+
+def test_menu_is_rebuilt_after_delete(screen):
+    menu = MyName.MenuLayer(screen)
+    MyName.draw_menu(menu, screen)
+    menu.delete_all()
+    MyName.draw_menu(menu, screen)
+    assert len(screen.cv.visible_texts()) == len(MyName.menu_lines())
+
+
+def test_menu_confirmation_swaps_settings_lines(screen):
+    menu = MyName.MenuLayer(screen)
+    MyName.draw_menu(menu, screen)
+    MyName.draw_menu(menu, screen, show_confirmation=True,
+                     confirm_msg="Saved!")
+    texts = screen.cv.visible_texts()
+    assert "Saved!" in texts
+    assert not any(text.startswith("Type:") for text in texts)
+
+    MyName.draw_menu(menu, screen)
+    texts = screen.cv.visible_texts()
+    assert "Saved!" not in texts
+    assert any(text.startswith("Type:") for text in texts)
+
+
+def test_animate_flushes_once_per_frame(screen):
+    MyName.NAME = "Hi"
+    MyName.IS_ANIMATING = True
+    menu = MyName.MenuLayer(screen)
+    pool = MyName.GlyphPool(screen)
+    positions = MyName.prepare_letters("Hi")
+    pool.allocate(positions)
+    MyName.animate(screen, pool, menu, positions)
+    assert screen.updates == 1
+    assert len(screen.timers) == 1
@@ -0,0 +1,112 @@
+"""Tests for the frame pipeline's worker, backpressure and cancellation."""
+# pylint: disable=missing-function-docstring,redefined-outer-name
+import time
+
+import pytest
+
+import MyName
+from conftest import FakeScreen, FakeTurtle, wired_studio
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "pipeline worker timed out"
+        time.sleep(0.001)
+
+
+def glyphs(pool):
+    items = [pool.canvas.items[item] for item in pool.items.values()]
+    return sorted((opts["text"], tuple(opts["coords"]), opts.get("fill"),
+                   opts.get("font")) for opts in items
+                  if opts.get("state") != "hidden")
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    pipe = MyName.FramePipeline(depth=3)
+    monkeypatch.setattr(MyName, "PIPELINE", pipe)
+    yield pipe
+    pipe.close()
+
+
+def inputs(layout, animation_type="wave"):
+    return (tuple(layout), animation_type, MyName.FONT_SIZE,
+            MyName.DEPTH_LAYERS, 0, MyName.PALETTE)
+
+
+def test_worker_fills_the_buffer_and_waits(pipeline):
+    state = inputs(MyName.prepare_letters("Hello"))
+    assert pipeline.take(state, 0, MyName.SCHEDULER.frame_at(0)) is None
+    wait_until(lambda: pipeline.waits)
+    time.sleep(0.02)
+    assert pipeline.stats()["depth"] == pipeline.produced == 3
+
+    for index in (1, 2):
+        frame = MyName.SCHEDULER.frame_at(index)
+        assert pipeline.take(state, index, frame) == \
+            MyName.produce_frame(state, frame)
+    assert (pipeline.applied, pipeline.stalls) == (2, 1)
+    wait_until(lambda: pipeline.produced == 5)
+
+
+def test_dropped_frames_are_discarded(pipeline):
+    state = inputs(MyName.prepare_letters("Hi"))
+    pipeline.take(state, 0, 0)
+    wait_until(lambda: len(pipeline.ready) == 3)
+    frame = MyName.SCHEDULER.frame_at(3)
+    assert pipeline.take(state, 3, frame) == \
+        MyName.produce_frame(state, frame)
+    assert pipeline.discarded == 2
+    # Beyond the buffer: stall, then restart right after that index
+    assert pipeline.take(state, 9, MyName.SCHEDULER.frame_at(9)) is None
+    wait_until(lambda: len(pipeline.ready) == 3)
+    assert [entry[0] for entry in pipeline.ready] == [10, 11, 12]
+
+
+def test_changed_inputs_restart_the_worker(pipeline):
+    layout = MyName.prepare_letters("Hi")
+    pipeline.take(inputs(layout), 0, 0)
+    wait_until(lambda: len(pipeline.ready) == 3)
+    spiral = inputs(layout, "spiral")
+    assert pipeline.take(spiral, 1, MyName.SCHEDULER.frame_at(1)) is None
+    wait_until(lambda: len(pipeline.ready) == 3)
+    frame = MyName.SCHEDULER.frame_at(2)
+    assert pipeline.take(spiral, 2, frame) == \
+        MyName.produce_frame(spiral, frame)
+
+
+def test_keys_cancel_queued_frames(screen, pipeline, monkeypatch):
+    monkeypatch.setattr(MyName, "INPUT_TURTLE", FakeTurtle())
+    menu, pool, positions = wired_studio(screen)
+    MyName.IS_ANIMATING = True
+    MyName.animate(screen, pool, menu, positions, frame=0)
+    wait_until(lambda: len(pipeline.ready) == 3)
+
+    screen.press("5")
+    assert not pipeline.ready and pipeline.state is None
+    screen.press("b")
+    screen.press("n")
+    assert pipeline.stats()["cancels"] == 3
+
+
+def test_pipelined_animation_matches_direct_drawing(screen, pipeline,
+                                                    monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(MyName, "SCHEDULER",
+                        MyName.FrameScheduler(clock=lambda: now[0]))
+    menu, pool, positions = wired_studio(screen, "Hello world")
+    direct = MyName.GlyphPool(FakeScreen())
+    direct.allocate(positions)
+    MyName.IS_ANIMATING = True
+    for anim in ("3d_rotation", "bounce", "rainbow_pulse"):
+        MyName.ANIMATION_TYPE = anim
+        MyName.animate(screen, pool, menu, positions, frame=0)
+        for _ in range(12):
+            wait_until(lambda: len(pipeline.ready) == pipeline.depth)
+            now[0] += 1 / MyName.SCHEDULER.rate
+            MyName.animate(screen, pool, menu, positions)
+            MyName.draw_frame(direct, positions, MyName.SCHEDULER.frame_at(
+                MyName.SCHEDULER.index))
+            assert glyphs(pool) == glyphs(direct)
+    assert pipeline.stalls == 3 and pipeline.applied == 36
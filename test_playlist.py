@@ -0,0 +1,108 @@
+"""Tests for the kiosk playlist, its watchdog and a compressed-time soak."""
+# pylint: disable=missing-function-docstring,redefined-outer-name
+import gc
+import io
+
+import pytest
+
+import MyName
+
+ENTRIES = [("Hello", 64, "3d_rotation", 300),
+           ("Welcome to the lobby of our building", 48, "wave", 300),
+           ("Sale", 96, "rainbow_pulse", 300),
+           ("Open 9-5", 32, "spiral", 300),
+           ("Hi", 80, "bounce", 300)]
+SOAK_FPS = 0.25  # one frame per 4 virtual seconds: a day is 21600 frames
+
+
+def test_rows_become_entries():
+    rows = [{"text": "Hi", "size": "", "type": "", "seconds": ""},
+            {"text": "Sale", "size": "96", "type": "wave", "seconds": "7.5"}]
+    assert MyName.read_playlist(rows, 48, "bounce", 20) == [
+        ("Hi", 48, "bounce", 20.0), ("Sale", 96, "wave", 7.5)]
+    with pytest.raises(ValueError):
+        MyName.read_playlist([{"text": "Hi", "type": "sparkle"}])
+    with pytest.raises(ValueError):
+        MyName.Playlist([])
+
+
+@pytest.mark.parametrize("field, value", [("size", "0"), ("size", "-48"),
+                                          ("seconds", "0"),
+                                          ("seconds", "-5"), ("size", "big")])
+def test_bad_rows_are_rejected_with_their_line(field, value):
+    rows = [{"text": "Hi"}, dict({"text": "Sale"}, **{field: value})]
+    with pytest.raises(ValueError, match="playlist line 3: "):
+        MyName.read_playlist(rows)
+
+
+def test_entries_switch_on_schedule(screen, tk):
+    MyName.SCHEDULER.fps = SOAK_FPS
+    MyName.start_playlist(screen, ENTRIES[:3])
+    seen = []
+    for minute in range(1, 17):
+        tk.run_until(minute * 60)
+        seen.append((MyName.NAME, MyName.FONT_SIZE, MyName.ANIMATION_TYPE))
+        assert MyName.IS_ANIMATING and MyName.LOOP.active() == 1
+    assert [entry[:3] for entry in ENTRIES[:3]] == \
+        sorted(set(seen), key=seen.index)
+    assert seen[4][0] == "Welcome to the lobby of our building"
+    assert seen[15][0] == "Hello"  # second pass after 15 minutes
+    assert MyName.PLAYLIST.switches == 4
+    assert MyName.PLAYLIST.watchdog.baseline is not None
+    # Keys cannot stop the show
+    screen.press("n", "m", "space", "1")
+    assert MyName.KEYS.mode == "kiosk" and MyName.IS_ANIMATING
+    assert MyName.FONT_SIZE == 64
+
+
+def test_watchdog_raises_alarms(screen, monkeypatch):
+    rss = [100]
+    out = io.StringIO()
+    watchdog = MyName.Watchdog(screen.cv, rss=lambda: rss[0], out=out)
+    monkeypatch.setattr(MyName, "FRAME_CYCLES", MyName.FrameCycleCache())
+    now = [0.0]
+    monkeypatch.setattr(MyName, "SCHEDULER",
+                        MyName.FrameScheduler(clock=lambda: now[0]))
+    screen.cv.create_text(0, 0, text="a")
+    watchdog.sample()
+    watchdog.settle()
+    assert watchdog.baseline == {"rss": 100, "items": 1}
+
+    MyName.FRAME_CYCLES.cycles[("key",)] = MyName.FrameCycle()
+    rss[0] = 100 + MyName.WATCHDOG_RSS_GROWTH + 1
+    screen.cv.create_text(0, 0, text="b")
+    MyName.IS_ANIMATING = True
+    now[0] = 10.0  # no frame drawn for ten seconds
+    record = watchdog.sample()
+    assert record["drift"] == 1.0 and record["items"] == 2
+    assert watchdog.stats()["alarms"] == {"rss": 1, "items": 1, "drift": 1}
+    assert not MyName.FRAME_CYCLES.cycles
+    assert out.getvalue().count("watchdog:") == 3
+
+
+def test_a_day_of_playlist_keeps_memory_bounded(screen, tk):
+    """Soak: 24 virtual hours of cycling, memory and items must stay flat."""
+    MyName.SCHEDULER.fps = SOAK_FPS
+    MyName.start_playlist(screen, ENTRIES)
+    watchdog = MyName.PLAYLIST.watchdog
+    objects = None
+    for hour in range(1, 25):
+        tk.run_until(hour * 3600)
+        screen.cv.calls.clear()  # the fake canvas logs every call
+        if hour == 2:
+            gc.collect()
+            objects = len(gc.get_objects())
+    gc.collect()
+
+    assert MyName.PLAYLIST.switches == 24 * 3600 // 300 + 1
+    assert MyName.SCHEDULER.drawn == pytest.approx(24 * 3600 * SOAK_FPS,
+                                                   rel=0.01)
+    assert watchdog.stats()["alarms"] == {"rss": 0, "items": 0, "drift": 0}
+    # Python objects, canvas items and pending timers stay bounded
+    assert len(gc.get_objects()) - objects < 1000
+    assert max(record["items"] for record in watchdog.samples) <= \
+        watchdog.baseline["items"]
+    assert len(tk.queue) <= 3
+    if watchdog.baseline["rss"] is not None:
+        assert max(record["rss"] for record in watchdog.samples) < \
+            watchdog.baseline["rss"] + 16 * 2**20
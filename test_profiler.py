@@ -0,0 +1,93 @@
+"""Tests for the optional per-frame profiler."""
+# pylint: disable=missing-function-docstring,redefined-outer-name
+import io
+import json
+
+import MyName
+
+
+def run_frames(screen, menu, pool, positions, count):
+    MyName.IS_ANIMATING = True
+    for frame in range(count):
+        screen.timers.clear()
+        MyName.animate(screen, pool, menu, positions,
+                       frame=frame * MyName.FRAME_STEP)
+
+
+def test_disabled_profiler_leaves_loop_untouched(screen, studio,
+                                                 monkeypatch):
+    profiler = MyName.FrameProfiler()
+    monkeypatch.setattr(MyName, "PROFILER", profiler)
+    menu, pool, positions = studio
+    run_frames(screen, menu, pool, positions, 3)
+    assert not profiler.records
+    assert pool.canvas is screen.cv
+
+
+def test_records_phases_and_canvas_counts(screen, studio, monkeypatch):
+    profiler = MyName.FrameProfiler()
+    monkeypatch.setattr(MyName, "PROFILER", profiler)
+    menu, pool, positions = studio
+    profiler.start(pool, menu)
+    run_frames(screen, menu, pool, positions, 2)
+    first, second = profiler.records
+    assert set(first) >= {"frame", "draw_ms", "menu_ms", "update_ms",
+                          "total_ms", "created", "deleted", "configured",
+                          "skip_ratio"}
+    assert 0.0 <= second["skip_ratio"] <= 1.0
+    # The first frame builds the menu, the second only moves glyphs
+    assert first["created"] == len(MyName.menu_lines()) + 2
+    assert second["created"] == second["deleted"] == 0
+    assert second["configured"] > 0
+
+    profiler.stop()
+    assert pool.canvas is screen.cv and menu.canvas is screen.cv
+    run_frames(screen, menu, pool, positions, 1)
+    assert len(profiler.records) == 2
+
+
+def test_ring_buffer_and_percentiles():
+    ticks = iter(range(10**6))
+    profiler = MyName.FrameProfiler(capacity=100, clock=ticks.__next__)
+    for frame in range(150):
+        profiler.begin(frame)
+        for phase in profiler.PHASES:
+            profiler.mark(phase)
+        profiler.end()
+    assert len(profiler.records) == 100
+    assert profiler.records[0]["frame"] == 50
+    # Each phase takes one clock tick of one second
+    assert profiler.percentiles() == {"p50": 3000.0, "p95": 3000.0,
+                                      "p99": 3000.0}
+    assert profiler.summary()["draw_ms"] == 1000.0
+
+
+def test_percentiles_use_nearest_rank():
+    profiler = MyName.FrameProfiler()
+    profiler.records.extend({"total_ms": float(ms)} for ms in range(1, 101))
+    assert profiler.percentiles() == {"p50": 50.0, "p95": 95.0,
+                                      "p99": 99.0}
+
+
+def test_jsonl_export(screen, studio, monkeypatch):
+    profiler = MyName.FrameProfiler()
+    monkeypatch.setattr(MyName, "PROFILER", profiler)
+    menu, pool, positions = studio
+    profiler.start(pool, menu)
+    run_frames(screen, menu, pool, positions, 3)
+    out = io.StringIO()
+    profiler.write_jsonl(out)
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [line["frame"] for line in lines] == [0, 4, 8]
+
+
+def test_p_key_toggles_profiling(screen, studio, monkeypatch, capsys):
+    profiler = MyName.FrameProfiler()
+    monkeypatch.setattr(MyName, "PROFILER", profiler)
+    menu, pool, positions = studio
+    MyName.setup_main_keys(screen, menu, pool, positions)
+    screen.press("p")
+    assert profiler.enabled
+    screen.press("p")
+    assert not profiler.enabled
+    assert "p95" in capsys.readouterr().err
@@ -0,0 +1,92 @@
+"""Tests for the adaptive level of detail of the 3D rotation."""
+# pylint: disable=missing-function-docstring
+import MyName
+
+
+def feed(governor, frame_ms, count):
+    return [governor.record(frame_ms) for _ in range(count)]
+
+
+def test_slow_frames_lower_quality_one_step_per_window():
+    governor = MyName.QualityGovernor(window=4)
+    budget = governor.budget_ms
+    assert feed(governor, budget * 2, 3) == [False] * 3
+    assert governor.record(budget * 2)
+    assert governor.level == 1
+    feed(governor, budget * 2, 4 * len(MyName.QUALITY_LEVELS))
+    assert governor.level == len(MyName.QUALITY_LEVELS) - 1
+
+
+def test_headroom_restores_quality():
+    governor = MyName.QualityGovernor(window=4)
+    governor.set_level(3)
+    feed(governor, governor.budget_ms * 0.1, 8)
+    assert governor.level == 1
+    assert governor.changes == 2
+
+
+def test_hysteresis_band_keeps_level():
+    governor = MyName.QualityGovernor(window=4)
+    governor.set_level(2)
+    budget = governor.budget_ms
+    for frame_ms in (budget * 0.55, budget * 0.85) * 20:
+        governor.record(frame_ms)
+    assert governor.level == 2
+    assert governor.changes == 0
+
+
+def test_disabled_governor_keeps_level():
+    governor = MyName.QualityGovernor(window=1)
+    governor.enabled = False
+    feed(governor, governor.budget_ms * 10, 5)
+    assert governor.stats()["level"] == 0
+
+
+def test_lower_quality_draws_fewer_layers(screen):
+    positions = MyName.prepare_letters("Hi")
+    pool = MyName.GlyphPool(screen)
+    pool.allocate(positions)
+    MyName.draw_frame(pool, positions, 0)
+    assert len(pool.visible) == 2 * (MyName.DEPTH_LAYERS + 1)
+
+    MyName.GOVERNOR.set_level(len(MyName.QUALITY_LEVELS) - 1)
+    MyName.draw_frame(pool, positions, 0)
+    layers = MyName.quality_settings(MyName.GOVERNOR.level)[0]
+    assert len(pool.visible) == 2 * (layers + 1)
+    # The back layer still sits at the full extrusion depth
+    assert MyName.quality_settings(MyName.GOVERNOR.level)[1] * layers == (
+        MyName.DEPTH_LAYERS)
+
+
+def test_other_animations_ignore_quality(screen):
+    MyName.ANIMATION_TYPE = "wave"
+    positions = MyName.prepare_letters("Hi")
+    pool = MyName.GlyphPool(screen)
+    pool.allocate(positions)
+    MyName.GOVERNOR.set_level(3)
+    MyName.draw_frame(pool, positions, 0)
+    assert len(pool.visible) == 2
+
+
+def test_menu_shows_quality_level(screen):
+    menu = MyName.MenuLayer(screen)
+    MyName.draw_menu(menu, screen)
+    assert "Quality: 5/5 (10 layers)" in screen.cv.visible_texts()
+    screen.cv.calls.clear()
+
+    MyName.GOVERNOR.set_level(2)
+    MyName.draw_menu(menu, screen)
+    assert screen.cv.calls == [("itemconfigure", menu.items["quality"])]
+    assert "Quality: 3/5 (4 layers)" in screen.cv.visible_texts()
+
+
+def test_animate_feeds_render_time_to_governor(screen):
+    MyName.IS_ANIMATING = True
+    MyName.GOVERNOR = MyName.QualityGovernor(window=1)
+    MyName.GOVERNOR.clock = iter([0.0, 1.0]).__next__  # one-second frame
+    positions = MyName.prepare_letters("Hi")
+    pool = MyName.GlyphPool(screen)
+    pool.allocate(positions)
+    MyName.animate(screen, pool, MyName.MenuLayer(screen), positions,
+                   frame=0)
+    assert MyName.GOVERNOR.level == 1
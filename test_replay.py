@@ -0,0 +1,91 @@
+"""Tests for session recording and the headless replay."""
+# pylint: disable=missing-function-docstring
+import io
+import json
+
+import pytest
+
+import MyName
+import replay
+
+
+def recorded(screen, keys, text="Hi", end=3.0):
+    """Record a studio session pressing (seconds, keysym) `keys`."""
+    now = [0.0]
+    recorder = MyName.SessionRecorder(clock=lambda: now[0])
+    MyName.KEYS.recorder = recorder
+    recorder.start(text)
+    MyName.start_studio(screen, text)
+    recorder.transitions()
+    for at, key in keys:
+        now[0] = at
+        screen.press(key)
+    now[0] = end
+    out = io.StringIO()
+    recorder.write(out)
+    return out.getvalue().splitlines()
+
+
+@pytest.mark.usefixtures("studio")
+def test_keys_and_transitions_are_logged(screen):
+    now = [0.0]
+    MyName.KEYS.recorder = MyName.SessionRecorder(clock=lambda: now[0])
+    MyName.KEYS.recorder.start()
+    for at, key in ((0.25, "5"), (0.5, "5"), (0.75, "B")):
+        now[0] = at
+        screen.press(key)
+    out = io.StringIO()
+    MyName.KEYS.recorder.write(out)
+    lines = out.getvalue().splitlines()
+    assert lines[1:] == ['[250.0,"k","5"]', '[250.0,"s","FONT_SIZE",96]',
+                         '[500.0,"k","5"]', '[750.0,"k","B"]',
+                         '[750.0,"s","ANIMATION_TYPE","wave"]',
+                         '[750.0,"end"]']
+    header, events = MyName.read_session(lines)
+    assert header["state"]["FONT_SIZE"] == 64 and header["text"] is None
+    assert len(events) == 6
+
+
+def test_other_log_versions_are_rejected():
+    with pytest.raises(ValueError):
+        MyName.read_session(['{"version": 0}'])
+
+
+def test_replay_matches_the_recording_and_repeats(screen):
+    header, events = MyName.read_session(recorded(screen, (
+        (0.4, "5"), (0.9, "c"), (1.2, "m"), (1.5, "2"), (2.0, "m"))))
+    frames, keys, stats, transitions = replay.replay(header, events)
+    assert not replay.diverged(events, transitions)
+    assert [event[2:] for event in transitions] == [
+        ["NAME", "Hi"], ["IS_ANIMATING", True], ["FONT_SIZE", 96],
+        ["ANIMATION_TYPE", "spiral"], ["IS_ANIMATING", False],
+        ["FONT_SIZE", 48], ["IS_ANIMATING", True]]
+    assert len(keys) == 5 and stats["virtual_s"] == 3.0
+    # 25 fps for 2.2 of the 3 seconds, from one chain only
+    assert len(frames) == pytest.approx(2.2 * MyName.TARGET_FPS, abs=2)
+    assert stats["dropped"] == 0
+    again = replay.replay(header, events)[0]
+    assert [calls for _, calls in again] == [calls for _, calls in frames]
+    # The studio's globals are left as they were
+    assert MyName.FONT_SIZE == 48 and MyName.KEYS.recorder is not None
+
+
+def test_text_prompt_is_replayed(tmp_path, capsys):
+    log = tmp_path / "session.jsonl"
+    state = {"NAME": "", "FONT_SIZE": 64, "ANIMATION_TYPE": "wave",
+             "IS_ANIMATING": False}
+    lines = [{"version": 1, "text": None, "fps": None, "depth_layers": 4,
+              "state": state},
+             [300, "k", "O"], [450, "k", "k"], [700, "k", "Return"],
+             [700, "s", "NAME", "Ok"], [700, "s", "IS_ANIMATING", True],
+             [1500, "end"]]
+    log.write_text("".join(json.dumps(line) + "\n" for line in lines))
+    assert replay.main([str(log), "--json", "--repeat", "2"]) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["keys"] == 6 and summary["frames"] > 0
+    assert summary["frame_ms_p50"] <= summary["frame_ms_max"]
+
+    lines[4] = [700, "s", "NAME", "Okay"]
+    log.write_text("".join(json.dumps(line) + "\n" for line in lines))
+    assert replay.main([str(log)]) == 1
+    assert "DIVERGED transition 0" in capsys.readouterr().err
@@ -0,0 +1,92 @@
+"""Tests for the deadline-based frame scheduler."""
+# pylint: disable=missing-function-docstring
+import pytest
+
+import MyName
+
+
+class Clock:  # pylint: disable=too-few-public-methods
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def run(monkeypatch, screen, render_seconds, duration=2.0):
+    """Drive animate() on a virtual clock; return (scheduler, frames)."""
+    clock = Clock()
+    scheduler = MyName.FrameScheduler(clock=clock)
+    monkeypatch.setattr(MyName, "SCHEDULER", scheduler)
+    drawn = []
+
+    def fake_draw_frame(_pool, _positions, frame):
+        drawn.append((clock.now, frame))
+        clock.now += render_seconds
+    monkeypatch.setattr(MyName, "draw_frame", fake_draw_frame)
+
+    MyName.IS_ANIMATING = True
+    screen.timers.clear()
+    start = clock.now
+    MyName.animate(screen, None, MyName.MenuLayer(screen), [], frame=0)
+    while clock.now - start < duration:
+        (fun, delay), = screen.timers
+        screen.timers.clear()
+        clock.now += delay / 1000
+        fun()
+    return scheduler, drawn
+
+
+def test_ticks_aim_at_deadlines(monkeypatch, screen):
+    scheduler, drawn = run(monkeypatch, screen, render_seconds=0.010)
+    assert [frame for _, frame in drawn[:4]] == [0, 4, 8, 12]
+    assert scheduler.stats()["dropped"] == 0
+    # 25 fps even though each frame takes 10 ms to render
+    assert len(drawn) == pytest.approx(2.0 * MyName.TARGET_FPS, abs=1)
+
+
+def test_motion_speed_independent_of_render_time(monkeypatch, screen):
+    def phase_at_end(render_seconds):
+        _, drawn = run(monkeypatch, screen, render_seconds)
+        when, frame = drawn[-1]
+        return when, frame
+
+    fast_when, fast_frame = phase_at_end(0.001)
+    slow_when, slow_frame = phase_at_end(0.100)
+    for when, frame in ((fast_when, fast_frame), (slow_when, slow_frame)):
+        expected = (when - 100.0) * MyName.ANIMATION_SPEED
+        assert abs(frame - expected % 360) <= MyName.FRAME_STEP
+
+
+def test_slow_frames_are_skipped_and_reported(monkeypatch, screen):
+    scheduler, drawn = run(monkeypatch, screen, render_seconds=0.100)
+    stats = scheduler.stats()
+    assert stats["dropped"] > 0
+    assert stats["drawn"] == len(drawn)
+    assert stats["drawn"] + stats["dropped"] == scheduler.index + 1
+    assert all(frame % MyName.FRAME_STEP == 0 for _, frame in drawn)
+
+
+def test_early_tick_does_not_draw():
+    clock = Clock()
+    scheduler = MyName.FrameScheduler(clock=clock)
+    scheduler.start()
+    assert scheduler.next_frame() == 0
+    clock.now += 0.010
+    assert scheduler.next_frame() is None
+    assert scheduler.delay_ms() == 30
+
+
+@pytest.mark.parametrize("fps", [30, 60, 12.5])
+def test_every_tick_shows_a_new_frame_at_any_rate(fps):
+    scheduler = MyName.FrameScheduler(fps=fps)
+    scheduler.start(7)
+    frames = [scheduler.frame_at(index) for index in range(int(10 * fps))]
+    assert all(a != b for a, b in zip(frames, frames[1:]))
+    # Moving at ANIMATION_SPEED whatever the rate
+    for index, frame in enumerate(frames):
+        expected = (7 + index * MyName.ANIMATION_SPEED / fps) % 360
+        distance = abs(frame - expected)
+        assert min(distance, 360 - distance) < 1
@@ -0,0 +1,122 @@
+"""Tests for the pre-rasterized glyph sprite cache."""
+# pylint: disable=missing-function-docstring
+import pytest
+
+import MyName
+
+pytest.importorskip("PIL")
+MyName.load_pillow()
+
+
+def identity(image):
+    return image
+
+
+def sprite_pool(screen, **options):
+    return MyName.SpritePool(screen, MyName.SpriteCache(factory=identity,
+                                                        **options))
+
+
+def test_quantize_color_keeps_extremes():
+    assert MyName.quantize_color((0, 128, 255), 16) == (0, 136, 255)
+    assert MyName.quantize_color((3, 250, 9), 2) == (0, 255, 0)
+
+
+def test_render_sprite_uses_glyph_color():
+    image = MyName.render_sprite("H", ("Arial", 32, "bold"), (255, 0, 0))
+    assert image.mode == "RGBA"
+    assert (255, 0, 0, 255) in {color for _, color in image.getcolors()}
+
+
+def test_cache_hits_for_nearby_shades():
+    cache = MyName.SpriteCache(factory=identity)
+    font = ("Arial", 32, "bold")
+    first = cache.get(cache.key("A", font, (200, 100, 50)))
+    assert cache.get(cache.key("A", font, (201, 99, 51))) is first
+    assert cache.stats()["hit_rate"] == 0.5
+
+
+def test_cache_evicts_least_recently_used():
+    font = ("Arial", 32, "bold")
+    probe = MyName.SpriteCache(factory=identity)
+    probe.get(probe.key("A", font, (0, 0, 0)))
+    cache = MyName.SpriteCache(max_bytes=2 * probe.nbytes, factory=identity)
+    keys = [cache.key("A", font, (c, 0, 0)) for c in (0, 85, 170)]
+    for key in keys:
+        cache.get(key)
+    assert cache.evictions == 1
+    assert keys[0] not in cache.sprites
+    assert cache.nbytes <= cache.max_bytes
+
+
+def test_frames_swap_images_without_creating_items(screen):
+    positions = MyName.prepare_letters("Hi")
+    pool = sprite_pool(screen)
+    pool.allocate(positions)
+    created = len(screen.cv.items)
+    assert {opts["kind"] for opts in screen.cv.items.values()} == {"image"}
+
+    for frame in range(0, 40, MyName.FRAME_STEP):
+        MyName.draw_frame(pool, positions, frame)
+    assert len(screen.cv.items) == created
+    assert not [call for call in screen.cv.calls[created:]
+                if call[0] not in ("coords", "itemconfigure")]
+    shown = [opts for opts in screen.cv.items.values()
+             if opts.get("state") == "normal"]
+    assert len(shown) == 2 * (MyName.DEPTH_LAYERS + 1)
+    assert all(opts["image"] is not None for opts in shown)
+
+
+def test_prewarm_covers_the_cycle(screen):
+    positions = MyName.prepare_letters("Hi")
+    pool = sprite_pool(screen)
+    pool.allocate(positions)
+    MyName.draw_frame(pool, positions, 0)
+    rendered = pool.sprites.misses
+    assert rendered == 0
+    assert len(pool.sprites.sprites) < pool.cycle.count * 90
+    for frame in range(0, 360, MyName.FRAME_STEP):
+        MyName.draw_frame(pool, positions, frame)
+    assert pool.sprites.misses == 0
+    assert pool.sprites.stats()["hit_rate"] == 1.0
+
+
+def test_make_glyph_pool_falls_back_to_text(screen, monkeypatch):
+    monkeypatch.setattr(MyName, "load_pillow", lambda: False)
+    assert not isinstance(MyName.make_glyph_pool(screen), MyName.SpritePool)
+    monkeypatch.setattr(MyName, "load_pillow", lambda: True)
+    # The fake canvas cannot report its pixels per point
+    assert not isinstance(MyName.make_glyph_pool(screen), MyName.SpritePool)
+
+
+@pytest.mark.parametrize("animation", ["3d_rotation", "rainbow_pulse"])
+def test_steady_state_hits_every_sprite(screen, monkeypatch, animation):
+    monkeypatch.setattr(MyName, "ANIMATION_TYPE", animation)
+    positions = MyName.prepare_letters("Your Name Here")
+    pool = sprite_pool(screen, scale=96 / 72)
+    pool.allocate(positions)
+    for frame in range(0, 360, MyName.FRAME_STEP):
+        MyName.draw_frame(pool, positions, frame)
+    cache = pool.sprites
+    cache.hits = cache.misses = 0
+    for frame in range(0, 360, MyName.FRAME_STEP):
+        MyName.draw_frame(pool, positions, frame)
+    assert not pool.text_items
+    assert cache.stats()["hit_rate"] == 1.0
+    assert cache.evictions == 0
+    assert cache.base_bytes <= cache.max_bytes <= cache.limit
+
+
+def test_cycle_over_the_limit_draws_text(screen):
+    positions = MyName.prepare_letters("Hi")
+    pool = sprite_pool(screen, max_bytes=1, limit=1)
+    pool.allocate(positions)
+    MyName.draw_frame(pool, positions, 0)
+    assert pool.text_items
+    assert pool.sprites.max_bytes == pool.sprites.base_bytes
+    shown = [opts for opts in screen.cv.items.values()
+             if opts.get("state") == "normal"]
+    assert shown and {opts["kind"] for opts in shown} == {"text"}
+
+    pool.allocate(MyName.prepare_letters("Ho"))
+    assert not pool.text_items
@@ -0,0 +1,97 @@
+"""Tests for the event-driven text input screen."""
+# pylint: disable=missing-function-docstring
+import MyName
+from conftest import FakeTurtle
+
+
+class NoPolling(Exception):
+    """Raised when the input screen flushes the screen in a loop."""
+
+
+def test_input_returns_without_polling(screen, monkeypatch):
+    def update():
+        screen.updates += 1
+        if screen.updates > 5:
+            raise NoPolling
+    monkeypatch.setattr(screen, "update", update)
+
+    results = []
+    MyName.get_text_input(screen, FakeTurtle(), results.append)
+    # Returned straight away: nothing spins while waiting for keys
+    assert not results
+    assert screen.updates == 1
+    assert MyName.KEYS.mode == "input"
+    assert "Return" in MyName.KEYS.tables["input"]
+
+
+def test_typed_text_is_passed_to_callback(screen):
+    results = []
+    pen = FakeTurtle()
+    MyName.get_text_input(screen, pen, results.append)
+    screen.press("H", "i", "space", "x", "BackSpace", "exclam")
+    screen.run_timers(MyName.INPUT_REPAINT_MS)
+    assert "Hi !" in screen.cv.visible_texts()
+    screen.press("Return")
+    assert results == ["Hi !"]
+    assert MyName.KEYS.mode is None
+    assert not pen.written
+    assert not screen.cv.items
+
+
+def test_static_prompt_drawn_once_and_keys_coalesced(screen):
+    pen = FakeTurtle()
+    MyName.get_text_input(screen, pen, lambda text: None)
+    static = list(pen.written)
+    screen.cv.calls.clear()
+
+    screen.press(*"hello")
+    repaints = [t for t in screen.timers if t[1] == MyName.INPUT_REPAINT_MS]
+    assert len(repaints) == 1
+    screen.run_timers(MyName.INPUT_REPAINT_MS)
+
+    assert pen.written == static
+    touched = {call[1] for call in screen.cv.calls}
+    assert len(touched) == 2  # only the typed text and the cursor
+
+
+def test_cursor_follows_measured_text_width(screen):
+    MyName.get_text_input(screen, FakeTurtle(), lambda text: None)
+    screen.press(*"abcd")
+    screen.run_timers(MyName.INPUT_REPAINT_MS)
+    items = screen.cv.items
+    text = next(o for o in items.values() if o.get("text") == "abcd")
+    cursor = next(o for o in items.values() if o.get("text") == "_")
+    # The fake canvas measures 10 units per character around x = -1
+    assert cursor["coords"][0] == text["coords"][0] + 20 + 5
+
+
+def test_escape_uses_default_and_stops_blinking(screen):
+    results = []
+    MyName.get_text_input(screen, FakeTurtle(), results.append)
+    screen.press("a", "Escape")
+    assert results == ["Your Name Here"]
+    screen.run_timers()
+    assert not screen.timers
+
+
+def test_change_name_resumes_through_callback(screen, monkeypatch):
+    monkeypatch.setattr(MyName, "INPUT_TURTLE", FakeTurtle())
+    MyName.NAME = "Old"
+    MyName.IS_ANIMATING = True
+    positions = MyName.prepare_letters("Old")
+    menu = MyName.MenuLayer(screen)
+    pool = MyName.GlyphPool(screen)
+    pool.allocate(positions)
+    MyName.setup_main_keys(screen, menu, pool, positions)
+    menu_keys = MyName.KEYS.tables["menu"]
+
+    MyName.change_name(screen, menu, pool, positions)
+    assert not MyName.IS_ANIMATING
+    assert MyName.NAME == "Old"
+    screen.press("N", "e", "w", "Return")
+    assert MyName.NAME == "New"
+    assert [p[0] for p in positions] == ["N", "e", "w"]
+    assert MyName.KEYS.mode == "menu"
+    assert MyName.KEYS.tables["menu"] is menu_keys
+    # The canvas was bound once; modes only swap dispatch tables
+    assert list(screen.cv.bindings) == ["<KeyPress>"]